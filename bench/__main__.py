@@ -0,0 +1,203 @@
+""" Benchmark each stage of the receipt pipeline and compare the results
+with a baseline.
+
+    python -m bench --baseline bench/baseline.json          # compare
+    python -m bench --baseline bench/baseline.json --save   # update
+
+Throughput is the best of `--repeat` runs; peak memory is measured with
+tracemalloc in a separate run, since tracing slows the code down.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from bench.baskets import generate_lines
+from bench.stages import Stage, STAGES
+
+Result = Dict[str, float]
+
+# allowance for the memory of tiny baskets, dominated by noise
+MEMORY_SLACK = 64 * 1024
+
+
+def measure_time(stage: Stage, state: Any, repeat: int, min_time: float):
+    """ Return the best throughput of :param stage: in items per second. """
+    best = None
+    for _ in range(repeat):
+        items = 0
+        gc.collect()
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            items += stage.run(state)
+            elapsed = time.perf_counter() - start
+        throughput = items / elapsed
+        best = throughput if best is None else max(best, throughput)
+    return best
+
+
+def measure_memory(stage: Stage, state: Any) -> int:
+    """ Return the peak memory allocated by a run of :param stage:. """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        stage.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - before
+
+
+def get_key(stage: Stage, size: int, repetition: float) -> str:
+    return f'{stage.name}/{size}/{repetition}'
+
+
+def compare(result: Result, baseline: Optional[Result], tolerance: float):
+    """ Return the regressions of :param result: with respect to
+    :param baseline:. """
+    if baseline is None:
+        return []
+    regressions = []
+    if result['throughput'] < baseline['throughput'] * (1 - tolerance):
+        regressions.append('throughput')
+    memory_limit = baseline['peak_memory'] * (1 + tolerance) + MEMORY_SLACK
+    if result['peak_memory'] > memory_limit:
+        regressions.append('peak memory')
+    return regressions
+
+
+def format_change(value: float, baseline: Optional[float]) -> str:
+    if not baseline:
+        return ''
+    return f'{(value / baseline - 1) * 100:+.0f}%'
+
+
+def load_baseline(path: Optional[str]) -> Dict[str, Any]:
+    if path is None or not os.path.exists(path):
+        return {'results': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, baseline: Dict[str, Any]):
+    baseline = {
+        'machine': platform.platform(),
+        'python': platform.python_version(),
+        'results': {
+            key: {
+                'throughput': round(result['throughput']),
+                'peak_memory': result['peak_memory'],
+            }
+            for key, result in sorted(baseline['results'].items())
+        },
+    }
+    with open(path, mode='w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+
+
+def parse_args(argv: List[str]):
+    parser = argparse.ArgumentParser(
+        prog='python -m bench',
+        description='Benchmark the stages of the receipt pipeline.',
+    )
+    parser.add_argument(
+        '--sizes',
+        metavar='LINES',
+        type=int,
+        nargs='+',
+        default=[10, 10_000, 1_000_000],
+        help='number of lines of the synthetic baskets',
+    )
+    parser.add_argument(
+        '--repetitions',
+        metavar='RATIO',
+        type=float,
+        nargs='+',
+        default=[0.0, 0.5, 0.99],
+        help='fractions of lines that repeat an entry of the basket',
+    )
+    parser.add_argument(
+        '--stages',
+        metavar='STAGE',
+        nargs='+',
+        choices=[stage.name for stage in STAGES],
+        help='the stages to run (default: all)',
+    )
+    parser.add_argument(
+        '--baseline',
+        metavar='PATH',
+        help='a JSON file of results to compare with',
+    )
+    parser.add_argument(
+        '--save',
+        action='store_true',
+        help='store the results in the baseline instead of failing',
+    )
+    parser.add_argument(
+        '--tolerance',
+        metavar='RATIO',
+        type=float,
+        default=0.25,
+        help='relative slowdown or memory growth that counts as regression',
+    )
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--min-time', type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]):
+    args = parse_args(argv)
+    stages = [
+        stage for stage in STAGES
+        if args.stages is None or stage.name in args.stages
+    ]
+    baseline = load_baseline(args.baseline)
+    regressions = []
+
+    print(f'{"stage":<20} {"lines":>9} {"rep":>5} {"items/s":>12} {"":>6} {"peak KiB":>10} {"":>6}')  # noqa: E501
+    for size in args.sizes:
+        for repetition in args.repetitions:
+            lines = generate_lines(size, repetition)
+            for stage in stages:
+                key = get_key(stage, size, repetition)
+                state = stage.prepare(lines)
+                result = {
+                    'throughput': measure_time(stage, state, args.repeat, args.min_time),  # noqa: E501
+                    'peak_memory': measure_memory(stage, state),
+                }
+                expected = baseline['results'].get(key)
+                failures = compare(result, expected, args.tolerance)
+                print(' '.join([
+                    f'{stage.name:<20}',
+                    f'{size:>9}',
+                    f'{repetition:>5}',
+                    f'{result["throughput"]:>12,.0f}',
+                    f'{format_change(result["throughput"], expected and expected["throughput"]):>6}',  # noqa: E501
+                    f'{result["peak_memory"] / 1024:>10,.0f}',
+                    f'{format_change(result["peak_memory"], expected and expected["peak_memory"]):>6}',  # noqa: E501
+                    ' '.join(f'REGRESSION ({f})' for f in failures),
+                ]).rstrip(), flush=True)
+                regressions.extend(f'{key}: {f}' for f in failures)
+                baseline['results'][key] = result
+
+    if args.save:
+        save_baseline(args.baseline, baseline)
+        print(f'baseline saved to {args.baseline}')
+        return 0
+
+    if regressions:
+        print(f'{len(regressions)} regressions:', *regressions, sep='\n  ')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,26 @@
+""" Synthetic baskets for the benchmarks, drawn by `receipt-gen`. """
+from typing import List
+
+from taxes.gateways.generator import generate_chunks, WorkloadConfig
+
+
+def generate_lines(count: int, repetition: float, seed: int = 0) -> List[str]:
+    """ Return :param count: basket lines, about a :param repetition:
+    fraction of which repeat the product of another line.
+
+    Products are drawn uniformly among `count * (1 - repetition)` products,
+    with the default import ratio and prices of `receipt-gen`.
+    """
+    config = WorkloadConfig(
+        lines=count,
+        products=max(1, round(count * (1 - repetition))),
+        zipf=0.0,
+        imported=0.3,
+        exempt=0.0,
+        malformed=0.0,
+        prices='lognormal',
+        min_price=0.5,
+        max_price=500.0,
+        seed=seed,
+    )
+    return b''.join(generate_chunks(config)).decode('utf-8').splitlines()
@@ -0,0 +1,127 @@
+""" The stages of the receipt pipeline, benchmarked one at a time.
+
+Each stage prepares its input from the basket lines outside of the
+measurement and returns the number of items it processed when run.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, List
+
+from taxes.adapters.product_repository import KATA_EXAMPLE_PRODUCT_REPOSITORY
+from taxes.gateways.cli import CliController
+from taxes.services.basket.entities.article import create as create_article
+from taxes.services.basket.entities.basket import BasketBuilder, list_articles
+from taxes.services.parser import parse_item, scan_item
+from taxes.services.receipt.entities.receipt import ReceiptBuilder
+from taxes.services.tax.entities.applicable_taxes import get_applicable_taxes
+from taxes.services.tax.entities.tax import apply
+from taxes.services.tax.use_cases import TaxArticlesUseCase
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    prepare: Callable[[List[str]], Any]
+    run: Callable[[Any], int]
+
+
+def noop(msg, *args):
+    pass
+
+
+def create_articles(lines: List[str]):
+    articles = []
+    for line in lines:
+        item = scan_item(line)
+        product = KATA_EXAMPLE_PRODUCT_REPOSITORY.get_by_name(item.product_name)  # noqa: E501
+        articles.append(create_article(
+            quantity=item.quantity,
+            product_name=product.name,
+            product_category=product.category,
+            unit_price_before_taxes=item.unit_price,
+            imported=item.imported,
+        ))
+    return articles
+
+
+def create_basket(lines: List[str]):
+    builder = BasketBuilder()
+    for article in create_articles(lines):
+        builder.add_article(article)
+    return list_articles(builder.build())
+
+
+def tax_articles(lines: List[str]):
+    env = TaxArticlesUseCase.Environment(info=noop, debug=noop)
+    return TaxArticlesUseCase(articles=create_basket(lines))(env)
+
+
+def create_receipt(lines: List[str]):
+    builder = ReceiptBuilder()
+    for taxed_article in tax_articles(lines):
+        builder.add(taxed_article)
+    return builder.build()
+
+
+def run_parser(parse: Callable[[str], Any]) -> Callable[[List[str]], int]:
+    def run(lines: List[str]) -> int:
+        for line in lines:
+            parse(line)
+        return len(lines)
+    return run
+
+
+def run_add_article(articles) -> int:
+    builder = BasketBuilder()
+    add_article = builder.add_article
+    for article in articles:
+        add_article(article)
+    return len(articles)
+
+
+def run_apply(articles) -> int:
+    for article in articles:
+        apply(article.unit_price_before_taxes, get_applicable_taxes(article))
+    return len(articles)
+
+
+def run_add_to_receipt(taxed_articles) -> int:
+    builder = ReceiptBuilder()
+    add = builder.add
+    for taxed_article in taxed_articles:
+        add(taxed_article)
+    return len(taxed_articles)
+
+
+def run_receipt_to_str(receipt) -> int:
+    CliController.receipt_to_str(receipt)
+    return len(receipt.items)
+
+
+def create_controller(lines: List[str]):
+    controller = CliController(config=CliController.Config(
+        log_level=logging.ERROR,
+        encoding='utf-8',
+    ))
+    return controller, lines
+
+
+def run_pipeline(state) -> int:
+    controller, lines = state
+    purchased_items = [controller.parse_item(line) for line in lines]
+    receipt = controller.create_receipt(
+        controller.create_basket(purchased_items)
+    )
+    controller.receipt_to_str(receipt)
+    return len(lines)
+
+
+STAGES = [
+    Stage('parse_item', prepare=list, run=run_parser(parse_item)),
+    Stage('scan_item', prepare=list, run=run_parser(scan_item)),
+    Stage('basket.add_article', prepare=create_articles, run=run_add_article),  # noqa: E501
+    Stage('tax.apply', prepare=create_basket, run=run_apply),
+    Stage('add_to_receipt', prepare=tax_articles, run=run_add_to_receipt),
+    Stage('receipt_to_str', prepare=create_receipt, run=run_receipt_to_str),
+    Stage('pipeline', prepare=create_controller, run=run_pipeline),
+]
@@ -1,12 +1,12 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, Iterable, List
 
 from taxes.services.basket.entities.product import Product
 from taxes.services.basket.service import Dependency as BasketServiceDependency
 
 
 @dataclass
-class InMemoryProductRepository(BasketServiceDependency.ProductRepository):
+class InMemoryProductRepository(BasketServiceDependency.BulkProductRepository):
     """ An in-memory product repository """
     products: List[Product]
 
@@ -16,6 +16,9 @@ class InMemoryProductRepository(BasketServiceDependency.ProductRepository):
     def get_by_name(self, name: str):
         return self.by_name.get(name, Product(name=name, category=None))
 
+    def get_many_by_name(self, names: Iterable[str]) -> Dict[str, Product]:
+        return {name: self.get_by_name(name) for name in names}
+
 
 KATA_EXAMPLE_PRODUCT_REPOSITORY = InMemoryProductRepository(
     products=[
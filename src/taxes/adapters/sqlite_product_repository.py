@@ -0,0 +1,135 @@
+import csv
+import pathlib
+import sqlite3
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, TextIO
+
+from taxes.services.basket.entities.product import Product
+from taxes.services.basket.service import Dependency as BasketServiceDependency
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS product (
+    normalized_name TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT
+) WITHOUT ROWID
+'''
+
+# SQLite limits the number of host parameters of a single statement.
+MAX_NAMES_PER_QUERY = 500
+
+
+def normalize_name(name: str) -> str:
+    """ Return the key products are indexed by: lowercase, single-spaced. """
+    return ' '.join(name.split()).lower()
+
+
+@dataclass
+class SqliteProductRepository(BasketServiceDependency.BulkProductRepository):
+    """ A product repository backed by a SQLite database.
+
+    Products are indexed by normalized name. The most recently looked up
+    products, including unknown ones, are kept in an in-process LRU cache of
+    :param cache_size: entries.
+    """
+    connection: sqlite3.Connection
+    cache_size: int = 65536
+    cache: 'OrderedDict[str, Product]' = field(default_factory=OrderedDict)
+
+    def __post_init__(self):
+        self.connection.execute(SCHEMA)
+
+    def get_by_name(self, name: str) -> Product:
+        cached = self.cache.get(name)
+        if cached is not None:
+            self.cache.move_to_end(name)
+            return cached
+        return self.get_many_by_name([name])[name]
+
+    def get_many_by_name(self, names: Iterable[str]) -> Dict[str, Product]:
+        """ Return the products named :param names:, indexed by name.
+
+        Names that are not in the cache are looked up in batches.
+        """
+        products = {}
+        missing = []
+        for name in names:
+            cached = self.cache.get(name)
+            if cached is not None:
+                self.cache.move_to_end(name)
+                products[name] = cached
+            elif name not in products:
+                products[name] = None
+                missing.append(name)
+
+        for start in range(0, len(missing), MAX_NAMES_PER_QUERY):
+            found = self.select(missing[start:start + MAX_NAMES_PER_QUERY])
+            for name in missing[start:start + MAX_NAMES_PER_QUERY]:
+                product = found.get(normalize_name(name))
+                if product is None:
+                    product = Product(name=name, category=None)
+                products[name] = product
+                self.remember(name, product)
+
+        return products
+
+    def select(self, names: List[str]) -> Dict[str, Product]:
+        normalized_names = [normalize_name(name) for name in names]
+        placeholders = ', '.join('?' * len(normalized_names))
+        rows = self.connection.execute(
+            'SELECT normalized_name, name, category FROM product '
+            f'WHERE normalized_name IN ({placeholders})',
+            normalized_names,
+        )
+        return {
+            normalized_name: Product(name=name, category=category)
+            for normalized_name, name, category in rows
+        }
+
+    def remember(self, name: str, product: Product):
+        self.cache[name] = product
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def add_many(self, products: Iterable[Product]):
+        """ Insert :param products:, replacing those with the same name. """
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO product '
+                '(normalized_name, name, category) VALUES (?, ?, ?)',
+                (
+                    (normalize_name(p.name), p.name, p.category)
+                    for p in products
+                ),
+            )
+        self.cache.clear()
+
+    def load_csv(self, f: TextIO):
+        """ Import a catalogue from a CSV file with `name` and `category`
+        columns; an empty category means the product is not categorized. """
+        self.add_many(
+            Product(name=row['name'].strip(), category=row['category'] or None)  # noqa: E501
+            for row in csv.DictReader(f)
+        )
+
+
+def create(
+    path: str,
+    cache_size: Optional[int] = None,
+    read_only: bool = False,
+):
+    """ Open (or create) the catalogue stored in :param path:.
+
+    `:memory:` creates a transient, in-memory catalogue. If
+    :param read_only: is set, the catalogue must already exist.
+    """
+    if read_only:
+        uri = f'{pathlib.Path(path).absolute().as_uri()}?mode=ro'
+        connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    else:
+        connection = sqlite3.connect(path, check_same_thread=False)
+    if cache_size is None:
+        return SqliteProductRepository(connection=connection)
+    return SqliteProductRepository(connection=connection, cache_size=cache_size)  # noqa: E501
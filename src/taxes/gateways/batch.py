@@ -0,0 +1,352 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import repeat
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+from taxes.services.basket.entities.article import (
+    Article,
+    create as create_article,
+)
+from taxes.services.basket.entities.basket import (
+    BasketBuilder,
+    list_articles,
+)
+from taxes.services.binary_basket import is_binary_basket
+from taxes.services.parser import (
+    Buffer,
+    count_lines,
+    is_ascii_compatible,
+    is_mappable,
+    iter_items,
+    iter_lines,
+    map_file,
+)
+
+
+@dataclass(frozen=True)
+class BasketResult:
+    input_path: str
+    output_path: str
+    items: int = 0
+    taxes_due: Decimal = Decimal('0')
+    total_due: Decimal = Decimal('0')
+    error: Optional[str] = None
+
+
+class BatchError:
+    class DuplicateOutput(Exception):
+        def __init__(self, value):
+            super().__init__(f'more than one basket would be written to {value}')  # noqa: E501
+
+    class ShardFailed(Exception):
+        def __init__(self, value):
+            super().__init__(f'a shard of {value} could not be processed')
+
+
+RECEIPT_SUFFIX = '.receipt'
+
+
+def list_baskets(input_dir: str) -> List[str]:
+    """ Return the paths of the files in :param input_dir:, sorted by name.
+
+    Receipts written to the same directory are not baskets, so they are
+    left out.
+    """
+    return [
+        entry.path
+        for entry in sorted(os.scandir(input_dir), key=lambda e: e.name)
+        if entry.is_file() and not entry.name.endswith(RECEIPT_SUFFIX)
+    ]
+
+
+def get_output_path(input_path: str, output_dir: str) -> str:
+    return os.path.join(
+        output_dir,
+        f'{os.path.basename(input_path)}{RECEIPT_SUFFIX}',
+    )
+
+
+CreateController = Callable[[Any], Any]
+
+controller = None
+
+
+def init_worker(create_controller: CreateController, config: Any):
+    """ Wire the services once per worker process.
+
+    :param create_controller: is called with :param config: and must return
+    an object with a `config.encoding` attribute and the `write_receipt`,
+    `parse_item` and `create_basket` methods (see
+    `taxes.gateways.cli.CliController`).
+    """
+    global controller
+    controller = create_controller(config=config)
+
+
+def process_basket(input_path: str, output_path: str) -> BasketResult:
+    """ Write the receipt of the basket in :param input_path: to
+    :param output_path: and return its summary. """
+    try:
+        with open(output_path, mode='w', encoding=controller.config.encoding) as output:  # noqa: E501
+            totals, items = controller.write_receipt(input_path, output)
+    except Exception as e:
+        return BasketResult(
+            input_path=input_path,
+            output_path=output_path,
+            error=f'{type(e).__name__}: {e}',
+        )
+
+    return BasketResult(
+        input_path=input_path,
+        output_path=output_path,
+        items=items,
+        taxes_due=totals.taxes_due,
+        total_due=totals.total_due,
+    )
+
+
+def process_baskets(
+    create_controller: CreateController,
+    config: Any,
+    input_paths: Iterable[str],
+    output_dir: str,
+    jobs: int,
+) -> List[BasketResult]:
+    """ Write the receipt of each basket in :param input_paths: to
+    :param output_dir:, using up to :param jobs: worker processes.
+
+    Results are returned in the same order as :param input_paths:,
+    regardless of the order in which workers complete.
+    """
+    input_paths = list(input_paths)
+    output_paths = [get_output_path(p, output_dir) for p in input_paths]
+    seen = set()
+    for output_path in output_paths:
+        if output_path in seen:
+            raise BatchError.DuplicateOutput(output_path)
+        seen.add(output_path)
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    if jobs <= 1:
+        init_worker(create_controller, config)
+        return list(map(process_basket, input_paths, output_paths))
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=init_worker,
+        initargs=(create_controller, config),
+    ) as executor:
+        return list(executor.map(
+            process_basket,
+            input_paths,
+            output_paths,
+            chunksize=max(1, len(input_paths) // (jobs * 4)),
+        ))
+
+
+def write_summary(results: Iterable[BasketResult], output: TextIO):
+    baskets = failed = 0
+    taxes_due = total_due = Decimal('0')
+    for result in results:
+        baskets += 1
+        if result.error is not None:
+            failed += 1
+            output.write(f'{result.input_path}: error: {result.error}\n')
+            continue
+        taxes_due += result.taxes_due
+        total_due += result.total_due
+        output.write(' '.join([
+            f'{result.input_path}:',
+            f'{result.items} items,',
+            f'Sales Taxes: {result.taxes_due},',
+            f'Total: {result.total_due}',
+        ]) + '\n')
+
+    output.write(' '.join([
+        f'Baskets: {baskets},',
+        f'Failed: {failed},',
+        f'Sales Taxes: {taxes_due},',
+        f'Total: {total_due}',
+    ]) + '\n')
+
+
+MIN_SHARD_SIZE = 1 << 20
+
+Shard = Tuple[int, int]
+
+# An article as a plain tuple of product name, product category, unit price,
+# imported flag and quantity: cheaper to send across processes than entities.
+ArticleRow = Tuple[str, Optional[str], Decimal, bool, int]
+
+
+class ShardResult(NamedTuple):
+    """ The articles in a shard of a basket file or, if the shard can't be
+    processed, the byte range of its first offending line. """
+    articles: List[ArticleRow]
+    error: Optional[Shard] = None
+
+
+def article_to_row(article: Article) -> ArticleRow:
+    return (
+        article.product.name,
+        article.product.category,
+        article.unit_price_before_taxes,
+        article.imported,
+        article.quantity,
+    )
+
+
+def row_to_article(row: ArticleRow) -> Article:
+    product_name, product_category, unit_price, imported, quantity = row
+    return create_article(
+        product_name=product_name,
+        product_category=product_category,
+        unit_price_before_taxes=unit_price,
+        imported=imported,
+        quantity=quantity,
+    )
+
+
+def list_shards(
+    buffer: Buffer,
+    shards: int,
+    min_size: int = MIN_SHARD_SIZE,
+) -> List[Shard]:
+    """ Split :param buffer: in at most :param shards: byte ranges of about
+    the same size, at least :param min_size: bytes long and ending on a line
+    boundary. """
+    end = len(buffer)
+    shards = max(1, min(shards, end // max(1, min_size)))
+    bounds = [0]
+    for shard in range(1, shards):
+        offset = max(bounds[-1], end * shard // shards - 1)
+        newline = buffer.find(b'\n', offset)
+        if newline < 0 or newline + 1 >= end:
+            break
+        if newline + 1 > bounds[-1]:
+            bounds.append(newline + 1)
+    bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def create_shard_basket(
+    buffer: Buffer,
+    start: int,
+    stop: int,
+    first_line_no: int = 1,
+) -> Iterable[Article]:
+    """ Create the basket of the purchased items in :param buffer: from
+    :param start: to :param stop:. """
+    purchased_items = iter_items(
+        buffer,
+        controller.config.encoding,
+        controller.parse_item,
+        release_pages=True,
+        start=start,
+        stop=stop,
+        first_line_no=first_line_no,
+    )
+    return controller.create_basket(purchased_items)
+
+
+def find_first_error(buffer: Buffer, start: int, stop: int) -> Shard:
+    """ Return the byte range of the first line from :param start: to
+    :param stop: that can't be processed, or the whole range if every line
+    can be processed on its own. """
+    for _, offset, _ in iter_lines(buffer, start, stop):
+        newline = buffer.find(b'\n', offset, stop)
+        line_stop = stop if newline < 0 else newline + 1
+        try:
+            create_shard_basket(buffer, offset, line_stop)
+        except Exception:
+            return offset, line_stop
+    return start, stop
+
+
+def process_shard(input_path: str, start: int, stop: int) -> ShardResult:
+    """ Aggregate the purchased items in the :param start: to :param stop:
+    byte range of :param input_path: by basket entry. """
+    with open(input_path, mode='rb') as f, map_file(f) as buffer:
+        try:
+            articles = create_shard_basket(buffer, start, stop)
+        except Exception:
+            return ShardResult(
+                articles=[],
+                error=find_first_error(buffer, start, stop),
+            )
+
+        return ShardResult(articles=[article_to_row(a) for a in articles])
+
+
+def raise_shard_error(
+    create_controller: CreateController,
+    config: Any,
+    input_path: str,
+    error: Shard,
+):
+    """ Process the lines in the :param error: byte range of
+    :param input_path: in this process, so that they raise the same error
+    they would raise if the whole file were processed serially. """
+    init_worker(create_controller, config)
+    start, stop = error
+    with open(input_path, mode='rb') as f, map_file(f) as buffer:
+        first_line_no = count_lines(buffer, stop=start) + 1
+        create_shard_basket(buffer, start, stop, first_line_no)
+    raise BatchError.ShardFailed(input_path)
+
+
+def create_basket_in_shards(
+    create_controller: CreateController,
+    config: Any,
+    input_path: str,
+    jobs: int,
+) -> Optional[List[Article]]:
+    """ Create the basket in :param input_path: by splitting the file in
+    shards that are parsed and aggregated by up to :param jobs: worker
+    processes.
+
+    Partial baskets are merged in file order, so the result is the same as
+    creating the basket serially, article order included. Return None if
+    the file can't be memory-mapped, isn't large enough to be split or is a
+    binary basket.
+    """
+    with open(input_path, mode='rb') as f:
+        if not (is_ascii_compatible(config.encoding) and is_mappable(f)):
+            return None
+        with map_file(f) as buffer:
+            if is_binary_basket(buffer):
+                return None
+            shards = list_shards(buffer, jobs)
+
+    if len(shards) < 2:
+        return None
+
+    with ProcessPoolExecutor(
+        max_workers=len(shards),
+        initializer=init_worker,
+        initargs=(create_controller, config),
+    ) as executor:
+        starts, stops = zip(*shards)
+        results = list(executor.map(
+            process_shard, repeat(input_path), starts, stops
+        ))
+
+    basket = BasketBuilder()
+    for result in results:
+        if result.error is not None:
+            raise_shard_error(create_controller, config, input_path, result.error)  # noqa: E501
+        for row in result.articles:
+            basket.add_article(row_to_article(row))
+    return list_articles(basket.build())
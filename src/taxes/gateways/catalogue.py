@@ -0,0 +1,32 @@
+import argparse
+
+from taxes.adapters.sqlite_product_repository import create as open_catalogue
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog='receipt-catalogue',
+        description='Import a CSV product catalogue into a SQLite database.',
+    )
+    parser.add_argument(
+        '-d',
+        '--db',
+        metavar='CATALOGUE',
+        help='a path to the SQLite catalogue, created if it does not exist',
+        required=True,
+    )
+    parser.add_argument(
+        '-i',
+        '--input',
+        metavar='CSV',
+        help='a path to a CSV file with `name` and `category` columns',
+        required=True,
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    repository = open_catalogue(args.db)
+    with open(args.input, mode='r', encoding='utf-8', newline='') as f:
+        repository.load_csv(f)
@@ -1,32 +1,100 @@
 import argparse
+import asyncio
 import logging
-from dataclasses import dataclass
+import os
+import sys
+from dataclasses import dataclass, replace
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
 
 from taxes.adapters.product_repository import KATA_EXAMPLE_PRODUCT_REPOSITORY
+from taxes.adapters.sqlite_product_repository import create as open_catalogue
+from taxes.gateways.batch import (
+    BatchError,
+    create_basket_in_shards,
+    list_baskets,
+    process_baskets,
+    write_summary,
+)
+from taxes.gateways.renderers import (
+    get_renderer,
+    item_to_str,
+    RENDERERS,
+    totals_to_str,
+)
+from taxes.gateways.server import serve, ServerConfig
+from taxes.services.basket.entities.article import Article
 from taxes.services.basket.service import create as create_basket_service
-from taxes.services.receipt.entities.receipt import Receipt, ReceiptItem
+from taxes.services.basket.entities.purchased_item import PurchasedItem
+from taxes.services.binary_basket import (
+    is_binary_basket,
+    iter_items as iter_binary_items,
+    MAGIC,
+)
+from taxes.services.receipt.entities.receipt import (
+    Receipt,
+    ReceiptItem,
+    ReceiptTotals,
+)
 from taxes.services.receipt.service import create as create_receipt_service
-from taxes.services.parser import parse_item
+from taxes.services.parser import (
+    get_parser,
+    is_ascii_compatible,
+    is_mappable,
+    iter_items,
+    map_file,
+    open_text,
+)
+from taxes.services.tax.entities.applicable_taxes import TAX_TABLE, TaxTable
+from taxes.services.tax.entities.rules import (
+    load as load_tax_rules,
+    TaxRulesError,
+)
 from taxes.services.tax.service import create as create_tax_service
 
 
+OUTPUT_BUFFER_SIZE = 1 << 16
+
+
 class CliController:
 
     @dataclass
     class Config:
         log_level: str
         encoding: str
+        tax_cache_size: int = 4096
+        tax_backend: str = 'fixed-point'
+        tax_batch_threshold: int = 1024
+        catalogue: Optional[str] = None
+        parser: str = 'scanner'
+        tax_table: TaxTable = TAX_TABLE
+        tax_lookup_ceiling: Optional[Decimal] = None
+        tax_lookup_cache: Optional[str] = None
+        format: str = 'text'
 
     def __init__(self, config: Config):
         logging.basicConfig(level=config.log_level)
 
+        product_repository = KATA_EXAMPLE_PRODUCT_REPOSITORY
+        if config.catalogue is not None:
+            product_repository = open_catalogue(
+                config.catalogue,
+                read_only=True,
+            )
+
         basket_service = create_basket_service(
             logger=logging.getLogger('basket'),
-            product_repository=KATA_EXAMPLE_PRODUCT_REPOSITORY,
+            product_repository=product_repository,
         )
 
         tax_service = create_tax_service(
             logger=logging.getLogger('tax'),
+            cache_size=config.tax_cache_size,
+            backend=config.tax_backend,
+            batch_threshold=config.tax_batch_threshold,
+            tax_table=config.tax_table,
+            lookup_ceiling=config.tax_lookup_ceiling,
+            lookup_cache_path=config.tax_lookup_cache,
         )
 
         receipt_service = create_receipt_service(
@@ -35,26 +103,59 @@ class CliController:
         )
 
         self.config = config
+        self.parse_item = get_parser(config.parser)
+        self.create_renderer = get_renderer(config.format)
+        self.logger = logging.getLogger('cli')
+        self.tax_service = tax_service
         self.create_basket = basket_service.create_basket
         self.create_receipt = receipt_service.create_receipt
+        self.stream_receipt = receipt_service.stream_receipt
+
+    def iter_purchased_items(self, filepath) -> Iterator[PurchasedItem]:
+        """ Lazily parse the purchased items in :param filepath:.
+
+        The file is memory-mapped and scanned as bytes when possible, so
+        memory doesn't grow with its size; otherwise it is read in text mode
+        one row at a time. Binary baskets (see `binary_basket`) are detected
+        by their magic header, also when read from a stream, and read without
+        parsing text.
+        """
+        encoding = self.config.encoding
+        with open(filepath, mode='rb') as f:
+            head = b''
+            if is_mappable(f):
+                with map_file(f) as buffer:
+                    if is_binary_basket(buffer):
+                        yield from iter_binary_items(buffer)
+                        return
+                    if is_ascii_compatible(encoding):
+                        yield from iter_items(
+                            buffer,
+                            encoding,
+                            self.parse_item,
+                            release_pages=True,
+                        )
+                        return
+            else:
+                head = f.read(len(MAGIC))
+                if is_binary_basket(head):
+                    yield from iter_binary_items(head + f.read())
+                    return
+
+            for row in open_text(f, encoding, head):
+                yield self.parse_item(row)
 
-    def load_purchased_items(self, filepath):
-        with open(filepath, mode='r', encoding=self.config.encoding) as f:
-            return [parse_item(row) for row in f]
+    def load_purchased_items(self, filepath) -> List[PurchasedItem]:
+        return list(self.iter_purchased_items(filepath))
 
-    @staticmethod
-    def receipt_to_str(receipt: Receipt):
-        def item_to_str(item: ReceiptItem):
-            return ' '.join([
-                f'{item.quantity}',
-                f'{item.description}:',
-                f'{item.subtotal_price_with_taxes}'
-            ])
+    item_to_str = staticmethod(item_to_str)
+    totals_to_str = staticmethod(totals_to_str)
 
+    @classmethod
+    def receipt_to_str(cls, receipt: Receipt):
         return '\n'.join([
-            *[item_to_str(item) for item in receipt.items],
-            f'Sales Taxes: {receipt.taxes_due}',
-            f'Total: {receipt.total_due}',
+            *[cls.item_to_str(item) for item in receipt.items],
+            cls.totals_to_str(receipt),
         ])
 
     def print_receipt(self, purchased_items_filepath: str) -> str:
@@ -64,19 +165,208 @@ class CliController:
         printed_receipt = self.receipt_to_str(receipt)
         return printed_receipt
 
+    def write_receipt(
+        self,
+        purchased_items_filepath: str,
+        output: TextIO,
+    ) -> Tuple[ReceiptTotals, int]:
+        """ Write the receipt to :param output: one item at a time, in the
+        format of `config.format`.
+
+        Purchased items are parsed lazily and receipt items are written as
+        soon as they are taxed, so memory depends only on the number of
+        distinct articles in the basket, not on the size of the input file.
+        Return the receipt totals and the number of items written.
+        """
+        purchased_items = self.iter_purchased_items(purchased_items_filepath)
+        articles_in_basket = self.create_basket(purchased_items)
+        return self.write_basket(articles_in_basket, output)
+
+    def write_basket(
+        self,
+        articles_in_basket: Iterable[Article],
+        output: TextIO,
+    ) -> Tuple[ReceiptTotals, int]:
+        """ Same as `write_receipt`, for a basket that has already been
+        created. """
+        renderer = self.create_renderer(output)
+        render_item = renderer.write_item
+        items_written = 0
+
+        def write_item(item: ReceiptItem):
+            nonlocal items_written
+            render_item(item)
+            items_written += 1
+
+        totals = self.stream_receipt(articles_in_basket, write_item)
+        renderer.write_totals(totals)
+        self.log_tax_cache_info()
+        return totals, items_written
+
+    def log_tax_cache_info(self):
+        if self.tax_service.cache is not None:
+            self.logger.info('tax cache: %s', self.tax_service.cache.info())
+
+
+def price(value: str) -> Decimal:
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise argparse.ArgumentTypeError(f'invalid price: {value}')
+    if not number.is_finite() or number <= 0:
+        raise argparse.ArgumentTypeError(f'invalid price: {value}')
+    return number
+
+
+def add_tax_arguments(parser: argparse.ArgumentParser, reload_help: str = ''):
+    parser.add_argument(
+        '--tax-rules',
+        metavar='RULES',
+        help=(
+            'a path to a JSON tax rule set (see examples/tax-rules.json); '
+            f'the kata rules are used by default{reload_help}'
+        ),
+    )
+    parser.add_argument(
+        '--tax-lookup-ceiling',
+        metavar='PRICE',
+        help=(
+            'precompute the taxes due for every price up to PRICE '
+            '(at most 10000), instead of calculating them for each article'
+        ),
+        type=price,
+    )
+    parser.add_argument(
+        '--tax-lookup-cache',
+        metavar='PATH',
+        help=(
+            'a file where the precomputed taxes are stored and read from on '
+            'later runs (see --tax-lookup-ceiling)'
+        ),
+    )
+
 
-def parse_args():
+def parse_serve_args(argv: List[str]):
+    parser = argparse.ArgumentParser(
+        prog='receipt serve',
+        description='Serve receipts over HTTP.',
+    )
+    parser.add_argument(
+        '--host',
+        help='the address to listen on (default: %(default)s)',
+        default='127.0.0.1',
+    )
+    parser.add_argument(
+        '-p',
+        '--port',
+        help='the port to listen on, 0 picks a free one (default: %(default)s)',  # noqa: E501
+        type=int,
+        default=8080,
+    )
+    parser.add_argument(
+        '--unix-socket',
+        metavar='PATH',
+        help='listen on a unix socket instead of --host and --port',
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        metavar='N',
+        help='number of worker processes (default: number of CPUs)',
+        type=int,
+    )
+    parser.add_argument(
+        '--max-pending',
+        metavar='N',
+        help='maximum number of requests handed to the workers at once (default: 4 per worker)',  # noqa: E501
+        type=int,
+    )
+    parser.add_argument(
+        '-c',
+        '--catalogue',
+        metavar='CATALOGUE',
+        help=(
+            'a path to a SQLite product catalogue (see receipt-catalogue); '
+            'the kata example products are used by default'
+        ),
+    )
+    add_tax_arguments(parser, reload_help=', SIGHUP reloads it')
+    parser.add_argument(
+        '-v',
+        '--verbose',
+        help='set verbosity level',
+        action='count',
+        default=0,
+    )
+    return parser.parse_args(argv)
+
+
+def create_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog='receipt',
         description='Add taxes to purchased items and prints the receipt.',
+        epilog='Run `receipt serve -h` to serve receipts over HTTP.',
     )
-    parser.add_argument(
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument(
         '-i',
         '--input',
         metavar='BASKET',
-        help='a path to a file containing a basket',
-        required=True,
+        help='a path to a file containing a basket, as text or binary',
+    )
+    inputs.add_argument(
+        '--input-dir',
+        metavar='DIR',
+        help='a path to a directory of basket files',
+    )
+    inputs.add_argument(
+        '--inputs',
+        metavar='BASKET',
+        nargs='+',
+        help='paths to basket files',
     )
+    parser.add_argument(
+        '--output',
+        metavar='PATH',
+        help='the file where the receipt of --input is written (default: stdout)',  # noqa: E501
+    )
+    parser.add_argument(
+        '-f',
+        '--format',
+        help='the format of the receipts (default: %(default)s)',
+        choices=list(RENDERERS),
+        default='text',
+    )
+    parser.add_argument(
+        '-o',
+        '--output-dir',
+        metavar='DIR',
+        help=(
+            'the directory where receipts are written when processing '
+            'multiple baskets (default: current directory)'
+        ),
+    )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        metavar='N',
+        help=(
+            'number of worker processes used for multiple baskets '
+            '(default: number of CPUs), or to split a large basket '
+            '(default: 1)'
+        ),
+        type=int,
+    )
+    parser.add_argument(
+        '-c',
+        '--catalogue',
+        metavar='CATALOGUE',
+        help=(
+            'a path to a SQLite product catalogue (see receipt-catalogue); '
+            'the kata example products are used by default'
+        ),
+    )
+    add_tax_arguments(parser)
     parser.add_argument(
         '-v',
         '--verbose',
@@ -84,7 +374,18 @@ def parse_args():
         action='count',
         default=0,
     )
-    return parser.parse_args()
+    return parser
+
+
+def parse_args(parser: argparse.ArgumentParser):
+    args = parser.parse_args()
+    if args.output is not None and args.input is None:
+        parser.error('--output can only be used with -i/--input')
+    if args.output_dir is not None and args.input is not None:
+        parser.error('--output-dir can not be used with -i/--input')
+    if args.output_dir is None:
+        args.output_dir = '.'
+    return args
 
 
 def log_level_from_verbosity(verbosity: int):
@@ -95,13 +396,119 @@ def log_level_from_verbosity(verbosity: int):
     return logging.ERROR
 
 
-def main():
-    args = parse_args()
-    config = CliController.Config(
+def read_tax_rules(path: Optional[str]) -> TaxTable:
+    """ Return the tax table compiled from the rule set in :param path:,
+    or the kata one if :param path: is None. """
+    if path is None:
+        return TAX_TABLE
+    with open(path, mode='r', encoding='utf-8') as f:
+        return load_tax_rules(f)
+
+
+TAX_RULES_ERRORS = (
+    OSError,
+    TaxRulesError.InvalidRules,
+    TaxRulesError.UnsupportedVersion,
+)
+
+
+def create_config(args) -> CliController.Config:
+    try:
+        tax_table = read_tax_rules(args.tax_rules)
+    except TAX_RULES_ERRORS as e:
+        sys.exit(f'error: {e}')
+    return CliController.Config(
         log_level=log_level_from_verbosity(args.verbose),
         encoding='utf-8',
+        catalogue=args.catalogue,
+        tax_table=tax_table,
+        tax_lookup_ceiling=args.tax_lookup_ceiling,
+        tax_lookup_cache=args.tax_lookup_cache,
+        format=getattr(args, 'format', 'text'),
+    )
+
+
+def serve_main(argv: List[str]):
+    args = parse_serve_args(argv)
+    config = create_config(args)
+    logging.basicConfig(level=config.log_level)
+    workers = args.workers or os.cpu_count() or 1
+    server_config = ServerConfig(
+        host=args.host,
+        port=args.port,
+        unix_socket=args.unix_socket,
+        workers=workers,
+        max_pending=args.max_pending or 4 * workers,
     )
+
+    def on_ready(message: str):
+        print(message, flush=True)
+
+    def reload_config() -> CliController.Config:
+        return replace(config, tax_table=read_tax_rules(args.tax_rules))
+
+    asyncio.run(serve(
+        CliController,
+        config,
+        server_config,
+        on_ready,
+        reload_config=reload_config if args.tax_rules is not None else None,
+    ))
+
+
+def main():
+    if sys.argv[1:2] == ['serve']:
+        return serve_main(sys.argv[2:])
+
+    parser = create_parser()
+    args = parse_args(parser)
+    config = create_config(args)
+
+    if args.input is None:
+        try:
+            input_paths = args.inputs or list_baskets(args.input_dir)
+            results = process_baskets(
+                create_controller=CliController,
+                config=config,
+                input_paths=input_paths,
+                output_dir=args.output_dir,
+                jobs=args.jobs or os.cpu_count() or 1,
+            )
+        except (BatchError.DuplicateOutput, OSError) as e:
+            parser.error(str(e))
+        write_summary(results, sys.stdout)
+        if any(result.error is not None for result in results):
+            sys.exit(1)
+        return
+
+    if args.output is None:
+        return write_single_receipt(config, args.input, args.jobs, sys.stdout)
+
+    with open(
+        args.output,
+        mode='w',
+        encoding=config.encoding,
+        buffering=OUTPUT_BUFFER_SIZE,
+    ) as output:
+        write_single_receipt(config, args.input, args.jobs, output)
+
+
+def write_single_receipt(
+    config: CliController.Config,
+    input_path: str,
+    jobs: Optional[int],
+    output: TextIO,
+):
     controller = CliController(config=config)
+    if jobs is not None and jobs > 1:
+        articles_in_basket = create_basket_in_shards(
+            create_controller=CliController,
+            config=config,
+            input_path=input_path,
+            jobs=jobs,
+        )
+        if articles_in_basket is not None:
+            controller.write_basket(articles_in_basket, output)
+            return
 
-    printed_receipt = controller.print_receipt(args.input)
-    print(printed_receipt)
+    controller.write_receipt(input_path, output)
@@ -0,0 +1,90 @@
+import argparse
+import os
+import sys
+
+from taxes.services.binary_basket import (
+    BinaryBasketError,
+    is_binary_basket,
+    write_items,
+)
+from taxes.services.parser import (
+    Buffer,
+    is_mappable,
+    iter_items,
+    map_file,
+    ParserError,
+)
+
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+class ConverterError:
+    class AlreadyBinary(Exception):
+        def __init__(self):
+            super().__init__('the input is already a binary basket')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog='receipt-convert',
+        description=(
+            'Convert a basket to the binary basket format, which receipt '
+            'reads without parsing text.'
+        ),
+    )
+    parser.add_argument(
+        '-i',
+        '--input',
+        metavar='BASKET',
+        help='a path to the basket to convert',
+        required=True,
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        metavar='BINARY_BASKET',
+        help='a path to the binary basket to write',
+        required=True,
+    )
+    return parser.parse_args()
+
+
+def convert(buffer: Buffer, output_path: str, release_pages: bool = False):
+    """ Write the basket in :param buffer: to :param output_path: as a
+    binary basket. See `iter_windows` for :param release_pages:.
+
+    :param output_path: is replaced atomically, and left as it was if the
+    basket can't be converted.
+    """
+    if is_binary_basket(buffer):
+        raise ConverterError.AlreadyBinary()
+    temporary_path = f'{output_path}.{os.getpid()}.tmp'
+    try:
+        with open(
+            temporary_path,
+            mode='wb',
+            buffering=WRITE_BUFFER_SIZE,
+        ) as f:
+            write_items(iter_items(buffer, release_pages=release_pages), f)
+        os.replace(temporary_path, output_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def main():
+    args = parse_args()
+    try:
+        with open(args.input, mode='rb') as f:
+            if not is_mappable(f):
+                convert(f.read(), args.output)
+                return
+            with map_file(f) as buffer:
+                convert(buffer, args.output, release_pages=True)
+    except (
+        BinaryBasketError.UnsupportedItem,
+        ConverterError.AlreadyBinary,
+        ParserError.MalformedInput,
+    ) as e:
+        sys.exit(f'error: {e}')
@@ -0,0 +1,275 @@
+import argparse
+import csv
+import itertools
+import math
+import random
+import sys
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Optional, TextIO, Tuple
+
+from taxes.services.tax.entities.applicable_taxes import EXEMPT_CATEGORIES
+
+
+NON_EXEMPT_CATEGORY = 'other'
+PRICE_DISTRIBUTIONS = ('uniform', 'lognormal')
+MAX_QUANTITY = 9
+
+# lines are drawn and written in chunks, so that memory doesn't grow with
+# the size of the file; the chunk size is fixed to keep the output of a seed
+# independent of the buffering
+CHUNK_SIZE = 1 << 16
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class WorkloadConfig:
+    lines: int
+    products: int
+    zipf: float
+    imported: float
+    exempt: float
+    malformed: float
+    prices: str
+    min_price: float
+    max_price: float
+    seed: Optional[int]
+
+
+@dataclass(frozen=True)
+class GeneratedProduct:
+    name: str
+    category: str
+    price: str
+
+
+def draw_price(rng: random.Random, config: WorkloadConfig) -> str:
+    """ Draw a unit price between the price bounds of :param config:.
+
+    Lognormal prices are centered on the geometric mean of the bounds, so
+    that most of them are cheap and a few are expensive.
+    """
+    low, high = config.min_price, config.max_price
+    if config.prices == 'lognormal' and low > 0:
+        mu = (math.log(low) + math.log(high)) / 2
+        sigma = (math.log(high) - math.log(low)) / 6
+        price = min(high, max(low, rng.lognormvariate(mu, sigma)))
+    else:
+        price = rng.uniform(low, high)
+    return f'{price:.2f}'
+
+
+def generate_products(
+    rng: random.Random,
+    config: WorkloadConfig,
+) -> List[GeneratedProduct]:
+    """ Return the products of the workload, from the most popular one. """
+    return [
+        GeneratedProduct(
+            name=f'product {i}',
+            category=(
+                rng.choice(EXEMPT_CATEGORIES)
+                if rng.random() < config.exempt
+                else NON_EXEMPT_CATEGORY
+            ),
+            price=draw_price(rng, config),
+        )
+        for i in range(config.products)
+    ]
+
+
+def get_entries(
+    products: List[GeneratedProduct],
+    config: WorkloadConfig,
+) -> Tuple[List[str], List[float]]:
+    """ Return the line suffixes that follow the quantity, and their
+    cumulative weights.
+
+    Each product has a domestic and an imported entry, whose weights follow
+    a Zipf distribution of exponent `config.zipf` over the products, split
+    by the import ratio. Malformed entries share the malformed ratio.
+    """
+    popularity = [1 / (rank ** config.zipf) for rank in range(1, len(products) + 1)]  # noqa: E501
+    total = sum(popularity)
+    well_formed = 1 - config.malformed
+    entries, weights = [], []
+    for product, weight in zip(products, popularity):
+        weight = weight / total * well_formed
+        entries.append(f' {product.name} at {product.price}\n')
+        weights.append(weight * (1 - config.imported))
+        entries.append(f' imported {product.name} at {product.price}\n')
+        weights.append(weight * config.imported)
+
+    malformed = [
+        f' {products[0].name} at\n',
+        f' {products[0].name} for {products[0].price}\n',
+        f' {products[0].name} at {products[0].price} each\n',
+        f' at {products[0].price}\n',
+    ]
+    entries.extend(malformed)
+    weights.extend([config.malformed / len(malformed)] * len(malformed))
+    return entries, list(itertools.accumulate(weights))
+
+
+def generate_chunks(config: WorkloadConfig) -> Iterator[bytes]:
+    """ Yield the lines of the workload described by :param config:, a
+    chunk at a time. The same seed always yields the same lines. """
+    rng = random.Random(config.seed)
+    entries, cum_weights = get_entries(generate_products(rng, config), config)
+    quantities = [str(q) for q in range(1, MAX_QUANTITY + 1)]
+    remaining = config.lines
+    while remaining > 0:
+        size = min(CHUNK_SIZE, remaining)
+        remaining -= size
+        yield ''.join(map(
+            str.__add__,
+            rng.choices(quantities, k=size),
+            rng.choices(entries, cum_weights=cum_weights, k=size),
+        )).encode('utf-8')
+
+
+def write_workload(config: WorkloadConfig, output: BinaryIO):
+    for chunk in generate_chunks(config):
+        output.write(chunk)
+
+
+def write_catalogue(config: WorkloadConfig, output: TextIO):
+    """ Write the products of the workload as a CSV catalogue that can be
+    imported with receipt-catalogue. """
+    writer = csv.writer(output)
+    writer.writerow(['name', 'category'])
+    products = generate_products(random.Random(config.seed), config)
+    writer.writerows((p.name, p.category) for p in products)
+
+
+def ratio(value: str) -> float:
+    number = float(value)
+    if not 0 <= number <= 1:
+        raise argparse.ArgumentTypeError(f'not between 0 and 1: {value}')
+    return number
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog='receipt-gen',
+        description='Generate a synthetic basket file.',
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        metavar='BASKET',
+        help='a path to the basket to write (default: stdout)',
+    )
+    parser.add_argument(
+        '-n',
+        '--lines',
+        metavar='N',
+        help='number of lines (default: %(default)s)',
+        type=int,
+        default=1000,
+    )
+    parser.add_argument(
+        '-p',
+        '--products',
+        metavar='N',
+        help='number of distinct products (default: %(default)s)',
+        type=int,
+        default=1000,
+    )
+    parser.add_argument(
+        '--zipf',
+        metavar='EXPONENT',
+        help=(
+            'exponent of the Zipf distribution of product popularity, '
+            '0 for uniform (default: %(default)s)'
+        ),
+        type=float,
+        default=1.0,
+    )
+    parser.add_argument(
+        '--imported',
+        metavar='RATIO',
+        help='fraction of imported lines (default: %(default)s)',
+        type=ratio,
+        default=0.3,
+    )
+    parser.add_argument(
+        '--exempt',
+        metavar='RATIO',
+        help=(
+            'fraction of products in exempt categories, see --catalogue '
+            '(default: %(default)s)'
+        ),
+        type=ratio,
+        default=0.3,
+    )
+    parser.add_argument(
+        '--malformed',
+        metavar='RATIO',
+        help='fraction of malformed lines (default: %(default)s)',
+        type=ratio,
+        default=0.0,
+    )
+    parser.add_argument(
+        '--prices',
+        help='distribution of unit prices (default: %(default)s)',
+        choices=PRICE_DISTRIBUTIONS,
+        default='lognormal',
+    )
+    parser.add_argument(
+        '--price-range',
+        metavar=('MIN', 'MAX'),
+        help='bounds of unit prices (default: 0.5 500)',
+        type=float,
+        nargs=2,
+        default=[0.5, 500.0],
+    )
+    parser.add_argument(
+        '-s',
+        '--seed',
+        help='seed of the random generator (default: %(default)s)',
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        '--catalogue',
+        metavar='CSV',
+        help=(
+            'also write the categories of the products to a CSV catalogue, '
+            'to be imported with receipt-catalogue'
+        ),
+    )
+    args = parser.parse_args()
+    if args.lines < 0:
+        parser.error('--lines must not be negative')
+    if args.products < 1:
+        parser.error('--products must be positive')
+    min_price, max_price = args.price_range
+    if not 0 <= min_price <= max_price:
+        parser.error('--price-range must be 0 <= MIN <= MAX')
+    return args
+
+
+def main():
+    args = parse_args()
+    min_price, max_price = args.price_range
+    config = WorkloadConfig(
+        lines=args.lines,
+        products=args.products,
+        zipf=args.zipf,
+        imported=args.imported,
+        exempt=args.exempt,
+        malformed=args.malformed,
+        prices=args.prices,
+        min_price=min_price,
+        max_price=max_price,
+        seed=args.seed,
+    )
+    if args.catalogue is not None:
+        with open(args.catalogue, mode='w', encoding='utf-8', newline='') as f:  # noqa: E501
+            write_catalogue(config, f)
+    if args.output is None:
+        write_workload(config, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+        return
+    with open(args.output, mode='wb', buffering=WRITE_BUFFER_SIZE) as f:
+        write_workload(config, f)
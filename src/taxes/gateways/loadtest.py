@@ -0,0 +1,172 @@
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+
+@dataclass
+class LoadTestResult:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return 0
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def summary(self) -> str:
+        completed = len(self.latencies)
+        throughput = completed / self.elapsed if self.elapsed else 0
+        return '\n'.join([
+            f'requests: {completed + self.errors}',
+            f'errors: {self.errors}',
+            f'elapsed: {self.elapsed:.3f}s',
+            f'throughput: {throughput:.1f} req/s',
+            *[
+                f'latency p{int(p * 100)}: {self.percentile(p) * 1000:.2f}ms'
+                for p in (0.5, 0.9, 0.99)
+            ],
+            f'latency max: {max(self.latencies, default=0) * 1000:.2f}ms',
+        ])
+
+
+def build_request(host: str, path: str, body: bytes) -> bytes:
+    head = '\r\n'.join([
+        f'POST {path} HTTP/1.1',
+        f'Host: {host}',
+        'Content-Type: text/plain; charset=utf-8',
+        f'Content-Length: {len(body)}',
+        '',
+        '',
+    ])
+    return head.encode('ascii') + body
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """ Read an HTTP response and return its status code. """
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    content_length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            content_length = int(value)
+    await reader.readexactly(content_length)
+    return status
+
+
+async def open_connection(url: str, unix_socket: Optional[str]):
+    if unix_socket:
+        return await asyncio.open_unix_connection(unix_socket)
+    parts = urlsplit(url)
+    return await asyncio.open_connection(parts.hostname, parts.port or 80)
+
+
+async def run_client(
+    url: str,
+    unix_socket: Optional[str],
+    request: bytes,
+    requests: List[None],
+    result: LoadTestResult,
+):
+    """ Send requests over a single keep-alive connection until
+    :param requests: is exhausted. """
+    reader, writer = await open_connection(url, unix_socket)
+    try:
+        while requests:
+            requests.pop()
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await read_response(reader)
+            if status == 200:
+                result.latencies.append(time.perf_counter() - start)
+            else:
+                result.errors += 1
+    finally:
+        writer.close()
+
+
+async def load_test(
+    url: str,
+    unix_socket: Optional[str],
+    body: bytes,
+    requests: int,
+    concurrency: int,
+) -> LoadTestResult:
+    """ Send :param requests: receipt requests for :param body: over
+    :param concurrency: connections. """
+    parts = urlsplit(url)
+    request = build_request(parts.netloc or 'localhost', parts.path or '/', body)  # noqa: E501
+    pending = [None] * requests
+    result = LoadTestResult()
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        run_client(url, unix_socket, request, pending, result)
+        for _ in range(concurrency)
+    ])
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog='receipt-loadtest',
+        description='Send receipt requests to a `receipt serve` instance.',
+    )
+    parser.add_argument(
+        '-i',
+        '--input',
+        metavar='BASKET',
+        help='a path to a file containing the basket to send',
+        required=True,
+    )
+    parser.add_argument(
+        '-u',
+        '--url',
+        help='the url of the server (default: %(default)s)',
+        default='http://127.0.0.1:8080/receipt',
+    )
+    parser.add_argument(
+        '--unix-socket',
+        metavar='PATH',
+        help='connect to a unix socket instead of the host in --url',
+    )
+    parser.add_argument(
+        '-n',
+        '--requests',
+        metavar='N',
+        help='total number of requests (default: %(default)s)',
+        type=int,
+        default=1000,
+    )
+    parser.add_argument(
+        '-c',
+        '--concurrency',
+        metavar='N',
+        help='number of concurrent connections (default: %(default)s)',
+        type=int,
+        default=8,
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with open(args.input, mode='rb') as f:
+        body = f.read()
+    result = asyncio.run(load_test(
+        url=args.url,
+        unix_socket=args.unix_socket,
+        body=body,
+        requests=args.requests,
+        concurrency=args.concurrency,
+    ))
+    print(result.summary())
@@ -0,0 +1,122 @@
+import csv
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Protocol, TextIO
+
+from taxes.services.receipt.entities.receipt import ReceiptItem, ReceiptTotals
+
+
+class RendererError:
+    class UnknownFormat(Exception):
+        def __init__(self, value):
+            super().__init__(f'unknown receipt format: {value}')
+
+
+def item_to_str(item: ReceiptItem) -> str:
+    return ' '.join([
+        f'{item.quantity}',
+        f'{item.description}:',
+        f'{item.subtotal_price_with_taxes}'
+    ])
+
+
+def totals_to_str(totals: ReceiptTotals) -> str:
+    return '\n'.join([
+        f'Sales Taxes: {totals.taxes_due}',
+        f'Total: {totals.total_due}',
+    ])
+
+
+def item_to_dict(item: ReceiptItem) -> Dict[str, Any]:
+    """ The JSON object of a receipt item. """
+    return {
+        'quantity': item.quantity,
+        'description': item.description,
+        'subtotal_price_with_taxes': str(item.subtotal_price_with_taxes),
+    }
+
+
+def totals_to_dict(totals: ReceiptTotals) -> Dict[str, Any]:
+    """ The JSON object of the totals of a receipt. """
+    return {
+        'taxes_due': str(totals.taxes_due),
+        'total_due': str(totals.total_due),
+    }
+
+
+class Renderer(Protocol):
+    """ Write a receipt one item at a time, as items are created, and its
+    totals at the end. """
+
+    def write_item(self, item: ReceiptItem):  # pragma: no cover
+        ...
+
+    def write_totals(self, totals: ReceiptTotals):  # pragma: no cover
+        ...
+
+
+@dataclass
+class TextRenderer:
+    """ The receipt format of the kata. """
+    output: TextIO
+
+    def write_item(self, item: ReceiptItem):
+        self.output.write(item_to_str(item) + '\n')
+
+    def write_totals(self, totals: ReceiptTotals):
+        self.output.write(totals_to_str(totals) + '\n')
+
+
+@dataclass
+class CsvRenderer:
+    """ A `quantity,description,subtotal_price_with_taxes` row per item,
+    followed by a `Sales Taxes` and a `Total` row without quantity. """
+    output: TextIO
+
+    def __post_init__(self):
+        self.writer = csv.writer(self.output, lineterminator='\n')
+        self.writer.writerow(
+            ['quantity', 'description', 'subtotal_price_with_taxes']
+        )
+
+    def write_item(self, item: ReceiptItem):
+        self.writer.writerow(
+            [item.quantity, item.description, item.subtotal_price_with_taxes]
+        )
+
+    def write_totals(self, totals: ReceiptTotals):
+        self.writer.writerows([
+            ['', 'Sales Taxes', totals.taxes_due],
+            ['', 'Total', totals.total_due],
+        ])
+
+
+@dataclass
+class JsonLinesRenderer:
+    """ A JSON object per item, with the fields of the items of the JSON
+    receipts of the server, followed by an object with the totals. """
+    output: TextIO
+
+    def write_item(self, item: ReceiptItem):
+        self.output.write(json.dumps(item_to_dict(item)) + '\n')
+
+    def write_totals(self, totals: ReceiptTotals):
+        self.output.write(json.dumps(totals_to_dict(totals)) + '\n')
+
+
+CreateRenderer = Callable[[TextIO], Renderer]
+
+RENDERERS: Mapping[str, CreateRenderer] = {
+    'text': TextRenderer,
+    'csv': CsvRenderer,
+    'jsonl': JsonLinesRenderer,
+}
+
+
+def get_renderer(name: str) -> CreateRenderer:
+    """ Return the renderer of the receipt format registered as
+    :param name:. """
+    try:
+        return RENDERERS[name]
+    except KeyError:
+        raise RendererError.UnknownFormat(name)
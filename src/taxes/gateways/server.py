@@ -0,0 +1,380 @@
+import asyncio
+import json
+import logging
+import signal
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from taxes.gateways.renderers import item_to_dict, totals_to_dict
+from taxes.services.binary_basket import (
+    is_binary_basket,
+    iter_items as iter_binary_items,
+)
+from taxes.services.parser import ParserError, parse_items
+from taxes.services.receipt.entities.receipt import Receipt
+
+
+logger = logging.getLogger('server')
+
+CONTENT_TYPE_TEXT = 'text/plain; charset=utf-8'
+CONTENT_TYPE_JSON = 'application/json'
+RECEIPT_PATHS = ('/', '/receipt')
+HEALTH_PATH = '/health'
+MAX_HEADER_LINES = 100
+# larger bodies are rejected before they are read
+MAX_BODY_SIZE = 1 << 24
+# seconds to wait for the client to close after a bad request
+LINGER_TIMEOUT = 2.0
+
+
+@dataclass(frozen=True)
+class Request:
+    method: str
+    path: str
+    query: Dict[str, Any]
+    headers: Dict[str, str]
+    body: bytes
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get('connection', '').lower() != 'close'
+
+    @property
+    def wants_json(self) -> bool:
+        if self.query.get('format') == ['json']:
+            return True
+        return CONTENT_TYPE_JSON in self.headers.get('accept', '')
+
+
+@dataclass(frozen=True)
+class Response:
+    status: HTTPStatus
+    content_type: str
+    body: bytes
+
+    def to_bytes(self, keep_alive: bool) -> bytes:
+        head = '\r\n'.join([
+            f'HTTP/1.1 {self.status.value} {self.status.phrase}',
+            f'Content-Type: {self.content_type}',
+            f'Content-Length: {len(self.body)}',
+            f'Connection: {"keep-alive" if keep_alive else "close"}',
+            '',
+            '',
+        ])
+        return head.encode('ascii') + self.body
+
+
+class ServerError:
+    class BadRequest(Exception):
+        pass
+
+
+def text_response(status: HTTPStatus, text: str) -> Response:
+    return Response(status, CONTENT_TYPE_TEXT, text.encode('utf-8'))
+
+
+def receipt_to_json(receipt: Receipt) -> str:
+    return json.dumps({
+        'items': [item_to_dict(item) for item in receipt.items],
+        **totals_to_dict(receipt),
+    })
+
+
+# Per-process state of the workers, see `init_worker`.
+controller = None
+
+
+def init_worker(create_controller: Callable[..., Any], config: Any):
+    """ Wire the services once per worker process. """
+    global controller
+    controller = create_controller(config=config)
+
+
+def create_receipt(body: bytes, as_json: bool) -> Tuple[int, str, bytes]:
+    """ Parse the basket in :param body: and return the rendered receipt as
+    (status, content type, body).
+
+    This is the CPU-bound part of a request and runs in the worker pool.
+    """
+    try:
+        if is_binary_basket(body):
+            purchased_items = list(iter_binary_items(body))
+        else:
+            purchased_items = parse_items(
+                body,
+                encoding=controller.config.encoding,
+                parse=controller.parse_item,
+            ).items
+        receipt = controller.create_receipt(
+            controller.create_basket(purchased_items)
+        )
+    except (UnicodeDecodeError, ParserError.MalformedInput) as e:
+        message = f'malformed basket: {type(e).__name__} {e}'.strip() + '\n'
+        return HTTPStatus.BAD_REQUEST, CONTENT_TYPE_TEXT, message.encode()
+    except Exception as e:
+        message = f'invalid basket: {type(e).__name__}: {e}\n'
+        return HTTPStatus.UNPROCESSABLE_ENTITY, CONTENT_TYPE_TEXT, message.encode()  # noqa: E501
+
+    if as_json:
+        return HTTPStatus.OK, CONTENT_TYPE_JSON, receipt_to_json(receipt).encode()  # noqa: E501
+
+    printed_receipt = controller.receipt_to_str(receipt) + '\n'
+    return HTTPStatus.OK, CONTENT_TYPE_TEXT, printed_receipt.encode('utf-8')
+
+
+async def read_line(reader: asyncio.StreamReader) -> bytes:
+    try:
+        return await reader.readline()
+    except ValueError:
+        # the line doesn't fit in the buffer limit of :param reader:
+        raise ServerError.BadRequest('line too long')
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """ Read an HTTP/1.1 request; return None if the connection is closed. """
+    request_line = await read_line(reader)
+    if not request_line:
+        return None
+
+    try:
+        method, target, _ = request_line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise ServerError.BadRequest('malformed request line')
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await read_line(reader)
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise ServerError.BadRequest('too many headers')
+
+    try:
+        content_length = int(headers.get('content-length', '0'))
+    except ValueError:
+        raise ServerError.BadRequest('malformed content length')
+    if content_length < 0:
+        raise ServerError.BadRequest('negative content length')
+    if content_length > MAX_BODY_SIZE:
+        raise ServerError.BadRequest(
+            f'content length exceeds {MAX_BODY_SIZE} bytes'
+        )
+    body = await reader.readexactly(content_length) if content_length else b''
+
+    url = urlsplit(target)
+    return Request(
+        method=method.upper(),
+        path=url.path,
+        query=parse_qs(url.query),
+        headers=headers,
+        body=body,
+    )
+
+
+async def linger(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """ Stop writing and discard the input until the client closes the
+    connection, so that closing it with unread input doesn't reset it before
+    the client has read the response. """
+    if writer.can_write_eof():
+        writer.write_eof()
+    try:
+        await asyncio.wait_for(discard(reader), LINGER_TIMEOUT)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def discard(reader: asyncio.StreamReader):
+    while await reader.read(1 << 16):
+        pass
+
+
+@dataclass
+class ReceiptServer:
+    """ Answer receipt requests over HTTP.
+
+    Services are wired once per worker of :param executor:, and at most
+    :param max_pending: requests are handed to the executor at any time, the
+    others wait for a free slot.
+    """
+    executor: Executor
+    max_pending: int
+
+    def __post_init__(self):
+        self.pending = asyncio.Semaphore(self.max_pending)
+
+    async def respond(self, request: Request) -> Response:
+        if request.path == HEALTH_PATH and request.method == 'GET':
+            return text_response(HTTPStatus.OK, 'ok\n')
+
+        if request.path not in RECEIPT_PATHS:
+            return text_response(HTTPStatus.NOT_FOUND, 'not found\n')
+
+        if request.method != 'POST':
+            return text_response(
+                HTTPStatus.METHOD_NOT_ALLOWED,
+                'method not allowed\n',
+            )
+
+        loop = asyncio.get_running_loop()
+        async with self.pending:
+            try:
+                status, content_type, body = await loop.run_in_executor(
+                    self.executor,
+                    create_receipt,
+                    request.body,
+                    request.wants_json,
+                )
+            except BrokenProcessPool as e:
+                logger.error('worker pool is broken: %s', e)
+                return text_response(
+                    HTTPStatus.INTERNAL_SERVER_ERROR,
+                    'internal server error\n',
+                )
+        return Response(HTTPStatus(status), content_type, body)
+
+    async def handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except ServerError.BadRequest as e:
+                    response = text_response(HTTPStatus.BAD_REQUEST, f'{e}\n')
+                    writer.write(response.to_bytes(keep_alive=False))
+                    await linger(reader, writer)
+                    break
+                if request is None:
+                    break
+
+                response = await self.respond(request)
+                logger.info(
+                    '%s %s %s',
+                    request.method,
+                    request.path,
+                    response.status.value,
+                )
+                writer.write(response.to_bytes(keep_alive=request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@dataclass
+class ServerConfig:
+    host: str
+    port: int
+    unix_socket: Optional[str]
+    workers: int
+    max_pending: int
+
+
+def create_executor(
+    create_controller: Callable[..., Any],
+    controller_config: Any,
+    workers: int,
+) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(create_controller, controller_config),
+    )
+
+
+def reload_workers(
+    receipt_server: ReceiptServer,
+    create_controller: Callable[..., Any],
+    reload_config: Callable[[], Any],
+    workers: int,
+):
+    """ Replace the workers of :param receipt_server: with workers wired
+    with the config returned by :param reload_config:.
+
+    The new pool takes over at once, while the requests already handed to the
+    old pool are completed by it, so that each request is served by workers
+    wired with either the old or the new config. The old config is kept if
+    :param reload_config: raises an error.
+    """
+    try:
+        controller_config = reload_config()
+    except Exception as e:
+        logger.error('reload failed, keeping current config: %s', e)
+        return
+
+    old_executor = receipt_server.executor
+    receipt_server.executor = create_executor(
+        create_controller,
+        controller_config,
+        workers,
+    )
+    old_executor.shutdown(wait=False)
+    logger.info('workers reloaded')
+
+
+async def serve(
+    create_controller: Callable[..., Any],
+    controller_config: Any,
+    config: ServerConfig,
+    on_ready: Callable[[str], None] = print,
+    reload_config: Optional[Callable[[], Any]] = None,
+):
+    """ Serve receipts until SIGINT or SIGTERM is received.
+
+    If :param reload_config: is set, workers are wired again with the config
+    it returns when SIGHUP is received.
+    """
+    receipt_server = ReceiptServer(
+        executor=create_executor(
+            create_controller,
+            controller_config,
+            config.workers,
+        ),
+        max_pending=config.max_pending,
+    )
+    try:
+        if config.unix_socket:
+            server = await asyncio.start_unix_server(
+                receipt_server.handle_connection,
+                path=config.unix_socket,
+            )
+            address = f'unix:{config.unix_socket}'
+        else:
+            server = await asyncio.start_server(
+                receipt_server.handle_connection,
+                host=config.host,
+                port=config.port,
+            )
+            host, port = server.sockets[0].getsockname()[:2]
+            address = f'http://{host}:{port}'
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        if reload_config is not None:
+            loop.add_signal_handler(
+                signal.SIGHUP,
+                reload_workers,
+                receipt_server,
+                create_controller,
+                reload_config,
+                config.workers,
+            )
+
+        async with server:
+            on_ready(f'serving receipts on {address}')
+            await stop.wait()
+    finally:
+        receipt_server.executor.shutdown()
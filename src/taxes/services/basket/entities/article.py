@@ -5,8 +5,10 @@ from taxes.services.basket.entities.product import (
     Product,
     create as create_product,
 )
+from taxes.services.slotted import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class Article:
     product: Product
@@ -1,12 +1,10 @@
-from copy import deepcopy
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Iterable, Mapping
+from typing import Dict, Iterable, Mapping, Optional, Tuple
 
-from taxes.services.basket.entities.article import (
-    Article,
-    create as create_article,
-)
+from taxes.services.basket.entities.article import Article
+from taxes.services.basket.entities.product import Product
+from taxes.services.slotted import slotted
 
 
 @dataclass(frozen=True)
@@ -14,6 +12,7 @@ class Basket:
     articles: Mapping['BasketEntryKey', Article]
 
 
+@slotted
 @dataclass(frozen=True)
 class BasketEntryKey:
     product_name: str
@@ -41,31 +40,85 @@ def get_quantity(key: BasketEntryKey, basket: Basket) -> int:
     return 0
 
 
+@dataclass
+class BasketBuilder:
+    """ A mutable accumulator of articles.
+
+    Articles are aggregated in place, so adding an article costs amortized
+    O(1) regardless of the number of articles already added; `build` freezes
+    the accumulated articles into a Basket.
+
+    Equal products are interned, so all the articles of a product share the
+    same Product instance.
+    """
+    articles: Dict[BasketEntryKey, Article] = field(default_factory=dict)
+    products: Dict[Tuple[str, Optional[str]], Product] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def from_basket(cls, basket: Basket) -> 'BasketBuilder':
+        builder = cls()
+        for key, article in basket.articles.items():
+            builder.articles[key] = builder.with_interned_product(article)
+        return builder
+
+    def intern(self, product: Product) -> Product:
+        """ Return the product equal to :param product: that was first seen
+        by this builder. """
+        return self.products.setdefault(
+            (product.name, product.category),
+            product,
+        )
+
+    def with_interned_product(self, article: Article) -> Article:
+        product = self.intern(article.product)
+        if product is article.product:
+            return article
+        return Article(
+            product=product,
+            imported=article.imported,
+            quantity=article.quantity,
+            unit_price_before_taxes=article.unit_price_before_taxes,
+        )
+
+    def add_article(self, article: Article) -> 'BasketBuilder':
+        """ Add :param article: to the articles being accumulated.
+
+        If the product has already been added, its quantity is increased by
+        :param article.quantity:. """
+        key = create_key(article)
+        quantity = self.get_quantity(key)
+        if quantity:
+            article = Article(
+                product=self.intern(article.product),
+                imported=article.imported,
+                quantity=quantity + article.quantity,
+                unit_price_before_taxes=article.unit_price_before_taxes,
+            )
+        else:
+            article = self.with_interned_product(article)
+        self.articles[key] = article
+        return self
+
+    def get_quantity(self, key: BasketEntryKey) -> int:
+        article = self.articles.get(key)
+        if article:
+            return article.quantity
+        return 0
+
+    def build(self) -> Basket:
+        return Basket(articles=dict(self.articles))
+
+
 def add_article(article: Article, basket: Basket) -> Basket:
     """ Add :param article: to :param basket:.
 
     If the product is already in the basket, its quantity is increased by
     :param article.quantity:. """
-    key = create_key(article)
-    updated_article = create_article(
-        product_name=key.product_name,
-        product_category=article.product.category,
-        unit_price_before_taxes=key.unit_price,
-        quantity=get_quantity(key, basket) + article.quantity,
-        imported=key.imported
-    )
-
-    return Basket(articles={**deepcopy(basket.articles), key: updated_article})
+    return BasketBuilder.from_basket(basket).add_article(article).build()
 
 
 def list_articles(basket: Basket) -> Iterable[Article]:
     """ Return the list of articles in :param basket:. """
-    return [
-        create_article(
-            product_name=article.product.name,
-            product_category=article.product.category,
-            unit_price_before_taxes=article.unit_price_before_taxes,
-            imported=article.imported,
-            quantity=article.quantity,
-        ) for article in basket.articles.values()
-    ]
+    return list(basket.articles.values())
@@ -0,0 +1,220 @@
+from array import array
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from taxes.services.basket.entities.article import Article
+from taxes.services.basket.entities.basket import BasketEntryKey
+from taxes.services.basket.entities.product import Product
+
+
+class ColumnarBasketError:
+    class UnsupportedPrice(Exception):
+        def __init__(self, value):
+            super().__init__(
+                f'unit price can\'t be stored as integer cents: {value}'
+            )
+
+
+MAX_NAMES = 1 << 32
+# range of the signed 64-bit integers prices in cents are stored as
+MIN_PRICE_IN_CENTS = -(1 << 63)
+MAX_PRICE_IN_CENTS = (1 << 63) - 1
+
+# open addressing: the index is a table of rows, probed linearly from a
+# Fibonacci hash of the entry key and kept at most half full
+EMPTY = -1
+MIN_INDEX_BITS = 3
+FIBONACCI_MULTIPLIER = 0x9E3779B97F4A7C15
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+
+# quantizers restoring the exponent prices were given with, e.g. `1.0`
+EXPONENTS: Dict[int, Decimal] = {}
+
+
+def to_cents(price: Decimal) -> Tuple[int, int]:
+    """ Split :param price: in integer cents and the exponent of its
+    decimal representation. """
+    scaled = price.scaleb(2)
+    try:
+        cents = int(scaled)
+    except (ValueError, OverflowError):
+        raise ColumnarBasketError.UnsupportedPrice(price)
+    exponent = price.as_tuple().exponent
+    if (
+        cents != scaled
+        or not MIN_PRICE_IN_CENTS <= cents <= MAX_PRICE_IN_CENTS
+        or not -128 <= exponent <= 127
+    ):
+        raise ColumnarBasketError.UnsupportedPrice(price)
+    return cents, exponent
+
+
+def from_cents(cents: int, exponent: int) -> Decimal:
+    """ Inverse of `to_cents`. """
+    price = Decimal(cents).scaleb(-2)
+    if exponent == -2:
+        return price
+    quantizer = EXPONENTS.get(exponent)
+    if quantizer is None:
+        quantizer = EXPONENTS[exponent] = Decimal(1).scaleb(exponent)
+    return price.quantize(quantizer)
+
+
+@dataclass
+class ColumnarBasket:
+    """ A basket stored as parallel columns, one row per basket entry.
+
+    Row `i` holds `quantities[i]` articles of product
+    `products[product_ids[i]]`, whose unit price is `prices_in_cents[i]`
+    cents (written with exponent `price_exponents[i]`) and whose origin is
+    `imported[i]`. Rows are in the order their entries were first added.
+
+    Entries are aggregated like in `BasketBuilder`, but are looked up in an
+    open-addressing `index` of row numbers instead of a dict, so that each
+    one takes a few dozen bytes instead of an Article, a BasketEntryKey,
+    their Decimal prices and a dict entry.
+
+    The basket service doesn't use it: baskets are handed over as lists of
+    articles, and building them back from the columns costs more time and
+    peak memory than `BasketBuilder` saves. It is meant for callers that
+    keep working on columns, e.g. with `batch.from_columnar_basket`.
+    """
+    product_ids: array = field(default_factory=lambda: array('I'))
+    name_ids: array = field(default_factory=lambda: array('I'))
+    prices_in_cents: array = field(default_factory=lambda: array('q'))
+    price_exponents: array = field(default_factory=lambda: array('b'))
+    imported: array = field(default_factory=lambda: array('b'))
+    quantities: array = field(default_factory=lambda: array('q'))
+    products: List[Product] = field(default_factory=list)
+    product_index: Dict[Tuple[str, Optional[str]], int] = field(
+        default_factory=dict
+    )
+    name_index: Dict[str, int] = field(default_factory=dict)
+    index: array = field(
+        default_factory=lambda: array('q', [EMPTY]) * (1 << MIN_INDEX_BITS)
+    )
+    index_bits: int = MIN_INDEX_BITS
+
+    def __len__(self):
+        return len(self.quantities)
+
+    def add_article(self, article: Article) -> 'ColumnarBasket':
+        """ Add :param article: to the basket.
+
+        If the entry is already in the basket, its quantity is increased by
+        :param article.quantity: and its product and unit price are replaced
+        by those of :param article:, like `BasketBuilder.add_article` does.
+        :param article.unit_price_before_taxes: can't have fractions of
+        cents nor exceed 64-bit integer cents, an error is raised otherwise.
+        """
+        product = article.product
+        cents, exponent = to_cents(article.unit_price_before_taxes)
+        product_id = self.product_index.get((product.name, product.category))
+        if product_id is None:
+            product_id = len(self.products)
+            self.product_index[(product.name, product.category)] = product_id
+            self.products.append(product)
+
+        name_id = self.name_index.get(product.name)
+        if name_id is None:
+            name_id = len(self.name_index)
+            if name_id >= MAX_NAMES:
+                raise OverflowError('too many product names')
+            self.name_index[product.name] = name_id
+
+        slot = self.find_slot(name_id, cents, article.imported)
+        row = self.index[slot]
+        if row == EMPTY:
+            self.index[slot] = len(self.quantities)
+            self.product_ids.append(product_id)
+            self.name_ids.append(name_id)
+            self.prices_in_cents.append(cents)
+            self.price_exponents.append(exponent)
+            self.imported.append(article.imported)
+            self.quantities.append(article.quantity)
+            if 2 * len(self.quantities) > len(self.index):
+                self.grow_index()
+        else:
+            self.product_ids[row] = product_id
+            self.price_exponents[row] = exponent
+            self.quantities[row] += article.quantity
+        return self
+
+    def get_quantity(self, key: BasketEntryKey) -> int:
+        name_id = self.name_index.get(key.product_name)
+        if name_id is None:
+            return 0
+        try:
+            cents, _ = to_cents(key.unit_price)
+        except ColumnarBasketError.UnsupportedPrice:
+            return 0
+        row = self.index[self.find_slot(name_id, cents, key.imported)]
+        if row == EMPTY:
+            return 0
+        return self.quantities[row]
+
+    def list_articles(self) -> List[Article]:
+        """ Return the articles in the basket, in insertion order. """
+        products = self.products
+        return [
+            Article(
+                product=products[product_id],
+                imported=bool(imported),
+                quantity=quantity,
+                unit_price_before_taxes=from_cents(cents, exponent),
+            )
+            for product_id, cents, exponent, imported, quantity in zip(
+                self.product_ids,
+                self.prices_in_cents,
+                self.price_exponents,
+                self.imported,
+                self.quantities,
+            )
+        ]
+
+    def find_slot(self, name_id: int, cents: int, imported: bool) -> int:
+        """ Return the slot of the index that holds the row of the entry, or
+        the empty slot where it would be added. """
+        index = self.index
+        mask = len(index) - 1
+        slot = self.hash_key(name_id, cents, imported, self.index_bits)
+        while True:
+            row = index[slot]
+            if row == EMPTY or (
+                self.prices_in_cents[row] == cents
+                and self.name_ids[row] == name_id
+                and self.imported[row] == imported
+            ):
+                return slot
+            slot = (slot + 1) & mask
+
+    def grow_index(self):
+        """ Double the size of the index and add every row to it again. """
+        self.index_bits += 1
+        index = self.index = array('q', [EMPTY]) * (1 << self.index_bits)
+        mask = len(index) - 1
+        for row, key in enumerate(zip(
+            self.name_ids,
+            self.prices_in_cents,
+            self.imported,
+        )):
+            slot = self.hash_key(*key, self.index_bits)
+            while index[slot] != EMPTY:
+                slot = (slot + 1) & mask
+            index[slot] = row
+
+    @staticmethod
+    def hash_key(name_id: int, cents: int, imported: bool, bits: int) -> int:
+        """ Return a :param bits: bits hash of an entry key. """
+        key = (cents << 33) | (name_id << 1) | imported
+        return ((key * FIBONACCI_MULTIPLIER) & HASH_MASK) >> (HASH_BITS - bits)
+
+
+def create(articles: Iterable[Article]) -> ColumnarBasket:
+    """ Create a columnar basket with :param articles:. """
+    basket = ColumnarBasket()
+    for article in articles:
+        basket.add_article(article)
+    return basket
@@ -1,12 +1,27 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from taxes.services.slotted import slotted
 
+
+@slotted
 @dataclass(frozen=True)
 class Product:
     name: str
     category: str
 
+    def __eq__(self, other):
+        # products are interned (see BasketBuilder), so most comparisons
+        # are between the same instance
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.name == other.name
+            and self.category == other.category
+        )
+
 
 class ProductError:
     class InvalidName(Exception):
@@ -1,7 +1,10 @@
 from dataclasses import dataclass
 from decimal import Decimal
 
+from taxes.services.slotted import slotted
 
+
+@slotted
 @dataclass(frozen=True)
 class PurchasedItem:
     product_name: str
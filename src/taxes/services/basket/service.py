@@ -1,7 +1,8 @@
 from dataclasses import dataclass
-from typing import Iterable, Protocol
+from typing import Iterable, Mapping, Protocol
 
 from taxes.services.basket.entities.article import Article
+from taxes.services.basket.entities.product import Product
 from taxes.services.basket.entities.purchased_item import PurchasedItem
 from taxes.services.basket.use_cases import CreateBasketUseCase
 
@@ -20,22 +21,36 @@ class BasketService:
             info=self.logger.info,
             debug=self.logger.debug,
             get_product_by_name=self.product_repository.get_by_name,
+            get_products_by_name=getattr(
+                self.product_repository,
+                'get_many_by_name',
+                None,
+            ),
         )
         return run(env)
 
 
 class Dependency:
     class Logger(Protocol):
-        def info(self, msg: str):  # pragma: no cover
+        def info(self, msg: str, *args):  # pragma: no cover
             ...
 
-        def debug(self, msg: str):  # pragma: no cover
+        def debug(self, msg: str, *args):  # pragma: no cover
+            """ :param msg: is %-formatted with :param args: only if the
+            message is going to be emitted. """
             ...
 
     class ProductRepository(Protocol):
         def get_by_name(name: str):  # pragma: no cover
             ...
 
+    class BulkProductRepository(ProductRepository, Protocol):
+        def get_many_by_name(
+            names: Iterable[str],
+        ) -> Mapping[str, Product]:  # pragma: no cover
+            """ Products indexed by name, looked up at once. """
+            ...
+
 
 def create(
     logger: Dependency.Logger,
@@ -1,14 +1,13 @@
 from dataclasses import dataclass
 from functools import reduce
-from typing import Callable, Iterable
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional
 
 from taxes.services.basket.entities.article import (
     Article, create as create_article,
 )
 from taxes.services.basket.entities.basket import (
-    add_article as add_article_to_basket,
-    Basket,
-    empty as create_empty_basket,
+    BasketBuilder,
     list_articles as list_articles_in_basket,
 )
 from taxes.services.basket.entities.product import Product
@@ -18,22 +17,43 @@ from taxes.services.basket.entities.purchased_item import PurchasedItem
 @dataclass
 class CreateBasketUseCase:
     purchased_items: Iterable[PurchasedItem]
+    lookup_batch_size: int = 1024
 
     @dataclass
     class Environment:
-        info: Callable[[str], None]
-        debug: Callable[[str], None]
+        info: Callable[..., None]
+        debug: Callable[..., None]
         get_product_by_name: Callable[[str], Product]
+        get_products_by_name: Optional[
+            Callable[[Iterable[str]], Mapping[str, Product]]
+        ] = None
 
     def __call__(self, env: Environment) -> Iterable[Article]:
         env.info('creating basket')
+        products: Dict[str, Product] = {}
 
-        def add_item(basket: Basket, item: PurchasedItem):
-            env.debug(f'creating article from {item}')
+        def get_product(name: str) -> Product:
+            product = products.get(name)
+            if product is None:
+                product = env.get_product_by_name(name=name)
+            return product
 
-            env.debug(f'getting product {item.product_name}')
-            product = env.get_product_by_name(name=item.product_name)
-            env.debug(f'product {product} retrieved')
+        def prefetch_products(items: List[PurchasedItem]):
+            names = [
+                name for name in dict.fromkeys(i.product_name for i in items)
+                if name not in products
+            ]
+            if names:
+                env.debug('getting %s products', len(names))
+                products.update(env.get_products_by_name(names=names))
+            return items
+
+        def add_item(basket: BasketBuilder, item: PurchasedItem):
+            env.debug('creating article from %s', item)
+
+            env.debug('getting product %s', item.product_name)
+            product = get_product(item.product_name)
+            env.debug('product %s retrieved', product)
 
             article = create_article(
                 quantity=item.quantity,
@@ -42,10 +62,29 @@ class CreateBasketUseCase:
                 unit_price_before_taxes=item.unit_price,
                 imported=item.imported,
             )
-            env.debug(f'added {article} to {basket}')
-            return add_article_to_basket(article, basket)
+            env.debug('adding %s to basket', article)
+            return basket.add_article(article)
 
-        basket = reduce(add_item, self.purchased_items, create_empty_basket())
+        purchased_items = self.purchased_items
+        if env.get_products_by_name is not None:
+            purchased_items = chain.from_iterable(
+                map(prefetch_products, self.chunks())
+            )
+
+        basket = reduce(
+            add_item,
+            purchased_items,
+            BasketBuilder(),
+        ).build()
         env.info('basket created')
 
         return list_articles_in_basket(basket)
+
+    def chunks(self) -> Iterator[List[PurchasedItem]]:
+        """ Split purchased items in lists of at most `lookup_batch_size`, so
+        that their products can be looked up with a single call. """
+        items = iter(self.purchased_items)
+        chunk = list(islice(items, self.lookup_batch_size))
+        while chunk:
+            yield chunk
+            chunk = list(islice(items, self.lookup_batch_size))
@@ -0,0 +1,171 @@
+""" A compact binary format of baskets, read without text parsing.
+
+A binary basket is the 8 bytes of `MAGIC` followed by one record per
+purchased item. Each record is a fixed-width little-endian head followed
+by the UTF-8 product name:
+
+    offset  size  field
+    0       4     quantity (unsigned)
+    4       8     unit price mantissa (signed)
+    12      1     unit price exponent (signed)
+    13      1     imported flag (0 or 1)
+    14      2     length of the product name in bytes (unsigned)
+    16      n     product name
+
+The unit price is `mantissa * 10 ** exponent`, e.g. `12.49` is stored as
+`(1249, -2)`, so that prices keep the representation they were written
+with, like they do in text baskets.
+"""
+import struct
+from decimal import Decimal
+from typing import BinaryIO, Dict, Iterable, Iterator, Tuple
+
+from taxes.services.basket.entities.purchased_item import PurchasedItem
+from taxes.services.parser import Buffer, ParserError, REASON_INVALID_ENCODING
+
+
+MAGIC = b'\x89BASKET\x01'
+RECORD_HEAD = struct.Struct('<IqbBH')
+
+REASON_TRUNCATED_RECORD = 'truncated record'
+REASON_INVALID_IMPORTED_FLAG = 'invalid imported flag'
+
+# records are encoded and written a chunk at a time
+WRITE_CHUNK_SIZE = 1 << 12
+# decoded items, names and prices are reused across records, up to this
+# many of each
+MAX_MEMO_SIZE = 1 << 16
+
+
+class BinaryBasketError:
+    class UnsupportedItem(Exception):
+        def __init__(self, reason, item):
+            super().__init__(f'{reason}: {item}')
+
+
+def is_binary_basket(buffer: Buffer) -> bool:
+    return buffer[:len(MAGIC)] == MAGIC
+
+
+def split_price(price: Decimal) -> Tuple[int, int]:
+    """ Return the mantissa and the exponent of :param price:. """
+    if not price.is_finite():
+        raise ValueError('price must be finite')
+    exponent = price.as_tuple().exponent
+    return int(price.scaleb(-exponent)), exponent
+
+
+def encode_item(item: PurchasedItem) -> bytes:
+    """ Return the record of :param item:.
+
+    An error is raised if a field doesn't fit in its record field.
+    """
+    name = item.product_name.encode('utf-8')
+    try:
+        mantissa, exponent = split_price(item.unit_price)
+        head = RECORD_HEAD.pack(
+            item.quantity,
+            mantissa,
+            exponent,
+            item.imported,
+            len(name),
+        )
+    except (ValueError, struct.error) as e:
+        raise BinaryBasketError.UnsupportedItem(e, item)
+    return head + name
+
+
+def write_items(items: Iterable[PurchasedItem], output: BinaryIO) -> int:
+    """ Write :param items: to :param output: as a binary basket and return
+    the number of items written. """
+    output.write(MAGIC)
+    written = 0
+    chunk = []
+    for item in items:
+        chunk.append(encode_item(item))
+        if len(chunk) == WRITE_CHUNK_SIZE:
+            output.write(b''.join(chunk))
+            written += len(chunk)
+            chunk.clear()
+    output.write(b''.join(chunk))
+    return written + len(chunk)
+
+
+def malformed_record(record_no: int, offset: int, reason: str):
+    return ParserError.MalformedInput(
+        f'record {record_no} (offset {offset}): {reason}'
+    )
+
+
+def iter_items(buffer: Buffer) -> Iterator[PurchasedItem]:
+    """ Lazily read each record of the binary basket in :param buffer: as a
+    purchased item.
+
+    :param buffer: must start with `MAGIC` (see `is_binary_basket`). The
+    first malformed record raises an error that tells where it is.
+    """
+    unpack_head = RECORD_HEAD.unpack_from
+    head_size = RECORD_HEAD.size
+    # items are immutable, so a record that repeats yields the same item
+    items: Dict[bytes, PurchasedItem] = {}
+    names: Dict[bytes, str] = {}
+    prices: Dict[Tuple[int, int], Decimal] = {}
+    size = len(buffer)
+    offset = len(MAGIC)
+    record_no = 0
+    while offset < size:
+        record_no += 1
+        if offset + head_size > size:
+            raise malformed_record(record_no, offset, REASON_TRUNCATED_RECORD)
+        quantity, mantissa, exponent, imported, name_size = unpack_head(
+            buffer, offset
+        )
+        name_start = offset + head_size
+        name_stop = name_start + name_size
+        if name_stop > size:
+            raise malformed_record(record_no, offset, REASON_TRUNCATED_RECORD)
+
+        record = buffer[offset:name_stop]
+        item = items.get(record)
+        if item is not None:
+            yield item
+            offset = name_stop
+            continue
+
+        if imported > 1:
+            raise malformed_record(
+                record_no, offset, REASON_INVALID_IMPORTED_FLAG
+            )
+
+        encoded_name = record[head_size:]
+        name = names.get(encoded_name)
+        if name is None:
+            try:
+                name = encoded_name.decode('utf-8')
+            except UnicodeDecodeError:
+                raise malformed_record(
+                    record_no, offset, REASON_INVALID_ENCODING
+                )
+            if len(names) == MAX_MEMO_SIZE:
+                names.clear()
+            names[encoded_name] = name
+
+        price_key = (mantissa, exponent)
+        price = prices.get(price_key)
+        if price is None:
+            price = Decimal(mantissa).scaleb(exponent)
+            if len(prices) == MAX_MEMO_SIZE:
+                prices.clear()
+            prices[price_key] = price
+
+        item = PurchasedItem(
+            product_name=name,
+            unit_price=price,
+            imported=imported == 1,
+            quantity=quantity,
+        )
+        if len(items) == MAX_MEMO_SIZE:
+            items.clear()
+        items[record] = item
+        yield item
+        offset = name_stop
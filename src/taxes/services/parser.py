@@ -1,5 +1,23 @@
+import codecs
+import io
+import mmap
+import os
 import re
+from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import (
+    AnyStr,
+    BinaryIO,
+    Callable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 from taxes.services.basket.entities.purchased_item import PurchasedItem
 
@@ -8,6 +26,10 @@ class ParserError:
     class MalformedInput(Exception):
         pass
 
+    class UnknownParser(Exception):
+        def __init__(self, value):
+            super().__init__(f'unknown parser: {value}')
+
 
 RE_SPACE = r'\s'
 RE_GROUP_QUANTITY = r'(?P<quantity>\d+)'
@@ -66,3 +88,364 @@ def parse_item(input: str) -> PurchasedItem:
         unit_price=Decimal(parsed['unit_price']),
         imported=parsed_description['imported'],
     )
+
+
+UNIT_PRICE_SEPARATOR = ' at '
+
+
+def scan_item(input: str) -> PurchasedItem:
+    """ Same as `parse_item`, but implemented as a single-pass scanner.
+
+    The scanner handles rows whose fields are separated by single spaces and
+    whose numbers are ASCII digits, which is what virtually every row looks
+    like. Any other row is handed to `parse_item`, so that results and errors
+    are always the same.
+    """
+    row = input[:-1] if input[-1:] == '\n' else input
+    head, separator, unit_price = row.rpartition(UNIT_PRICE_SEPARATOR)
+    quantity, _, description = head.partition(' ')
+    digits = unit_price.replace('.', '', 1)
+
+    if not (
+        description
+        and quantity.isdigit()
+        and digits.isdigit()
+        and unit_price[0] != '.'
+        and (quantity + digits).isascii()
+        and '\n' not in description
+    ):
+        return parse_item(input)
+
+    tokens = description.split()
+    imported = False
+    if IMPORTED_LABEL in description.lower():
+        for location, token in enumerate(tokens):
+            if token.lower() == IMPORTED_LABEL:
+                del tokens[location]
+                imported = True
+                break
+
+    return PurchasedItem(
+        quantity=int(quantity),
+        product_name=' '.join(tokens),
+        unit_price=Decimal(unit_price),
+        imported=imported,
+    )
+
+
+ParseItem = Callable[[str], PurchasedItem]
+
+PARSERS: Mapping[str, ParseItem] = {
+    'regex': parse_item,
+    'scanner': scan_item,
+}
+
+
+def get_parser(name: str) -> ParseItem:
+    """ Return the `parse_item` implementation registered as :param name:. """
+    try:
+        return PARSERS[name]
+    except KeyError:
+        raise ParserError.UnknownParser(name)
+
+
+class ParseError(NamedTuple):
+    line_no: int
+    offset: int
+    reason: str
+
+
+@dataclass(frozen=True)
+class ParseResult:
+    items: List[PurchasedItem] = field(default_factory=list)
+    errors: List[ParseError] = field(default_factory=list)
+
+
+REASON_MALFORMED_ROW = 'malformed row'
+REASON_INVALID_ENCODING = 'invalid encoding'
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+
+WINDOW_SIZE = 1 << 20
+
+
+def iter_windows(
+    buffer: Buffer,
+    size: int = WINDOW_SIZE,
+    release_pages: bool = False,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Iterator[Tuple[int, bytes]]:
+    """ Yield the offset and a copy of consecutive chunks of :param buffer:
+    about :param size: bytes long, each ending on a line boundary.
+
+    Only the bytes from :param start: to :param stop: are read: both should
+    be on line boundaries.
+
+    If :param release_pages: is set, the pages of a memory-mapped file are
+    released once copied, so that memory doesn't grow with the size of the
+    file. Only set it for mappings that are backed by a file and not
+    modified in memory.
+    """
+    release_pages = release_pages and hasattr(mmap, 'MADV_DONTNEED')
+    end = len(buffer) if stop is None else stop
+    released = start - start % mmap.PAGESIZE
+    while start < end:
+        stop = start + size
+        if stop < end:
+            newline = buffer.rfind(b'\n', start, stop)
+            if newline < 0:
+                newline = buffer.find(b'\n', stop, end)
+            stop = end if newline < 0 else newline + 1
+        else:
+            stop = end
+
+        window = buffer[start:stop]
+        if release_pages:
+            page_stop = stop - stop % mmap.PAGESIZE
+            if page_stop > released:
+                buffer.madvise(
+                    mmap.MADV_DONTNEED, released, page_stop - released
+                )
+                released = page_stop
+
+        yield start, window
+        start = stop
+
+
+def split_lines(window: AnyStr) -> List[AnyStr]:
+    """ Split :param window: on `\\n`, dropping a trailing `\\r` from each
+    line like files opened in text mode do. A final newline doesn't start a
+    new line. """
+    if isinstance(window, str):
+        newline, carriage_return = '\n', '\r'
+    else:
+        newline, carriage_return = b'\n', b'\r'
+    lines = window.split(newline)
+    if not lines[-1]:
+        lines.pop()
+    if carriage_return in window:
+        lines = [
+            line[:-1] if line[-1:] == carriage_return else line
+            for line in lines
+        ]
+    return lines
+
+
+def count_lines(
+    buffer: Buffer,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> int:
+    """ Count the lines of :param buffer: from :param start: to
+    :param stop: (see `split_lines`). """
+    lines = 0
+    for _, window in iter_windows(buffer, start=start, stop=stop):
+        lines += window.count(b'\n') + (window[-1:] != b'\n')
+    return lines
+
+
+def get_line_offsets(window: bytes) -> List[int]:
+    """ Return the offset of each line of :param window:. """
+    lines = window.split(b'\n')
+    if not lines[-1]:
+        lines.pop()
+
+    offsets = []
+    offset = 0
+    for line in lines:
+        offsets.append(offset)
+        offset += len(line) + 1
+    return offsets
+
+
+def iter_lines(
+    buffer: Buffer,
+    start: int = 0,
+    stop: Optional[int] = None,
+    first_line_no: int = 1,
+) -> Iterator[Tuple[int, int, bytes]]:
+    """ Yield the line number, the offset and the content of each line of
+    :param buffer: from :param start: to :param stop: (see `split_lines`).
+
+    :param first_line_no: is the number of the line at :param start:.
+    """
+    line_no = first_line_no - 1
+    for window_offset, window in iter_windows(buffer, start=start, stop=stop):
+        offsets = get_line_offsets(window)
+        for offset, line in zip(offsets, split_lines(window)):
+            line_no += 1
+            yield line_no, window_offset + offset, line
+
+
+# Encodings where ASCII characters are always encoded as the same single
+# byte and never appear inside the encoding of other characters: text in
+# these encodings can be split on newlines before decoding.
+ASCII_COMPATIBLE_ENCODINGS = {'ascii', 'utf-8', 'iso8859-1', 'cp1252'}
+
+
+def is_ascii_compatible(encoding: str) -> bool:
+    return codecs.lookup(encoding).name in ASCII_COMPATIBLE_ENCODINGS
+
+
+def decode_lines(window: bytes, encoding: str) -> List[Optional[str]]:
+    """ Decode the lines of :param window:, all at once when possible.
+
+    Lines that can't be decoded are returned as None.
+    """
+    try:
+        return split_lines(window.decode(encoding))
+    except UnicodeDecodeError:
+        pass
+
+    lines: List[Optional[str]] = []
+    for line in split_lines(window):
+        try:
+            lines.append(line.decode(encoding))
+        except UnicodeDecodeError:
+            lines.append(None)
+    return lines
+
+
+def iter_items(
+    buffer: Buffer,
+    encoding: str = 'utf-8',
+    parse: ParseItem = scan_item,
+    errors: Optional[List[ParseError]] = None,
+    release_pages: bool = False,
+    start: int = 0,
+    stop: Optional[int] = None,
+    first_line_no: int = 1,
+) -> Iterator[PurchasedItem]:
+    """ Lazily parse each line of :param buffer: as a purchased item.
+
+    The buffer is decoded one window of lines at a time (see
+    `iter_windows`). Malformed lines are appended to :param errors: if
+    given; otherwise the first malformed line raises an error that tells
+    where it is. See `iter_lines` for :param start:, :param stop: and
+    :param first_line_no:.
+    """
+    line_no = first_line_no - 1
+    for window_offset, window in iter_windows(
+        buffer, release_pages=release_pages, start=start, stop=stop
+    ):
+        offsets = None
+        lines = decode_lines(window, encoding)
+        for index, line in enumerate(lines):
+            if line is None:
+                reason = REASON_INVALID_ENCODING
+            else:
+                try:
+                    yield parse(line)
+                    continue
+                except ParserError.MalformedInput:
+                    reason = REASON_MALFORMED_ROW
+
+            if offsets is None:
+                offsets = get_line_offsets(window)
+            error = ParseError(
+                line_no + index + 1, window_offset + offsets[index], reason
+            )
+            if errors is None:
+                raise ParserError.MalformedInput(
+                    f'line {error.line_no} (offset {error.offset}): {reason}'
+                )
+            errors.append(error)
+        line_no += len(lines)
+
+
+def parse_buffer(
+    buffer: Buffer,
+    collect: bool = False,
+    encoding: str = 'utf-8',
+    parse: ParseItem = scan_item,
+    release_pages: bool = False,
+) -> ParseResult:
+    """ Parse each line of :param buffer: as a purchased item.
+
+    If :param collect: is set, malformed lines are reported in the result
+    errors and parsing goes on; otherwise the first malformed line raises an
+    error that tells where it is. See `iter_windows` for
+    :param release_pages:.
+    """
+    errors: List[ParseError] = []
+    items = iter_items(
+        buffer, encoding, parse, errors if collect else None, release_pages
+    )
+    return ParseResult(list(items), errors)
+
+
+def parse_items(
+    source: Union[Buffer, BinaryIO],
+    collect: bool = False,
+    encoding: str = 'utf-8',
+    parse: ParseItem = scan_item,
+    use_mmap: bool = True,
+) -> ParseResult:
+    """ Parse every purchased item in :param source:, either a bytes buffer
+    or a file opened in binary mode.
+
+    Files are memory-mapped when possible (see :param use_mmap:), read at
+    once otherwise. See `parse_buffer` for :param collect:.
+
+    Lines are split before decoding, so :param encoding: must be ASCII
+    compatible (see `is_ascii_compatible`).
+    """
+    if isinstance(source, (bytes, bytearray, mmap.mmap)):
+        return parse_buffer(source, collect, encoding, parse)
+
+    if use_mmap and is_mappable(source):
+        with map_file(source) as buffer:
+            return parse_buffer(
+                buffer, collect, encoding, parse, release_pages=True
+            )
+
+    return parse_buffer(source.read(), collect, encoding, parse)
+
+
+def is_mappable(f: BinaryIO) -> bool:
+    """ Empty files and streams (e.g. pipes) can't be memory-mapped. """
+    try:
+        return f.seekable() and os.fstat(f.fileno()).st_size > 0
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def map_file(f: BinaryIO) -> mmap.mmap:
+    """ Map :param f: in memory read-only, for a single sequential scan. """
+    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+        buffer.madvise(mmap.MADV_SEQUENTIAL)
+    return buffer
+
+
+class PrefixedReader(io.RawIOBase):
+    """ Read :param prefix: then the rest of :param stream:, to put back the
+    first bytes read from a stream that can't seek (e.g. a pipe). """
+
+    def __init__(self, prefix: bytes, stream: BinaryIO):
+        self.prefix = prefix
+        self.stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self.prefix:
+            size = min(len(buffer), len(self.prefix))
+            buffer[:size] = self.prefix[:size]
+            self.prefix = self.prefix[size:]
+            return size
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def open_text(f: BinaryIO, encoding: str, head: bytes = b'') -> TextIO:
+    """ Read :param f: in text mode, after the bytes :param head: that were
+    already read from it. """
+    return io.TextIOWrapper(
+        io.BufferedReader(PrefixedReader(head, f)),
+        encoding=encoding,
+    )
@@ -1,10 +1,10 @@
-from copy import deepcopy
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import List
 
 
 from taxes.services.receipt.entities.taxed_article import TaxedArticle
+from taxes.services.slotted import slotted
 
 
 @dataclass(frozen=True)
@@ -14,6 +14,13 @@ class Receipt:
     total_due: Decimal
 
 
+@dataclass(frozen=True)
+class ReceiptTotals:
+    taxes_due: Decimal
+    total_due: Decimal
+
+
+@slotted
 @dataclass(frozen=True)
 class ReceiptItem:
     description: str
@@ -31,23 +38,68 @@ def describe(article):
     return f'{imported}{article.product.name}'
 
 
-def add_to_receipt(taxed_article: TaxedArticle, receipt: Receipt) -> Receipt:
-    """ Add :param taxed_article: to :param receipt: """
+def create_item(taxed_article: TaxedArticle) -> ReceiptItem:
+    """ Create the receipt entry of :param taxed_article: """
     unit_price_with_taxes = taxed_article.unit_price_before_taxes + taxed_article.tax_amount_due_per_unit   # noqa: E501
-    quantity = taxed_article.quantity
-
-    subtotal_taxes_due = quantity * taxed_article.tax_amount_due_per_unit
-    subtotal_with_taxes = quantity * unit_price_with_taxes
-
-    return Receipt(
-        items=[
-            *deepcopy(receipt.items),
-            ReceiptItem(
-                description=describe(taxed_article),
-                quantity=quantity,
-                subtotal_price_with_taxes=subtotal_with_taxes,
-            )
-        ],
-        taxes_due=receipt.taxes_due + subtotal_taxes_due,
-        total_due=receipt.total_due + subtotal_with_taxes,
+    return ReceiptItem(
+        description=describe(taxed_article),
+        quantity=taxed_article.quantity,
+        subtotal_price_with_taxes=taxed_article.quantity * unit_price_with_taxes,  # noqa: E501
     )
+
+
+@dataclass
+class ReceiptBuilder:
+    """ A mutable accumulator of receipt items.
+
+    Items are appended in place and totals are kept up to date as articles
+    are added; `build` freezes the accumulated items into a Receipt.
+    """
+    items: List[ReceiptItem] = field(default_factory=list)
+    taxes_due: Decimal = Decimal('0')
+    total_due: Decimal = Decimal('0')
+
+    @classmethod
+    def from_receipt(cls, receipt: Receipt) -> 'ReceiptBuilder':
+        return cls(
+            items=list(receipt.items),
+            taxes_due=receipt.taxes_due,
+            total_due=receipt.total_due,
+        )
+
+    def add(self, taxed_article: TaxedArticle) -> ReceiptItem:
+        """ Add :param taxed_article: to the receipt and return its entry. """
+        item = self.account(taxed_article)
+        self.items.append(item)
+        return item
+
+    def account(self, taxed_article: TaxedArticle) -> ReceiptItem:
+        """ Add :param taxed_article: to the totals only and return its entry.
+
+        The entry is not kept by the builder, which is useful when items are
+        written out as soon as they are created.
+        """
+        item = create_item(taxed_article)
+        self.taxes_due += item.quantity * taxed_article.tax_amount_due_per_unit  # noqa: E501
+        self.total_due += item.subtotal_price_with_taxes
+        return item
+
+    def totals(self) -> ReceiptTotals:
+        return ReceiptTotals(
+            taxes_due=self.taxes_due,
+            total_due=self.total_due,
+        )
+
+    def build(self) -> Receipt:
+        return Receipt(
+            items=list(self.items),
+            taxes_due=self.taxes_due,
+            total_due=self.total_due,
+        )
+
+
+def add_to_receipt(taxed_article: TaxedArticle, receipt: Receipt) -> Receipt:
+    """ Add :param taxed_article: to :param receipt: """
+    builder = ReceiptBuilder.from_receipt(receipt)
+    builder.add(taxed_article)
+    return builder.build()
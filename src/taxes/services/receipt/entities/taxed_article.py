@@ -2,8 +2,10 @@ from dataclasses import dataclass
 from decimal import Decimal
 
 from taxes.services.basket.entities.product import Product
+from taxes.services.slotted import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class TaxedArticle:
     product: Product
@@ -1,9 +1,13 @@
 from dataclasses import dataclass
-from typing import Iterable, Protocol
+from typing import Callable, Iterable, Iterator, Protocol
 
 from taxes.services.basket.entities.article import Article
+from taxes.services.receipt.entities.receipt import ReceiptItem, ReceiptTotals
 from taxes.services.receipt.entities.taxed_article import TaxedArticle
-from taxes.services.receipt.use_cases import CreateReceiptUseCase
+from taxes.services.receipt.use_cases import (
+    CreateReceiptUseCase,
+    StreamReceiptUseCase,
+)
 
 
 @dataclass
@@ -20,13 +24,29 @@ class ReceiptService:
         )
         return run(env)
 
+    def stream_receipt(
+        self,
+        articles: Iterable[Article],
+        write_item: Callable[[ReceiptItem], None],
+    ) -> ReceiptTotals:
+        """ Pass each receipt item to :param write_item: as soon as it is
+        created and return the receipt totals. """
+        run = StreamReceiptUseCase(articles=articles)
+        env = StreamReceiptUseCase.Environment(
+            info=self.logger.info,
+            debug=self.logger.debug,
+            iter_taxes=self.tax_service.iter_taxes,
+            write_item=write_item,
+        )
+        return run(env)
+
 
 class Dependency:
     class Logger(Protocol):
-        def info(self, msg: str):  # pragma: no cover
+        def info(self, msg: str, *args):  # pragma: no cover
             ...
 
-        def debug(self, msg: str):  # pragma: no cover
+        def debug(self, msg: str, *args):  # pragma: no cover
             ...
 
     class TaxService(Protocol):
@@ -36,6 +56,12 @@ class Dependency:
         ) -> Iterable[TaxedArticle]:  # pragma: no cover
             ...
 
+        def iter_taxes(
+            self,
+            articles: Iterable[Article]
+        ) -> Iterator[TaxedArticle]:  # pragma: no cover
+            ...
+
 
 def create(logger: Dependency.Logger, tax_service: Dependency.TaxService):
     logger.debug('instantiating receipt service')
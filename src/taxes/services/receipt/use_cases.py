@@ -4,9 +4,10 @@ from typing import Callable, Iterable
 
 from taxes.services.basket.entities.article import Article
 from taxes.services.receipt.entities.receipt import (
-    add_to_receipt,
-    empty as create_empty_receipt,
     Receipt,
+    ReceiptBuilder,
+    ReceiptItem,
+    ReceiptTotals,
 )
 from taxes.services.receipt.entities.taxed_article import TaxedArticle
 
@@ -17,8 +18,8 @@ class CreateReceiptUseCase:
 
     @dataclass
     class Environment:
-        info: Callable[[str], None]
-        debug: Callable[[str], None]
+        info: Callable[..., None]
+        debug: Callable[..., None]
         add_taxes: Callable[[Iterable[Article]], Iterable[TaxedArticle]]
 
     def __call__(self, env: Environment) -> Receipt:
@@ -27,15 +28,39 @@ class CreateReceiptUseCase:
         env.info('taxes added')
 
         def add_article_to_receipt(receipt, taxed_article):
-            env.debug(f'adding {taxed_article} to {receipt}')
-            return add_to_receipt(taxed_article, receipt)
+            env.debug('adding %s to receipt', taxed_article)
+            receipt.add(taxed_article)
+            return receipt
 
         env.info('creating receipt')
         receipt = reduce(
             add_article_to_receipt,
             taxed_articles,
-            create_empty_receipt(),
-        )
+            ReceiptBuilder(),
+        ).build()
         env.info('receipt created')
 
         return receipt
+
+
+@dataclass
+class StreamReceiptUseCase:
+    articles: Iterable[Article]
+
+    @dataclass
+    class Environment:
+        info: Callable[..., None]
+        debug: Callable[..., None]
+        iter_taxes: Callable[[Iterable[Article]], Iterable[TaxedArticle]]
+        write_item: Callable[[ReceiptItem], None]
+
+    def __call__(self, env: Environment) -> ReceiptTotals:
+        env.info('streaming receipt')
+        receipt = ReceiptBuilder()
+        for taxed_article in env.iter_taxes(self.articles):
+            env.debug('adding %s to receipt', taxed_article)
+            item = receipt.account(taxed_article)
+            env.write_item(item)
+        env.info('receipt streamed')
+
+        return receipt.totals()
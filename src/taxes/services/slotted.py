@@ -0,0 +1,45 @@
+from dataclasses import fields
+from typing import Type, TypeVar
+
+T = TypeVar('T')
+
+
+def slotted(cls: Type[T]) -> Type[T]:
+    """ Return a copy of the frozen dataclass :param cls: that keeps its
+    fields in `__slots__` instead of a per-instance `__dict__`.
+
+    Instances are smaller, and the generated `__init__` sets the slots
+    directly instead of going through `object.__setattr__` like frozen
+    dataclasses do. Attributes, equality, hashing and repr are unchanged and
+    instances can still be pickled and copied. Fields can't have defaults.
+    """
+    names = tuple(f.name for f in fields(cls))
+    defaults = [name for name in names if name in cls.__dict__]
+    if defaults:
+        raise TypeError(f'slotted fields can\'t have defaults: {defaults}')
+
+    namespace = {
+        key: value for key, value in cls.__dict__.items()
+        if key not in ('__dict__', '__weakref__')
+    }
+    namespace['__slots__'] = names
+    namespace['__qualname__'] = cls.__qualname__
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+
+    setters = {
+        f'set_{name}': getattr(slotted_cls, name).__set__ for name in names
+    }
+    source = ''.join([
+        f'def __init__(self, {", ".join(names)}):\n',
+        *[f'    set_{name}(self, {name})\n' for name in names],
+    ])
+    exec(source, setters)
+    __init__ = setters['__init__']
+    __init__.__qualname__ = f'{cls.__qualname__}.__init__'
+    slotted_cls.__init__ = __init__
+
+    def __reduce__(self):
+        return slotted_cls, tuple(getattr(self, name) for name in names)
+
+    slotted_cls.__reduce__ = __reduce__
+    return slotted_cls
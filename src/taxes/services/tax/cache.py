@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Callable, Hashable, NamedTuple
+
+from taxes.services.basket.entities.article import Article
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class TaxAmountCacheError:
+    class NonPositiveSize(Exception):
+        def __init__(self, value):
+            super().__init__(f'cache size must be positive: {value}')
+
+
+def create_key(article: Article) -> Hashable:
+    """ Return the values the tax amount due for :param article: depends on.
+
+    Amounts are always quantized to the same exponent, so prices that are
+    numerically equal (e.g. `1` and `1.0`) can share the same entry.
+    """
+    return (
+        article.unit_price_before_taxes,
+        article.product.category,
+        article.imported,
+    )
+
+
+@dataclass
+class TaxAmountCache:
+    """ A bounded LRU cache of tax amounts due per unit of an article. """
+    maxsize: int
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: 'OrderedDict[Hashable, Decimal]' = field(
+        default_factory=OrderedDict,
+    )
+
+    def __call__(
+        self,
+        article: Article,
+        calculate: Callable[[Article], Decimal],
+    ) -> Decimal:
+        """ Return the tax amount due per unit of :param article:.
+
+        :param calculate: is called only if the amount is not cached yet; the
+        least recently used entry is evicted when the cache is full.
+        """
+        key = create_key(article)
+        try:
+            amount = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            amount = self.entries[key] = calculate(article)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            return amount
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return amount
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            maxsize=self.maxsize,
+            currsize=len(self.entries),
+        )
+
+    def clear(self):
+        self.entries.clear()
+
+
+def create(maxsize: int) -> TaxAmountCache:
+    """ Create an empty cache holding at most :param maxsize: amounts.
+
+    :param maxsize: must be greater than zero, an error is raised otherwise.
+    """
+    if maxsize <= 0:
+        raise TaxAmountCacheError.NonPositiveSize(maxsize)
+
+    return TaxAmountCache(maxsize=maxsize)
+
+
+def no_cache(
+    article: Article,
+    calculate: Callable[[Article], Decimal],
+) -> Decimal:
+    """ Calculate the tax amount of :param article: without caching it. """
+    return calculate(article)
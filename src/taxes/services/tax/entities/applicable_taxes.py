@@ -1,7 +1,8 @@
+from dataclasses import dataclass
 from decimal import Decimal
-from typing import Set
+from typing import FrozenSet, Iterable, Optional, Tuple
 
-from taxes.services.tax.entities.tax import Tax
+from taxes.services.tax.entities.tax import ROUNDING_INCREMENT, Tax
 
 
 EXEMPT_CATEGORIES = [
@@ -13,21 +14,67 @@ EXEMPT_CATEGORIES = [
 TAX_IMPORT = Tax(id='import', rate=Decimal('0.05'))
 TAX_PRODUCT_CATEGORY = Tax(id='non-exempt-category', rate=Decimal('0.1'))
 
+Taxes = Tuple[Tax, ...]
 
-def get_applicable_taxes(article) -> Set[Tax]:
-    return {
-        *get_import_taxes(article),
-        *get_product_category_taxes(article),
-    }
 
+@dataclass(frozen=True)
+class TaxTable:
+    """ The taxes due for each class of product, compiled from the tax rules.
 
-def get_import_taxes(article) -> Set[Tax]:
-    if article.imported:
-        return {TAX_IMPORT}
-    return set()
+    `schedules[2 * exempt + imported]` holds the taxes due for a product
+    whose category is (not) exempt and whose origin is (not) imported, in
+    the order they are applied. The amount due to each tax is rounded up to
+    `rounding_increment`.
+    """
+    exempt_categories: FrozenSet[Optional[str]]
+    schedules: Tuple[Taxes, Taxes, Taxes, Taxes]
+    rounding_increment: Decimal = ROUNDING_INCREMENT
 
+    def get_schedule_index(self, category: Optional[str], imported: bool):
+        """ Return the index in `schedules` of the taxes due for a product
+        of :param category: and origin :param imported:. """
+        return 2 * (category in self.exempt_categories) + imported
 
-def get_product_category_taxes(article) -> Set[Tax]:
-    if article.product.category not in EXEMPT_CATEGORIES:
-        return {TAX_PRODUCT_CATEGORY}
-    return set()
+    def get_taxes(self, category: Optional[str], imported: bool) -> Taxes:
+        return self.schedules[self.get_schedule_index(category, imported)]
+
+
+def compile_tax_table(
+    exempt_categories: Iterable[str],
+    category_tax: Tax,
+    import_tax: Tax,
+    rounding_increment: Decimal = ROUNDING_INCREMENT,
+) -> TaxTable:
+    """ Return the table of the taxes due when products of
+    :param exempt_categories: don't pay :param category_tax: and imported
+    products pay :param import_tax:, each rounded up to
+    :param rounding_increment:. """
+    schedules = tuple(
+        (
+            *(() if exempt else (category_tax,)),
+            *((import_tax,) if imported else ()),
+        )
+        for exempt in (False, True)
+        for imported in (False, True)
+    )
+    return TaxTable(
+        exempt_categories=frozenset(exempt_categories),
+        schedules=schedules,
+        rounding_increment=rounding_increment,
+    )
+
+
+TAX_TABLE = compile_tax_table(
+    exempt_categories=EXEMPT_CATEGORIES,
+    category_tax=TAX_PRODUCT_CATEGORY,
+    import_tax=TAX_IMPORT,
+)
+
+
+def get_applicable_taxes(article) -> Taxes:
+    return TAX_TABLE.get_taxes(article.product.category, article.imported)
+
+
+def get_taxes(category: Optional[str], imported: bool) -> Taxes:
+    """ Return the taxes due for a product of :param category:. """
+    return TAX_TABLE.get_taxes(category, imported)
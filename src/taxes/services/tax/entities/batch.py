@@ -0,0 +1,149 @@
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from taxes.services.basket.entities.article import Article
+from taxes.services.basket.entities.columnar_basket import (
+    ColumnarBasket,
+    MAX_PRICE_IN_CENTS,
+    MIN_PRICE_IN_CENTS,
+)
+from taxes.services.tax.entities.applicable_taxes import TAX_TABLE, TaxTable
+from taxes.services.tax.entities.tax import (
+    BASIS_POINTS_PER_UNIT,
+    rounding_increment_in_cents,
+    rate_in_basis_points,
+    to_cents,
+)
+
+
+@dataclass(frozen=True)
+class ArticleBatch:
+    """ Columnar representation of the articles to tax.
+
+    Row `i` describes an article whose unit price is `prices_in_cents[i]`,
+    whose product category is `categories[category_codes[i]]` and whose
+    origin is `imported[i]`.
+    """
+    prices_in_cents: Sequence[int]
+    category_codes: Sequence[int]
+    imported: Sequence[bool]
+    categories: Sequence[Optional[str]]
+
+    def __len__(self):
+        return len(self.prices_in_cents)
+
+
+def create(articles: Iterable[Article]) -> Optional[ArticleBatch]:
+    """ Return the columnar representation of :param articles:.
+
+    Return None if the price of any article has fractions of cents, or
+    doesn't fit in `MIN_PRICE_IN_CENTS`..`MAX_PRICE_IN_CENTS`.
+    """
+    prices_in_cents = array('q')
+    category_codes = array('I')
+    imported = array('b')
+    codes: Dict[Optional[str], int] = {}
+
+    for article in articles:
+        price_in_cents = to_cents(article.unit_price_before_taxes)
+        if price_in_cents is None:
+            return None
+        if not MIN_PRICE_IN_CENTS <= price_in_cents <= MAX_PRICE_IN_CENTS:
+            return None
+        category = article.product.category
+        code = codes.get(category)
+        if code is None:
+            code = codes[category] = len(codes)
+        prices_in_cents.append(price_in_cents)
+        category_codes.append(code)
+        imported.append(article.imported)
+
+    return ArticleBatch(
+        prices_in_cents=prices_in_cents,
+        category_codes=category_codes,
+        imported=imported,
+        categories=list(codes),
+    )
+
+
+def from_columnar_basket(basket: ColumnarBasket) -> ArticleBatch:
+    """ Return the batch of the articles in :param basket:, sharing its
+    price and origin columns. """
+    codes: Dict[Optional[str], int] = {}
+    product_codes = [
+        codes.setdefault(product.category, len(codes))
+        for product in basket.products
+    ]
+    return ArticleBatch(
+        prices_in_cents=basket.prices_in_cents,
+        category_codes=array(
+            'I', [product_codes[i] for i in basket.product_ids]
+        ),
+        imported=basket.imported,
+        categories=list(codes),
+    )
+
+
+Schedule = Tuple[int, ...]
+
+
+def get_schedule(
+    category: Optional[str],
+    imported: bool,
+    table: TaxTable = TAX_TABLE,
+) -> Optional[Schedule]:
+    """ Return the rates, in basis points, due for a product of
+    :param category: and origin :param imported: according to
+    :param table:.
+
+    Return None if any rate has fractions of basis points.
+    """
+    rates = tuple(
+        rate_in_basis_points(tax)
+        for tax in table.get_taxes(category=category, imported=imported)
+    )
+    if None in rates:
+        return None
+    return rates
+
+
+def calculate_tax_amounts_in_cents(
+    batch: ArticleBatch,
+    table: TaxTable = TAX_TABLE,
+) -> Optional[List[int]]:
+    """ Return the tax amount due per unit, in cents, of each row of
+    :param batch:, according to :param table:.
+
+    Rows are grouped by tax schedule, so that each rate of a schedule is
+    applied to the whole group in a single pass (the same integer arithmetic
+    as `calculate_tax_amount_in_cents`). Return None if any schedule can't be
+    expressed in basis points, or the rounding increment in cents.
+    """
+    increment_cents = rounding_increment_in_cents(table.rounding_increment)
+    if increment_cents is None:
+        return None
+
+    rows_by_schedule: Dict[Tuple[int, bool], List[int]] = {}
+    for row, key in enumerate(zip(batch.category_codes, batch.imported)):
+        rows_by_schedule.setdefault(key, []).append(row)
+
+    increment = increment_cents * BASIS_POINTS_PER_UNIT
+    prices = batch.prices_in_cents
+    amounts = [0] * len(batch)
+    for (code, imported), rows in rows_by_schedule.items():
+        schedule = get_schedule(batch.categories[code], bool(imported), table)
+        if schedule is None:
+            return None
+
+        group_prices = [prices[row] for row in rows]
+        group_amounts = [0] * len(rows)
+        for rate in schedule:
+            group_amounts = [
+                amount - (-price * rate // increment) * increment_cents
+                for amount, price in zip(group_amounts, group_prices)
+            ]
+        for row, amount in zip(rows, group_amounts):
+            amounts[row] = amount
+
+    return amounts
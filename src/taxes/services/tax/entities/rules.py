@@ -0,0 +1,107 @@
+import json
+from decimal import Decimal, InvalidOperation
+from typing import Any, Mapping, TextIO
+
+from taxes.services.tax.entities.applicable_taxes import (
+    compile_tax_table,
+    TAX_IMPORT,
+    TAX_PRODUCT_CATEGORY,
+    TaxTable,
+)
+from taxes.services.tax.entities.tax import create as create_tax, TaxError
+
+
+SUPPORTED_VERSIONS = (1,)
+
+
+class TaxRulesError:
+    class UnsupportedVersion(Exception):
+        def __init__(self, value):
+            super().__init__(f'unsupported tax rules version: {value}')
+
+    class InvalidRules(Exception):
+        def __init__(self, reason):
+            super().__init__(f'invalid tax rules: {reason}')
+
+
+def to_decimal(name: str, value: Any) -> Decimal:
+    if isinstance(value, bool) or not isinstance(value, (str, int, Decimal)):
+        raise TaxRulesError.InvalidRules(f'{name} must be a decimal number')
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise TaxRulesError.InvalidRules(f'{name} must be a decimal number')
+    if not number.is_finite():
+        raise TaxRulesError.InvalidRules(f'{name} must be finite')
+    return number
+
+
+def compile_rules(rules: Mapping[str, Any]) -> TaxTable:
+    """ Validate a rule set and compile it into a tax table.
+
+    :param rules: is a mapping like:
+
+        {
+            "version": 1,
+            "rounding_increment": "0.05",
+            "exempt_categories": ["book", "food", "medical"],
+            "rates": {"non-exempt-category": "0.10", "import": "0.05"}
+        }
+
+    Rates are validated by `tax.create`; an error is raised if any field is
+    missing or invalid.
+    """
+    if not isinstance(rules, Mapping):
+        raise TaxRulesError.InvalidRules('rules must be an object')
+    version = rules.get('version')
+    if isinstance(version, bool) or version not in SUPPORTED_VERSIONS:
+        raise TaxRulesError.UnsupportedVersion(version)
+
+    increment = to_decimal(
+        'rounding_increment',
+        rules.get('rounding_increment'),
+    )
+    if increment <= 0:
+        raise TaxRulesError.InvalidRules(
+            f'rounding_increment must be positive: {increment}'
+        )
+
+    exempt_categories = rules.get('exempt_categories')
+    if not isinstance(exempt_categories, list) or not all(
+        isinstance(category, str) for category in exempt_categories
+    ):
+        raise TaxRulesError.InvalidRules(
+            'exempt_categories must be a list of strings'
+        )
+
+    rates = rules.get('rates')
+    if not isinstance(rates, Mapping):
+        raise TaxRulesError.InvalidRules('rates must be an object')
+    expected_ids = {TAX_PRODUCT_CATEGORY.id, TAX_IMPORT.id}
+    if set(rates) != expected_ids:
+        raise TaxRulesError.InvalidRules(
+            f'rates must be given for {sorted(expected_ids)}'
+        )
+    try:
+        taxes = {
+            id: create_tax(id=id, rate=to_decimal(f'rates.{id}', rate))
+            for id, rate in rates.items()
+        }
+    except TaxError.NonPositiveRate as e:
+        raise TaxRulesError.InvalidRules(e)
+
+    return compile_tax_table(
+        exempt_categories=exempt_categories,
+        category_tax=taxes[TAX_PRODUCT_CATEGORY.id],
+        import_tax=taxes[TAX_IMPORT.id],
+        rounding_increment=increment,
+    )
+
+
+def load(f: TextIO) -> TaxTable:
+    """ Compile the JSON rule set in :param f: (see `compile_rules`). """
+    try:
+        rules = json.load(f, parse_float=Decimal)
+    except ValueError as e:
+        raise TaxRulesError.InvalidRules(e)
+    return compile_rules(rules)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from decimal import Decimal, ROUND_UP
-from functools import reduce
-from typing import Iterable
+from functools import lru_cache, reduce
+from typing import Callable, Iterable, Mapping, Optional
 
 
 @dataclass(frozen=True)
@@ -15,6 +15,10 @@ class TaxError:
         def __init__(self, value):
             super().__init__(f'rate must be positive: {value}')
 
+    class UnknownBackend(Exception):
+        def __init__(self, value):
+            super().__init__(f'unknown tax backend: {value}')
+
 
 def create(id: str, rate: Decimal):
     """ Return a Tax object.
@@ -27,24 +31,159 @@ def create(id: str, rate: Decimal):
     return Tax(id=id, rate=rate)
 
 
-def round_tax_amount(amount: Decimal) -> Decimal:
-    """ Round tax amount up to the nearest `0.05`. """
-    precision = Decimal('0.05')
-    return (amount / precision).quantize(0, ROUND_UP) * precision
+ROUNDING_INCREMENT = Decimal('0.05')
+
+
+def round_tax_amount(
+    amount: Decimal,
+    increment: Decimal = ROUNDING_INCREMENT,
+) -> Decimal:
+    """ Round tax amount up to the nearest :param increment:. """
+    return (amount / increment).quantize(0, ROUND_UP) * increment
 
 
-def calculate_tax_amount(price: Decimal, tax: Tax) -> Decimal:
+def calculate_tax_amount(
+    price: Decimal,
+    tax: Tax,
+    increment: Decimal = ROUNDING_INCREMENT,
+) -> Decimal:
     """ Calculate the amount due to :param tax: for a price :param price:.
 
     The amount is calculated by multiplying :param price: and the rate of
-    :param tax: and then by rouding the result to the nearest '0.05'.
+    :param tax: and then by rouding the result to the nearest
+    :param increment: (`0.05` by default).
     """
-    return round_tax_amount(price * tax.rate)
+    return round_tax_amount(price * tax.rate, increment)
 
 
-def apply(price: Decimal, taxes: Iterable[Tax]) -> Decimal:
-    """ Apply :param taxes: to :param price: and return the amount due. """
+def apply(
+    price: Decimal,
+    taxes: Iterable[Tax],
+    increment: Decimal = ROUNDING_INCREMENT,
+) -> Decimal:
+    """ Apply :param taxes: to :param price: and return the amount due,
+    rounding the amount of each tax up to :param increment:. """
     def add_to_subtotal(subtotal: Decimal, tax: Tax) -> Decimal:
-        return subtotal + calculate_tax_amount(price, tax)
+        return subtotal + calculate_tax_amount(price, tax, increment)
 
     return reduce(add_to_subtotal, taxes, Decimal('0.00'))
+
+
+CENTS_PER_UNIT = 100
+BASIS_POINTS_PER_UNIT = 10000
+ROUNDING_INCREMENT_IN_CENTS = 5
+
+
+def to_minor_units(amount: Decimal, per_unit: int) -> Optional[int]:
+    """ Convert :param amount: to an integer number of `1 / per_unit`.
+
+    Return None if :param amount: can't be represented exactly.
+    """
+    minor_units = amount * per_unit
+    integral_minor_units = int(minor_units)
+    if integral_minor_units != minor_units:
+        return None
+    return integral_minor_units
+
+
+def to_cents(amount: Decimal) -> Optional[int]:
+    """ Convert :param amount: to integer cents, if it is exact. """
+    return to_minor_units(amount, CENTS_PER_UNIT)
+
+
+def to_basis_points(rate: Decimal) -> Optional[int]:
+    """ Convert :param rate: to integer basis points, if it is exact. """
+    return to_minor_units(rate, BASIS_POINTS_PER_UNIT)
+
+
+@lru_cache(maxsize=None)
+def rate_in_basis_points(tax: Tax) -> Optional[int]:
+    """ Same as `to_basis_points`, but memoized per :param tax:. """
+    return to_basis_points(tax.rate)
+
+
+def from_cents(cents: int) -> Decimal:
+    """ Convert integer :param cents: to an amount with two decimal digits. """
+    return Decimal(cents).scaleb(-2)
+
+
+@lru_cache(maxsize=None)
+def rounding_increment_in_cents(increment: Decimal) -> Optional[int]:
+    """ Same as `to_cents`, but memoized per rounding :param increment:. """
+    return to_cents(increment)
+
+
+def calculate_tax_amount_in_cents(
+    price_in_cents: int,
+    rate_in_basis_points: int,
+    increment_in_cents: int = ROUNDING_INCREMENT_IN_CENTS,
+) -> int:
+    """ Fixed-point version of `calculate_tax_amount`.
+
+    The amount is rounded up to the nearest :param increment_in_cents: using
+    integer operations only: `price * rate` is expressed in
+    `1 / (CENTS * BASIS_POINTS)` units and divided, rounding up, by the
+    rounding increment.
+    """
+    increment = increment_in_cents * BASIS_POINTS_PER_UNIT
+    amount = price_in_cents * rate_in_basis_points
+    return -(-amount // increment) * increment_in_cents
+
+
+def apply_in_cents(
+    price_in_cents: int,
+    rates_in_basis_points: Iterable[int],
+    increment_in_cents: int = ROUNDING_INCREMENT_IN_CENTS,
+) -> int:
+    """ Fixed-point version of `apply`, returning the amount due in cents. """
+    amount_in_cents = 0
+    for rate in rates_in_basis_points:
+        amount_in_cents += calculate_tax_amount_in_cents(
+            price_in_cents, rate, increment_in_cents
+        )
+    return amount_in_cents
+
+
+def apply_fixed_point(
+    price: Decimal,
+    taxes: Iterable[Tax],
+    increment: Decimal = ROUNDING_INCREMENT,
+) -> Decimal:
+    """ Same as `apply`, but computed on integer cents and basis points.
+
+    Prices and rounding increments with fractions of cents, and rates with
+    fractions of basis points, can't be represented exactly, so they are
+    handled by `apply`.
+    """
+    taxes = tuple(taxes)
+    price_in_cents = to_cents(price)
+    increment_cents = rounding_increment_in_cents(increment)
+    if price_in_cents is None or increment_cents is None:
+        return apply(price, taxes, increment)
+
+    amount_in_cents = 0
+    for tax in taxes:
+        rate = rate_in_basis_points(tax)
+        if rate is None:
+            return apply(price, taxes, increment)
+        amount_in_cents += calculate_tax_amount_in_cents(
+            price_in_cents, rate, increment_cents
+        )
+
+    return from_cents(amount_in_cents)
+
+
+ApplyTaxes = Callable[[Decimal, Iterable[Tax], Decimal], Decimal]
+
+BACKENDS: Mapping[str, ApplyTaxes] = {
+    'decimal': apply,
+    'fixed-point': apply_fixed_point,
+}
+
+
+def get_backend(name: str) -> ApplyTaxes:
+    """ Return the `apply` implementation registered as :param name:. """
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise TaxError.UnknownBackend(name)
@@ -0,0 +1,218 @@
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Callable, Dict, Optional
+
+from taxes.services.basket.entities.article import Article
+from taxes.services.tax.cache import no_cache
+from taxes.services.tax.entities.applicable_taxes import TaxTable
+from taxes.services.tax.entities.tax import (
+    BASIS_POINTS_PER_UNIT,
+    CENTS_PER_UNIT,
+    from_cents,
+    rate_in_basis_points,
+    rounding_increment_in_cents,
+    to_cents,
+)
+
+
+class TaxLookupError:
+    class NonPositiveCeiling(Exception):
+        def __init__(self, value):
+            super().__init__(f'lookup ceiling must be positive: {value}')
+
+
+CachedTaxAmount = Callable[[Article, Callable[[Article], Decimal]], Decimal]
+
+# greater ceilings are lowered to it: the amounts take 4 bytes per cent of
+# ceiling and schedule (16 MB with the kata schedules)
+MAX_CEILING = Decimal('10000')
+# amounts are stored as unsigned 32-bit integers (`array('I')`)
+MAX_AMOUNT_IN_CENTS = (1 << 32) - 1
+
+# layout of the cache files: a header followed by the native `amounts`
+CACHE_FILE_MAGIC = b'TAXLUT1\0'
+CACHE_FILE_HEADER = struct.Struct('<8s32sQ')
+
+
+def get_fingerprint(table: TaxTable, ceiling_in_cents: int) -> bytes:
+    """ Return a digest of what the amounts of a lookup depend on: the rates
+    of each schedule, the rounding increment and the ceiling. """
+    key = repr((
+        [[str(tax.rate) for tax in schedule] for schedule in table.schedules],
+        str(table.rounding_increment),
+        ceiling_in_cents,
+        sys.byteorder,
+    ))
+    return hashlib.sha256(key.encode('utf-8')).digest()
+
+
+def build_amounts(table: TaxTable, ceiling_in_cents: int) -> Optional[array]:
+    """ Return the tax amount due, in cents, for every price from 0 to
+    :param ceiling_in_cents: cents and each schedule of :param table:.
+
+    The amount of price `p` and schedule `s` is at
+    `s * (ceiling_in_cents + 1) + p`. Return None if the amounts can't be
+    calculated with integer arithmetic (see `apply_fixed_point`), or exceed
+    `MAX_AMOUNT_IN_CENTS`.
+    """
+    increment_cents = rounding_increment_in_cents(table.rounding_increment)
+    if increment_cents is None:
+        return None
+
+    increment = increment_cents * BASIS_POINTS_PER_UNIT
+    prices = range(ceiling_in_cents + 1)
+    amounts = array('I')
+    for schedule in table.schedules:
+        schedule_amounts = [0] * len(prices)
+        for tax in schedule:
+            rate = rate_in_basis_points(tax)
+            if rate is None:
+                return None
+            schedule_amounts = [
+                amount - (-price * rate // increment) * increment_cents
+                for amount, price in zip(schedule_amounts, prices)
+            ]
+        if max(schedule_amounts) > MAX_AMOUNT_IN_CENTS:
+            return None
+        amounts.extend(schedule_amounts)
+    return amounts
+
+
+def read_amounts(path: str, fingerprint: bytes) -> Optional[array]:
+    """ Return the amounts cached in :param path:, or None if the file can't
+    be read or doesn't hold amounts with :param fingerprint:. """
+    try:
+        with open(path, mode='rb') as f:
+            header = f.read(CACHE_FILE_HEADER.size)
+            data = f.read()
+    except OSError:
+        return None
+    if len(header) != CACHE_FILE_HEADER.size:
+        return None
+    magic, cached_fingerprint, count = CACHE_FILE_HEADER.unpack(header)
+    amounts = array('I')
+    if (
+        magic != CACHE_FILE_MAGIC
+        or cached_fingerprint != fingerprint
+        or len(data) != count * amounts.itemsize
+    ):
+        return None
+    amounts.frombytes(data)
+    return amounts
+
+
+def write_amounts(path: str, fingerprint: bytes, amounts: array):
+    """ Cache :param amounts: in :param path:, replacing it atomically. """
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temporary_path, mode='wb') as f:
+            f.write(CACHE_FILE_HEADER.pack(
+                CACHE_FILE_MAGIC,
+                fingerprint,
+                len(amounts),
+            ))
+            amounts.tofile(f)
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+@dataclass
+class TaxLookup:
+    """ Precomputed tax amounts due per unit of the articles whose price is
+    a whole number of cents up to `ceiling_in_cents`.
+
+    The amounts are built on first use, or read from `cache_path` if it
+    holds amounts for the same schedules, rounding increment and ceiling.
+    Other articles are handled by `fallback`, as are all articles if the
+    schedules of `tax_table` can't be applied in integer cents.
+    """
+    tax_table: TaxTable
+    ceiling_in_cents: int
+    cache_path: Optional[str] = None
+    fallback: CachedTaxAmount = no_cache
+    amounts: Optional[array] = None
+    # greatest price in the lookup, -1 when it is empty
+    limit: int = -1
+    decimals: Dict[int, Decimal] = field(default_factory=dict)
+
+    @property
+    def ceiling(self) -> Decimal:
+        return from_cents(self.ceiling_in_cents)
+
+    def __call__(
+        self,
+        article: Article,
+        calculate: Callable[[Article], Decimal],
+    ) -> Decimal:
+        """ Return the tax amount due per unit of :param article:. """
+        amounts = self.amounts
+        if amounts is None:
+            amounts = self.load()
+
+        price = to_cents(article.unit_price_before_taxes)
+        if price is None or not 0 <= price <= self.limit:
+            return self.fallback(article, calculate)
+
+        schedule = self.tax_table.get_schedule_index(
+            article.product.category,
+            article.imported,
+        )
+        amount = amounts[schedule * (self.limit + 1) + price]
+        decimal_amount = self.decimals.get(amount)
+        if decimal_amount is None:
+            decimal_amount = self.decimals[amount] = from_cents(amount)
+        return decimal_amount
+
+    def load(self) -> array:
+        """ Build the amounts, or read them from the cache file. """
+        fingerprint = get_fingerprint(self.tax_table, self.ceiling_in_cents)
+        amounts = None
+        if self.cache_path is not None:
+            amounts = read_amounts(self.cache_path, fingerprint)
+        if amounts is None:
+            amounts = build_amounts(self.tax_table, self.ceiling_in_cents)
+            if amounts is not None and self.cache_path is not None:
+                try:
+                    write_amounts(self.cache_path, fingerprint, amounts)
+                except OSError:
+                    # the file only saves building the amounts next time
+                    pass
+
+        if amounts is None:
+            amounts = array('I')
+        else:
+            self.limit = self.ceiling_in_cents
+        self.amounts = amounts
+        return amounts
+
+
+def create(
+    tax_table: TaxTable,
+    ceiling: Decimal,
+    cache_path: Optional[str] = None,
+    fallback: CachedTaxAmount = no_cache,
+) -> TaxLookup:
+    """ Create a lookup of the taxes of :param tax_table: for the prices up
+    to :param ceiling:.
+
+    :param ceiling: must be greater than zero, an error is raised otherwise.
+    It is lowered to `MAX_CEILING` if greater, and the taxes of the prices
+    above are calculated by :param fallback:.
+    """
+    if ceiling <= 0:
+        raise TaxLookupError.NonPositiveCeiling(ceiling)
+    ceiling = min(ceiling, MAX_CEILING)
+
+    return TaxLookup(
+        tax_table=tax_table,
+        ceiling_in_cents=int(ceiling * CENTS_PER_UNIT),
+        cache_path=cache_path,
+        fallback=fallback,
+    )
@@ -1,33 +1,192 @@
 from dataclasses import dataclass
-from typing import Iterable, Protocol
+from decimal import Decimal
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Sized,
+)
 
 from taxes.services.basket.entities.article import Article
 from taxes.services.receipt.entities.taxed_article import TaxedArticle
-from taxes.services.tax.use_cases import TaxArticlesUseCase
+from taxes.services.tax.cache import (
+    create as create_cache,
+    no_cache,
+    TaxAmountCache,
+)
+from taxes.services.tax.entities.applicable_taxes import TAX_TABLE, TaxTable
+from taxes.services.tax.entities.tax import (
+    apply,
+    ApplyTaxes,
+    get_backend,
+)
+from taxes.services.tax.lookup import (
+    create as create_lookup,
+    TaxLookup,
+)
+from taxes.services.tax.use_cases import (
+    BatchTaxArticlesUseCase,
+    TaxArticlesUseCase,
+)
+
+
+@dataclass(frozen=True)
+class TaxRuleSet:
+    """ A tax table and the cache and lookup of the amounts calculated
+    with it. """
+    table: TaxTable = TAX_TABLE
+    cache: Optional[TaxAmountCache] = None
+    lookup: Optional[TaxLookup] = None
+
+    def cached_tax_amount(self):
+        if self.lookup is not None:
+            return self.lookup
+        if self.cache is not None:
+            return self.cache
+        return no_cache
+
+
+def create_rule_set(
+    table: TaxTable,
+    cache_size: Optional[int] = None,
+    lookup_ceiling: Optional[Decimal] = None,
+    lookup_cache_path: Optional[str] = None,
+) -> TaxRuleSet:
+    cache = create_cache(cache_size) if cache_size is not None else None
+    lookup = None
+    if lookup_ceiling is not None:
+        lookup = create_lookup(
+            tax_table=table,
+            ceiling=lookup_ceiling,
+            cache_path=lookup_cache_path,
+            fallback=no_cache if cache is None else cache,
+        )
+    return TaxRuleSet(table=table, cache=cache, lookup=lookup)
 
 
 @dataclass
 class TaxService:
     logger: 'Dependency.Logger'
+    rule_set: TaxRuleSet = TaxRuleSet()
+    apply_taxes: ApplyTaxes = apply
+    batch_threshold: Optional[int] = None
+
+    @property
+    def cache(self) -> Optional[TaxAmountCache]:
+        return self.rule_set.cache
 
     def add_taxes(self, articles: Iterable[Article]) -> Iterable[TaxedArticle]:
+        """ Add taxes to :param articles:.
+
+        Collections of at least `batch_threshold` articles are taxed as a
+        single columnar batch.
+        """
+        rule_set = self.rule_set
+        if self.is_large_batch(articles):
+            taxed_articles = self.tax_batch(articles, rule_set)
+            if taxed_articles is not None:
+                return taxed_articles
+
         tax_articles = TaxArticlesUseCase(articles=articles)
-        env = TaxArticlesUseCase.Environment(
+        return tax_articles(self.environment(rule_set))
+
+    def tax_batch(
+        self,
+        articles: Sequence[Article],
+        rule_set: TaxRuleSet,
+    ) -> Optional[List[TaxedArticle]]:
+        tax_batch = BatchTaxArticlesUseCase(articles=articles)
+        env = BatchTaxArticlesUseCase.Environment(
             info=self.logger.info,
             debug=self.logger.debug,
+            tax_table=rule_set.table,
+        )
+        return tax_batch(env)
+
+    def is_large_batch(self, articles: Iterable[Article]) -> bool:
+        return (
+            self.batch_threshold is not None
+            and isinstance(articles, Sized)
+            and len(articles) >= self.batch_threshold
+        )
+
+    def iter_taxes(
+        self,
+        articles: Iterable[Article],
+    ) -> Iterator[TaxedArticle]:
+        """ Lazily add taxes to :param articles:, one article at a time.
+
+        Collections of at least `batch_threshold` articles are already held
+        in memory, so they are taxed as a single columnar batch like in
+        `add_taxes`.
+        """
+        rule_set = self.rule_set
+        if self.is_large_batch(articles):
+            taxed_articles = self.tax_batch(articles, rule_set)
+            if taxed_articles is not None:
+                return iter(taxed_articles)
+
+        tax_articles = TaxArticlesUseCase(articles=articles, lazy=True)
+        return tax_articles(self.environment(rule_set))
+
+    def environment(
+        self,
+        rule_set: TaxRuleSet,
+    ) -> TaxArticlesUseCase.Environment:
+        return TaxArticlesUseCase.Environment(
+            info=self.logger.info,
+            debug=self.logger.debug,
+            cached_tax_amount=rule_set.cached_tax_amount(),
+            apply_taxes=self.apply_taxes,
+            tax_table=rule_set.table,
         )
-        return tax_articles(env)
 
 
 class Dependency:
     class Logger(Protocol):
-        def info(self, msg: str):  # pragma: no cover
+        def info(self, msg: str, *args):  # pragma: no cover
             ...
 
-        def debug(self, msg: str):  # pragma: no cover
+        def debug(self, msg: str, *args):  # pragma: no cover
             ...
 
 
-def create(logger: Dependency.Logger):
+def create(
+    logger: Dependency.Logger,
+    cache_size: Optional[int] = None,
+    backend: str = 'decimal',
+    batch_threshold: Optional[int] = None,
+    tax_table: TaxTable = TAX_TABLE,
+    lookup_ceiling: Optional[Decimal] = None,
+    lookup_cache_path: Optional[str] = None,
+):
+    """ Create a tax service.
+
+    If :param cache_size: is set, the tax amounts of up to that many distinct
+    (unit price, product category, imported) combinations are memoized.
+    :param backend: is the name of the arithmetic used to calculate taxes
+    (see `taxes.services.tax.entities.tax.BACKENDS`).
+    If :param batch_threshold: is set, collections of at least that many
+    articles are taxed by the batch engine.
+    Taxes are due according to :param tax_table: (the kata rules by default);
+    services are created again to apply other rules (see
+    `taxes.gateways.server.reload_workers`).
+    If :param lookup_ceiling: is set, the amounts due for prices up to that
+    value are precomputed on first use, or read from
+    :param lookup_cache_path: (see `taxes.services.tax.lookup`).
+    """
     logger.debug('instantiating tax service')
-    return TaxService(logger=logger)
+    return TaxService(
+        logger=logger,
+        rule_set=create_rule_set(
+            table=tax_table,
+            cache_size=cache_size,
+            lookup_ceiling=lookup_ceiling,
+            lookup_cache_path=lookup_cache_path,
+        ),
+        apply_taxes=get_backend(backend),
+        batch_threshold=batch_threshold,
+    )
@@ -1,34 +1,56 @@
 from dataclasses import dataclass
-from typing import Callable, Iterable
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
 
 from taxes.services.basket.entities.article import Article
 from taxes.services.receipt.entities.taxed_article import TaxedArticle
-from taxes.services.tax.entities.applicable_taxes import get_applicable_taxes
-from taxes.services.tax.entities.tax import apply as apply_taxes
+from taxes.services.tax.cache import no_cache
+from taxes.services.tax.entities.applicable_taxes import TAX_TABLE, TaxTable
+from taxes.services.tax.entities.batch import (
+    calculate_tax_amounts_in_cents,
+    create as create_batch,
+)
+from taxes.services.tax.entities.tax import apply, ApplyTaxes, from_cents
 
 
 @dataclass
 class TaxArticlesUseCase:
     articles: Iterable[Article]
+    lazy: bool = False
 
     @dataclass
     class Environment:
-        info: Callable[[str], None]
-        debug: Callable[[str], None]
+        info: Callable[..., None]
+        debug: Callable[..., None]
+        cached_tax_amount: Callable[
+            [Article, Callable[[Article], Decimal]],
+            Decimal,
+        ] = no_cache
+        apply_taxes: ApplyTaxes = apply
+        tax_table: TaxTable = TAX_TABLE
 
     def __call__(self, env: Environment) -> Iterable[TaxedArticle]:
         env.info('adding taxes to articles in basket')
+        get_taxes = env.tax_table.get_taxes
+        rounding_increment = env.tax_table.rounding_increment
 
-        def tax_article(article):
-            env.debug(f'get applicable taxes for {article}')
-            taxes_to_apply = get_applicable_taxes(article)
+        def calculate_tax_amount_due_per_unit(article):
+            env.debug('get applicable taxes for %s', article)
+            taxes_to_apply = get_taxes(article.product.category, article.imported)  # noqa: E501
 
-            env.debug(f'taxes to apply: {taxes_to_apply}')
-            tax_amount_due_per_unit = apply_taxes(
+            env.debug('taxes to apply: %s', taxes_to_apply)
+            return env.apply_taxes(
                 price=article.unit_price_before_taxes,
-                taxes=taxes_to_apply
+                taxes=taxes_to_apply,
+                increment=rounding_increment,
+            )
+
+        def tax_article(article):
+            tax_amount_due_per_unit = env.cached_tax_amount(
+                article,
+                calculate_tax_amount_due_per_unit,
             )
-            env.debug(f'tax amount due per unit: {tax_amount_due_per_unit}')
+            env.debug('tax amount due per unit: %s', tax_amount_due_per_unit)
 
             taxed_article = TaxedArticle(
                 product=article.product,
@@ -37,10 +59,59 @@ class TaxArticlesUseCase:
                 unit_price_before_taxes=article.unit_price_before_taxes,
                 tax_amount_due_per_unit=tax_amount_due_per_unit,
             )
-            env.debug(f'taxes have been applied: {taxed_article}')
+            env.debug('taxes have been applied: %s', taxed_article)
             return taxed_article
 
-        taxed_articles = [tax_article(article) for article in self.articles]
+        def iter_taxed_articles():
+            yield from map(tax_article, self.articles)
+            env.info('taxes added')
+
+        if self.lazy:
+            return iter_taxed_articles()
+
+        return list(iter_taxed_articles())
+
+
+@dataclass
+class BatchTaxArticlesUseCase:
+    articles: Sequence[Article]
+
+    @dataclass
+    class Environment:
+        info: Callable[..., None]
+        debug: Callable[..., None]
+        tax_table: TaxTable = TAX_TABLE
+
+    def __call__(self, env: Environment) -> Optional[List[TaxedArticle]]:
+        """ Add taxes to all the articles at once.
+
+        Return None if the articles can't be represented as a batch (i.e. if
+        any price has fractions of cents).
+        """
+        env.info('adding taxes to a batch of %s articles', len(self.articles))
+        batch = create_batch(self.articles)
+        amounts = None
+        if batch is not None:
+            amounts = calculate_tax_amounts_in_cents(batch, env.tax_table)
+        if amounts is None:
+            env.info('articles can\'t be taxed as a batch')
+            return None
+
+        amounts_due: Dict[int, Decimal] = {}
+        taxed_articles = []
+        for article, amount in zip(self.articles, amounts):
+            tax_amount_due_per_unit = amounts_due.get(amount)
+            if tax_amount_due_per_unit is None:
+                tax_amount_due_per_unit = amounts_due[amount] = from_cents(amount)  # noqa: E501
+            taxed_articles.append(
+                TaxedArticle(
+                    product=article.product,
+                    quantity=article.quantity,
+                    imported=article.imported,
+                    unit_price_before_taxes=article.unit_price_before_taxes,
+                    tax_amount_due_per_unit=tax_amount_due_per_unit,
+                )
+            )
         env.info('taxes added')
 
         return taxed_articles
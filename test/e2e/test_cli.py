@@ -1,6 +1,16 @@
+import csv
+import io
+import json
+import re
+import signal
+import socket
 import subprocess
+import time
+import urllib.error
+import urllib.request
 from dataclasses import dataclass
 from inspect import cleandoc
+from urllib.parse import urlsplit
 
 import pytest
 
@@ -234,8 +244,9 @@ def test_command_prints_help_text_to_stdout_when_called_with_help_option(
 ):
     command = [entrypoint, help_opt, verbosity]
     result = subprocess.run(command, capture_output=True, encoding='utf-8')
-    expected = 'usage: receipt [-h] -i BASKET [-v]'
+    expected = 'usage: receipt [-h]'
     assert result.stdout.startswith(expected)
+    assert '-i BASKET' in result.stdout
 
 
 @verbosity_option_test_cases
@@ -246,12 +257,9 @@ def test_command_exits_with_error_if_input_options_is_not_set(
 ):
     command = [entrypoint, verbosity]
     result = subprocess.run(command, capture_output=True, encoding='utf-8')
-    expected = (
-        'usage: receipt [-h] -i BASKET [-v]\n',
-        'error: receipt: error: the following arguments are required: -i/--input\n',
-    )
     assert SUCCESS_STATUS != result.returncode
-    assert result.stderr.startswith(expected)
+    assert result.stderr.startswith('usage: receipt [-h]')
+    assert 'error: one of the arguments -i/--input --input-dir --inputs is required' in result.stderr
 
 
 @cli_test_cases
@@ -275,3 +283,666 @@ def test_command_prints_receipt_to_stdout_when_basket_is_submitted_as_file(
 
     assert SUCCESS_STATUS == result.returncode
     assert result.stdout.endswith(case.expected)
+
+
+@cli_test_cases
+@entrypoint_test_cases
+def test_command_reads_baskets_with_windows_line_endings(entrypoint, case, tmp_path):
+    basket_path = tmp_path / "basket.txt"
+    basket_path.write_bytes(case.input.replace('\n', '\r\n').encode('utf-8'))
+    command = [entrypoint, '--input', basket_path]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == result.returncode
+    assert result.stdout.endswith(case.expected)
+
+
+@entrypoint_test_cases
+def test_command_prints_empty_receipt_if_basket_is_empty(entrypoint, tmp_path):
+    basket_path = tmp_path / "basket.txt"
+    basket_path.write_text('')
+    command = [entrypoint, '--input', basket_path]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == result.returncode
+    assert 'Sales Taxes: 0\nTotal: 0\n' == result.stdout
+
+
+jobs_option_test_cases = pytest.mark.parametrize('jobs', [
+    '1',
+    '3',
+])
+
+
+def write_baskets(directory):
+    directory.mkdir()
+    paths = {}
+    for i, case in enumerate(TEST_CASES.values()):
+        path = directory / f'basket-{i:02}.txt'
+        path.write_text(case.input)
+        paths[path] = case
+    return paths
+
+
+@jobs_option_test_cases
+@entrypoint_test_cases
+def test_command_writes_receipt_of_each_basket_in_input_dir(
+    entrypoint,
+    jobs,
+    tmp_path,
+):
+    baskets = write_baskets(tmp_path / 'baskets')
+    output_dir = tmp_path / 'receipts'
+    command = [
+        entrypoint,
+        '--input-dir', tmp_path / 'baskets',
+        '--output-dir', output_dir,
+        '--jobs', jobs,
+    ]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == result.returncode
+    for path, case in baskets.items():
+        receipt = (output_dir / f'{path.name}.receipt').read_text()
+        assert case.expected == receipt
+
+
+@jobs_option_test_cases
+@entrypoint_test_cases
+def test_command_prints_summary_of_baskets_in_input_order(
+    entrypoint,
+    jobs,
+    tmp_path,
+):
+    baskets = write_baskets(tmp_path / 'baskets')
+    paths = list(reversed(list(baskets)))
+    command = [
+        entrypoint,
+        '--inputs', *paths,
+        '--output-dir', tmp_path / 'receipts',
+        '--jobs', jobs,
+    ]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    lines = result.stdout.splitlines()
+    assert SUCCESS_STATUS == result.returncode
+    assert [f'{path}:' for path in paths] == [line.split()[0] for line in lines[:-1]]
+    assert lines[-1].startswith(f'Baskets: {len(paths)}, Failed: 0, ')
+
+
+@entrypoint_test_cases
+def test_command_reports_malformed_baskets_and_exits_with_error(
+    entrypoint,
+    tmp_path,
+):
+    baskets = write_baskets(tmp_path / 'baskets')
+    malformed = tmp_path / 'baskets' / 'malformed.txt'
+    malformed.write_text('this is not a basket')
+    command = [
+        entrypoint,
+        '--input-dir', tmp_path / 'baskets',
+        '--output-dir', tmp_path / 'receipts',
+    ]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS != result.returncode
+    assert f'{malformed}: error: MalformedInput' in result.stdout
+    assert result.stdout.splitlines()[-1].startswith(f'Baskets: {len(baskets) + 1}, Failed: 1, ')
+
+
+@entrypoint_test_cases
+def test_command_exits_with_error_if_output_dir_is_set_with_input(entrypoint, tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text(TEST_CASES['single book'].input)
+    command = [entrypoint, '--input', basket_path, '--output-dir', tmp_path]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS != result.returncode
+    assert '--output-dir can not be used with -i/--input' in result.stderr
+
+
+@entrypoint_test_cases
+def test_command_does_not_process_receipts_written_in_input_dir(entrypoint, tmp_path):
+    baskets = write_baskets(tmp_path / 'baskets')
+    command = [
+        entrypoint,
+        '--input-dir', tmp_path / 'baskets',
+        '--output-dir', tmp_path / 'baskets',
+    ]
+    first = subprocess.run(command, capture_output=True, encoding='utf-8')
+    second = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == first.returncode
+    assert SUCCESS_STATUS == second.returncode
+    assert second.stdout.splitlines()[-1].startswith(f'Baskets: {len(baskets)}, Failed: 0, ')
+
+
+
+@entrypoint_test_cases
+def test_command_exits_with_error_if_inputs_have_same_name(entrypoint, tmp_path):
+    for directory in ('a', 'b'):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / 'x.txt').write_text(TEST_CASES['single book'].input)
+    command = [
+        entrypoint,
+        '--inputs', tmp_path / 'a' / 'x.txt', tmp_path / 'b' / 'x.txt',
+        '--output-dir', tmp_path / 'receipts',
+    ]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert 2 == result.returncode
+    assert 'more than one basket would be written to' in result.stderr
+    assert 'Traceback' not in result.stderr
+
+
+@entrypoint_test_cases
+def test_command_exits_with_error_if_input_dir_does_not_exist(entrypoint, tmp_path):
+    command = [entrypoint, '--input-dir', tmp_path / 'missing', '--output-dir', tmp_path]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert 2 == result.returncode
+    assert 'No such file or directory' in result.stderr
+    assert 'Traceback' not in result.stderr
+
+def write_large_basket(path, size=3 << 20):
+    rows = '\n'.join(case.input for case in TEST_CASES.values()) + '\n'
+    rows += '2 imported book at 12.490\n1 book at 12.5\n'
+    path.write_text(rows * (size // len(rows) + 1))
+
+
+@entrypoint_test_cases
+def test_command_prints_same_receipt_when_large_basket_is_split_in_shards(
+    entrypoint,
+    tmp_path,
+):
+    basket_path = tmp_path / 'basket.txt'
+    write_large_basket(basket_path)
+    serial = subprocess.run([entrypoint, '--input', basket_path], capture_output=True, encoding='utf-8')
+    sharded = subprocess.run([entrypoint, '--input', basket_path, '--jobs', '3'], capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == serial.returncode
+    assert SUCCESS_STATUS == sharded.returncode
+    assert serial.stdout == sharded.stdout
+
+
+@pytest.mark.parametrize('row', [
+    pytest.param('this is not a basket', id='malformed row'),
+    pytest.param('0 book at 12.49', id='invalid article'),
+])
+@entrypoint_test_cases
+def test_command_reports_same_error_when_large_basket_is_split_in_shards(
+    entrypoint,
+    row,
+    tmp_path,
+):
+    basket_path = tmp_path / 'basket.txt'
+    write_large_basket(basket_path)
+    lines = basket_path.read_text().splitlines()
+    lines.insert(2 * len(lines) // 3, row)
+    basket_path.write_text('\n'.join(lines))
+    serial = subprocess.run([entrypoint, '--input', basket_path], capture_output=True, encoding='utf-8')
+    sharded = subprocess.run([entrypoint, '--input', basket_path, '--jobs', '3'], capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS != sharded.returncode
+    assert '' == sharded.stdout
+    assert serial.stderr.splitlines()[-1] == sharded.stderr.splitlines()[-1]
+
+
+@pytest.fixture(scope='module')
+def receipt_server():
+    command = ['receipt', 'serve', '--port', '0', '--workers', '2']
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, encoding='utf-8')
+    try:
+        address = server.stdout.readline().split()[-1]
+        yield address
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def post(url, body, headers=None):
+    data = body if isinstance(body, bytes) else body.encode('utf-8')
+    request = urllib.request.Request(url, data=data, headers=headers or {}, method='POST')
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.read().decode('utf-8')
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode('utf-8')
+
+
+@cli_test_cases
+def test_server_responds_with_receipt(receipt_server, case):
+    status, body = post(f'{receipt_server}/receipt', case.input)
+    assert 200 == status
+    assert case.expected == body
+
+
+@cli_test_cases
+def test_server_responds_with_json_receipt(receipt_server, case):
+    status, body = post(f'{receipt_server}/receipt?format=json', case.input)
+    receipt = json.loads(body)
+    *items, taxes, total = case.expected.splitlines()
+    assert 200 == status
+    assert items == [
+        f"{item['quantity']} {item['description']}: {item['subtotal_price_with_taxes']}"
+        for item in receipt['items']
+    ]
+    assert taxes == f"Sales Taxes: {receipt['taxes_due']}"
+    assert total == f"Total: {receipt['total_due']}"
+
+
+def test_server_responds_with_bad_request_if_basket_is_malformed(receipt_server):
+    status, _ = post(f'{receipt_server}/receipt', 'this is not a basket')
+    assert 400 == status
+
+
+@pytest.mark.parametrize('content_length, message', [
+    pytest.param('-5', 'negative content length', id='negative'),
+    pytest.param(str((1 << 24) + 1), 'content length exceeds', id='too large'),
+])
+def test_server_responds_with_bad_request_if_content_length_is_invalid(receipt_server, content_length, message):  # noqa: E501
+    host, port = urlsplit(receipt_server).netloc.split(':')
+    with socket.create_connection((host, int(port)), timeout=10) as connection:
+        connection.sendall(
+            b'POST /receipt HTTP/1.1\r\n'
+            + f'Content-Length: {content_length}\r\n\r\n'.encode('latin-1')
+        )
+        response = connection.makefile('rb').read().decode('utf-8')
+
+    assert response.startswith('HTTP/1.1 400 ')
+    assert message in response
+
+
+
+def test_server_responds_with_bad_request_if_header_is_too_long(receipt_server):
+    host, port = urlsplit(receipt_server).netloc.split(':')
+    with socket.create_connection((host, int(port)), timeout=10) as connection:
+        connection.sendall(
+            b'POST /receipt HTTP/1.1\r\n'
+            + b'X-Long: ' + b'a' * (1 << 17) + b'\r\n\r\n'
+        )
+        response = connection.makefile('rb').read().decode('utf-8')
+
+    assert response.startswith('HTTP/1.1 400 ')
+    assert 'line too long' in response
+
+
+def test_loadtest_reports_requests_sent_to_server(receipt_server, tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text(TEST_CASES['single book'].input)
+    command = ['receipt-loadtest', '--input', basket_path, '--url', f'{receipt_server}/receipt', '-n', '20', '-c', '4']
+    result = subprocess.run(command, capture_output=True, encoding='utf-8', timeout=60)
+
+    assert SUCCESS_STATUS == result.returncode
+    assert 'requests: 20' in result.stdout.splitlines()
+    assert 'errors: 0' in result.stdout.splitlines()
+
+@entrypoint_test_cases
+def test_command_uses_categories_from_catalogue(entrypoint, tmp_path):
+    catalogue_csv = tmp_path / 'catalogue.csv'
+    catalogue_csv.write_text(cleandoc("""
+        name,category
+        fancy biscuits,food
+        Music CD,
+    """))
+    catalogue = tmp_path / 'catalogue.db'
+    command = ['receipt-catalogue', '--db', catalogue, '--input', catalogue_csv]
+    assert SUCCESS_STATUS == subprocess.run(command).returncode
+
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text(cleandoc("""
+        1 fancy   biscuits at 10.00
+        1 imported music cd at 10.00
+        1 book at 12.49
+    """))
+    command = [entrypoint, '--input', basket_path, '--catalogue', catalogue]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == result.returncode
+    assert result.stdout == cleandoc("""
+        1 fancy biscuits: 10.00
+        1 imported Music CD: 11.50
+        1 book: 13.74
+        Sales Taxes: 2.75
+        Total: 35.24
+    """) + '\n'
+
+
+def test_generator_writes_same_basket_for_same_seed():
+    command = ['receipt-gen', '--lines', '1000', '--seed', '7']
+    first = subprocess.run(command, capture_output=True, encoding='utf-8')
+    second = subprocess.run(command, capture_output=True, encoding='utf-8')
+    other = subprocess.run([*command[:-1], '8'], capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == first.returncode
+    assert 1000 == len(first.stdout.splitlines())
+    assert first.stdout == second.stdout
+    assert first.stdout != other.stdout
+
+
+@entrypoint_test_cases
+def test_command_prints_receipt_of_generated_basket(entrypoint, tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    catalogue_csv = tmp_path / 'catalogue.csv'
+    command = ['receipt-gen', '--lines', '5000', '--products', '50', '--output', basket_path, '--catalogue', catalogue_csv]
+    assert SUCCESS_STATUS == subprocess.run(command).returncode
+    catalogue = tmp_path / 'catalogue.db'
+    command = ['receipt-catalogue', '--db', catalogue, '--input', catalogue_csv]
+    assert SUCCESS_STATUS == subprocess.run(command).returncode
+
+    command = [entrypoint, '--input', basket_path, '--catalogue', catalogue]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == result.returncode
+    assert len(result.stdout.splitlines()) - 2 <= 50 * 2
+    assert result.stdout.splitlines()[-1].startswith('Total: ')
+
+
+@entrypoint_test_cases
+def test_command_fails_on_generated_malformed_rows(entrypoint, tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    command = ['receipt-gen', '--lines', '100', '--malformed', '1', '--output', basket_path]
+    assert SUCCESS_STATUS == subprocess.run(command).returncode
+
+    command = [entrypoint, '--input', basket_path]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS != result.returncode
+    assert 'line 1 (offset 0): malformed row' in result.stderr
+
+
+def write_tax_rules(path, import_rate):
+    path.write_text(json.dumps({
+        'version': 1,
+        'rounding_increment': '0.01',
+        'exempt_categories': ['book', 'food', 'medical'],
+        'rates': {'non-exempt-category': '0.1', 'import': import_rate},
+    }))
+
+
+@entrypoint_test_cases
+def test_command_uses_tax_rules(entrypoint, tmp_path):
+    rules_path = tmp_path / 'rules.json'
+    write_tax_rules(rules_path, import_rate='0.2')
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text('1 imported book at 10.01\n1 music CD at 10.01\n')
+
+    command = [entrypoint, '--input', basket_path, '--tax-rules', rules_path]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == result.returncode
+    assert result.stdout == cleandoc("""
+        1 imported book: 12.02
+        1 music CD: 11.02
+        Sales Taxes: 3.02
+        Total: 23.04
+    """) + '\n'
+
+
+@entrypoint_test_cases
+def test_command_uses_kata_rules_of_example_file(entrypoint):
+    command = [entrypoint, '--input', 'examples/mixed-multi-quantity.txt']
+    default = subprocess.run(command, capture_output=True, encoding='utf-8')
+    with_rules = subprocess.run([*command, '--tax-rules', 'examples/tax-rules.json'], capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == with_rules.returncode
+    assert default.stdout == with_rules.stdout
+
+
+@entrypoint_test_cases
+def test_command_exits_with_error_if_tax_rules_are_invalid(entrypoint, tmp_path):
+    rules_path = tmp_path / 'rules.json'
+    write_tax_rules(rules_path, import_rate='-0.2')
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text('1 book at 10.01\n')
+
+    command = [entrypoint, '--input', basket_path, '--tax-rules', rules_path]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS != result.returncode
+    assert '' == result.stdout
+    assert 'error: invalid tax rules: rate must be positive: -0.2' in result.stderr
+
+
+def test_server_reloads_tax_rules_on_sighup(tmp_path):
+    rules_path = tmp_path / 'rules.json'
+    write_tax_rules(rules_path, import_rate='0.2')
+    command = ['receipt', 'serve', '--port', '0', '--workers', '1', '--tax-rules', rules_path]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, encoding='utf-8')
+    try:
+        address = server.stdout.readline().split()[-1]
+        _, before = post(f'{address}/receipt', '1 imported book at 10.00\n')
+
+        write_tax_rules(rules_path, import_rate='not a rate')
+        server.send_signal(signal.SIGHUP)
+        time.sleep(0.5)
+        _, after_invalid_rules = post(f'{address}/receipt', '1 imported book at 10.00\n')
+
+        write_tax_rules(rules_path, import_rate='0.5')
+        server.send_signal(signal.SIGHUP)
+        time.sleep(0.5)
+        _, after = post(f'{address}/receipt', '1 imported book at 10.00\n')
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    assert before.startswith('1 imported book: 12.00\n')
+    assert after_invalid_rules == before
+    assert after.startswith('1 imported book: 15.00\n')
+
+
+@cli_test_cases
+@entrypoint_test_cases
+def test_command_prints_same_receipt_with_tax_lookup(entrypoint, case, tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text(case.input)
+    cache_path = tmp_path / 'lookup.bin'
+    command = [entrypoint, '--input', basket_path, '--tax-lookup-ceiling', '50', '--tax-lookup-cache', cache_path]
+
+    first = subprocess.run(command, capture_output=True, encoding='utf-8')
+    second = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == first.returncode
+    assert case.expected == first.stdout
+    assert first.stdout == second.stdout
+    assert cache_path.exists()
+
+
+@entrypoint_test_cases
+def test_command_writes_receipt_to_output_file(entrypoint, tmp_path):
+    case = TEST_CASES['single book']
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text(case.input)
+    output_path = tmp_path / 'receipt.txt'
+
+    command = [entrypoint, '--input', basket_path, '--output', output_path]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == result.returncode
+    assert '' == result.stdout
+    assert case.expected == output_path.read_text()
+
+
+@entrypoint_test_cases
+def test_command_exits_with_error_if_output_is_set_with_multiple_baskets(entrypoint, tmp_path):
+    command = [entrypoint, '--input-dir', tmp_path, '--output', tmp_path / 'receipt.txt']
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+    assert SUCCESS_STATUS != result.returncode
+    assert 'error: --output can only be used with -i/--input' in result.stderr
+
+
+@cli_test_cases
+@entrypoint_test_cases
+def test_command_prints_receipt_as_csv(entrypoint, case, tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text(case.input)
+
+    command = [entrypoint, '--input', basket_path, '--format', 'csv']
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    *items, taxes, total = case.expected.splitlines()
+    assert SUCCESS_STATUS == result.returncode
+    assert list(csv.reader(io.StringIO(result.stdout))) == [
+        ['quantity', 'description', 'subtotal_price_with_taxes'],
+        *[
+            [quantity, description, subtotal]
+            for quantity, description, subtotal in (
+                re.match(r'(\d+) (.*): (\S+)$', item).groups() for item in items
+            )
+        ],
+        ['', 'Sales Taxes', taxes.split()[-1]],
+        ['', 'Total', total.split()[-1]],
+    ]
+
+
+@cli_test_cases
+@entrypoint_test_cases
+def test_command_prints_receipt_as_json_lines(entrypoint, case, tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text(case.input)
+
+    command = [entrypoint, '--input', basket_path, '--format', 'jsonl']
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    *items, taxes, total = case.expected.splitlines()
+    *receipt_items, totals = [json.loads(line) for line in result.stdout.splitlines()]
+    assert SUCCESS_STATUS == result.returncode
+    assert items == [
+        f"{item['quantity']} {item['description']}: {item['subtotal_price_with_taxes']}"
+        for item in receipt_items
+    ]
+    assert taxes == f"Sales Taxes: {totals['taxes_due']}"
+    assert total == f"Total: {totals['total_due']}"
+
+
+def test_command_writes_receipts_of_multiple_baskets_in_format(tmp_path):
+    baskets = write_baskets(tmp_path / 'baskets')
+    output_dir = tmp_path / 'receipts'
+
+    command = ['receipt', '--input-dir', tmp_path / 'baskets', '--output-dir', output_dir, '--format', 'jsonl']
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == result.returncode
+    for path in baskets:
+        lines = (output_dir / f'{path.name}.receipt').read_text().splitlines()
+        assert 'total_due' in json.loads(lines[-1])
+
+
+def convert_basket(basket_path, binary_path):
+    command = ['receipt-convert', '--input', basket_path, '--output', binary_path]
+    return subprocess.run(command, capture_output=True, encoding='utf-8')
+
+
+@cli_test_cases
+@entrypoint_test_cases
+def test_command_prints_same_receipt_for_binary_basket(entrypoint, case, tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text(case.input)
+    binary_path = tmp_path / 'basket.bin'
+    assert SUCCESS_STATUS == convert_basket(basket_path, binary_path).returncode
+
+    command = [entrypoint, '--input', binary_path]
+    result = subprocess.run(command, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == result.returncode
+    assert case.expected == result.stdout
+
+
+@cli_test_cases
+@entrypoint_test_cases
+def test_command_prints_receipt_for_binary_basket_read_from_pipe(entrypoint, case, tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text(case.input)
+    binary_path = tmp_path / 'basket.bin'
+    assert SUCCESS_STATUS == convert_basket(basket_path, binary_path).returncode
+
+    command = [entrypoint, '--input', '/dev/stdin']
+    result = subprocess.run(command, input=binary_path.read_bytes(), capture_output=True)
+
+    assert SUCCESS_STATUS == result.returncode
+    assert case.expected == result.stdout.decode('utf-8')
+
+
+@cli_test_cases
+@entrypoint_test_cases
+def test_command_prints_receipt_for_text_basket_read_from_pipe(entrypoint, case):
+    command = [entrypoint, '--input', '/dev/stdin']
+    result = subprocess.run(command, input=case.input, capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == result.returncode
+    assert case.expected == result.stdout
+
+
+@entrypoint_test_cases
+def test_command_prints_same_receipt_for_large_binary_basket(entrypoint, tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    write_large_basket(basket_path)
+    binary_path = tmp_path / 'basket.bin'
+    assert SUCCESS_STATUS == convert_basket(basket_path, binary_path).returncode
+
+    text = subprocess.run([entrypoint, '--input', basket_path], capture_output=True, encoding='utf-8')
+    binary = subprocess.run([entrypoint, '--input', binary_path, '--jobs', '3'], capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS == binary.returncode
+    assert text.stdout == binary.stdout
+
+
+@entrypoint_test_cases
+def test_command_reports_location_of_truncated_binary_record(entrypoint, tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text('1 book at 12.49\n1 music CD at 14.99\n')
+    binary_path = tmp_path / 'basket.bin'
+    assert SUCCESS_STATUS == convert_basket(basket_path, binary_path).returncode
+    binary_path.write_bytes(binary_path.read_bytes()[:-1])
+
+    result = subprocess.run([entrypoint, '--input', binary_path], capture_output=True, encoding='utf-8')
+
+    assert SUCCESS_STATUS != result.returncode
+    assert 'record 2 (offset 28): truncated record' in result.stderr
+
+
+def test_converter_fails_on_malformed_rows(tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text('1 book at 12.49\nthis is not a basket\n')
+
+    result = convert_basket(basket_path, tmp_path / 'basket.bin')
+
+    assert SUCCESS_STATUS != result.returncode
+    assert 'line 2 (offset 16): malformed row' in result.stderr
+
+
+def test_converter_leaves_no_output_if_basket_is_malformed(tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text('1 book at 12.49\n' * 100000 + 'this is not a basket\n')
+
+    result = convert_basket(basket_path, tmp_path / 'basket.bin')
+
+    assert SUCCESS_STATUS != result.returncode
+    assert ['basket.txt'] == [path.name for path in tmp_path.iterdir()]
+
+
+def test_converter_keeps_previous_output_if_basket_is_malformed(tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text('1 book at 12.49\n')
+    binary_path = tmp_path / 'basket.bin'
+    assert SUCCESS_STATUS == convert_basket(basket_path, binary_path).returncode
+    previous = binary_path.read_bytes()
+    basket_path.write_text('1 book at 12.49\nthis is not a basket\n')
+
+    result = convert_basket(basket_path, binary_path)
+
+    assert SUCCESS_STATUS != result.returncode
+    assert previous == binary_path.read_bytes()
+
+
+@cli_test_cases
+def test_server_responds_with_receipt_of_binary_basket(receipt_server, case, tmp_path):
+    basket_path = tmp_path / 'basket.txt'
+    basket_path.write_text(case.input)
+    binary_path = tmp_path / 'basket.bin'
+    assert SUCCESS_STATUS == convert_basket(basket_path, binary_path).returncode
+
+    status, body = post(f'{receipt_server}/receipt', binary_path.read_bytes())
+
+    assert 200 == status
+    assert case.expected == body
@@ -0,0 +1,128 @@
+import io
+
+import pytest
+
+from taxes.adapters import sqlite_product_repository
+from taxes.adapters.sqlite_product_repository import (
+    create as create_repository,
+    normalize_name,
+    SqliteProductRepository,
+)
+from taxes.services.basket.entities.product import Product
+
+
+@pytest.fixture
+def repository():
+    repository = create_repository(':memory:')
+    repository.add_many([
+        Product(name='book', category='book'),
+        Product(name='box of chocolates', category='food'),
+        Product(name='music CD', category=None),
+    ])
+    return repository
+
+
+def spy_on_select(repository, monkeypatch):
+    """ Return the list of the names passed to each query of
+    :param repository:. """
+    calls = []
+    select = repository.select
+
+    def spy(names):
+        calls.append(list(names))
+        return select(names)
+
+    monkeypatch.setattr(repository, 'select', spy)
+    return calls
+
+
+@pytest.fixture
+def selected_names(repository, monkeypatch):
+    return spy_on_select(repository, monkeypatch)
+
+
+def test_create_returns_repository():
+    assert isinstance(create_repository(':memory:'), SqliteProductRepository)
+
+
+@pytest.mark.parametrize('name, expected', [
+    pytest.param('book', 'book', id='lowercase'),
+    pytest.param('Music CD', 'music cd', id='mixed case'),
+    pytest.param('  box   of\tchocolates ', 'box of chocolates', id='repeated spaces'),  # noqa: E501
+])
+def test_normalize_name(name, expected):
+    assert expected == normalize_name(name)
+
+
+@pytest.mark.parametrize('name, expected', [
+    pytest.param('book', Product(name='book', category='book'), id='same name'),  # noqa: E501
+    pytest.param('Box  of Chocolates', Product(name='box of chocolates', category='food'), id='normalized name'),  # noqa: E501
+    pytest.param('music cd', Product(name='music CD', category=None), id='not categorized'),  # noqa: E501
+])
+def test_get_by_name_returns_product_from_catalogue(repository, name, expected):  # noqa: E501
+    assert expected == repository.get_by_name(name)
+
+
+def test_get_by_name_returns_uncategorized_product_if_unknown(repository):
+    expected = Product(name='bottle of perfume', category=None)
+    assert expected == repository.get_by_name('bottle of perfume')
+
+
+def test_get_many_by_name_looks_up_names_in_chunks(repository, selected_names, monkeypatch):  # noqa: E501
+    monkeypatch.setattr(sqlite_product_repository, 'MAX_NAMES_PER_QUERY', 2)
+    names = ['book', 'music CD', 'unknown', 'book', 'box of chocolates']
+
+    products = repository.get_many_by_name(names)
+
+    assert [
+        ['book', 'music CD'],
+        ['unknown', 'box of chocolates'],
+    ] == selected_names
+    assert {
+        'book': Product(name='book', category='book'),
+        'music CD': Product(name='music CD', category=None),
+        'unknown': Product(name='unknown', category=None),
+        'box of chocolates': Product(name='box of chocolates', category='food'),  # noqa: E501
+    } == products
+
+
+def test_get_many_by_name_only_looks_up_names_not_in_cache(repository, selected_names):  # noqa: E501
+    repository.get_by_name('book')
+    repository.get_by_name('unknown')
+
+    products = repository.get_many_by_name(['book', 'unknown', 'music CD'])
+
+    assert [['book'], ['unknown'], ['music CD']] == selected_names
+    assert Product(name='unknown', category=None) == products['unknown']
+
+
+def test_get_by_name_evicts_least_recently_used_product(monkeypatch):
+    repository = create_repository(':memory:', cache_size=2)
+    selected_names = spy_on_select(repository, monkeypatch)
+    repository.get_by_name('a')
+    repository.get_by_name('b')
+    repository.get_by_name('a')
+    repository.get_by_name('c')
+    selected_names.clear()
+
+    repository.get_by_name('a')
+    repository.get_by_name('c')
+    repository.get_by_name('b')
+
+    assert [['b']] == selected_names
+
+
+def test_add_many_clears_cache(repository):
+    assert None is repository.get_by_name('bottle of perfume').category
+    repository.add_many([Product(name='bottle of perfume', category='perfume')])  # noqa: E501
+    assert 'perfume' == repository.get_by_name('bottle of perfume').category
+
+
+def test_load_csv_imports_products(repository):
+    repository.load_csv(io.StringIO(
+        'name,category\n'
+        ' headache pills ,medical\n'
+        'bottle of perfume,\n'
+    ))
+    assert Product(name='headache pills', category='medical') == repository.get_by_name('headache pills')  # noqa: E501
+    assert Product(name='bottle of perfume', category=None) == repository.get_by_name('bottle of perfume')  # noqa: E501
@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+import pytest
+
+from taxes.gateways import renderers
+from taxes.services.receipt.entities.receipt import ReceiptItem, ReceiptTotals
+
+
+TOTALS = ReceiptTotals(taxes_due=Decimal('1.50'), total_due=Decimal('29.83'))
+
+
+def render(create_renderer, items):
+    output = io.StringIO()
+    renderer = create_renderer(output)
+    for item in items:
+        renderer.write_item(item)
+    renderer.write_totals(TOTALS)
+    return output.getvalue()
+
+
+def test_text_renderer_writes_kata_receipt():
+    items = [
+        ReceiptItem(description='book', quantity=1, subtotal_price_with_taxes=Decimal('12.49')),  # noqa: E501
+        ReceiptItem(description='imported box of chocolates', quantity=2, subtotal_price_with_taxes=Decimal('21.00')),  # noqa: E501
+    ]
+    assert (
+        '1 book: 12.49\n'
+        '2 imported box of chocolates: 21.00\n'
+        'Sales Taxes: 1.50\n'
+        'Total: 29.83\n'
+    ) == render(renderers.TextRenderer, items)
+
+
+@pytest.mark.parametrize('description', [
+    pytest.param('book', id='plain'),
+    pytest.param('box of chocolates, dark', id='comma'),
+    pytest.param('"best" book', id='quotes'),
+    pytest.param('book\nwith newline', id='newline'),
+])
+def test_csv_renderer_quotes_descriptions(description):
+    item = ReceiptItem(description=description, quantity=1, subtotal_price_with_taxes=Decimal('12.49'))  # noqa: E501
+
+    rows = list(csv.reader(io.StringIO(render(renderers.CsvRenderer, [item]))))  # noqa: E501
+
+    assert [
+        ['quantity', 'description', 'subtotal_price_with_taxes'],
+        ['1', description, '12.49'],
+        ['', 'Sales Taxes', '1.50'],
+        ['', 'Total', '29.83'],
+    ] == rows
+
+
+@pytest.mark.parametrize('description', [
+    pytest.param('book', id='plain'),
+    pytest.param('"best" book\\n', id='quotes and backslash'),
+    pytest.param('book\nwith newline', id='newline'),
+    pytest.param('livre très 👍', id='unicode'),
+])
+def test_json_lines_renderer_escapes_descriptions(description):
+    item = ReceiptItem(description=description, quantity=1, subtotal_price_with_taxes=Decimal('12.49'))  # noqa: E501
+
+    lines = render(renderers.JsonLinesRenderer, [item]).splitlines()
+
+    assert [
+        {'quantity': 1, 'description': description, 'subtotal_price_with_taxes': '12.49'},  # noqa: E501
+        {'taxes_due': '1.50', 'total_due': '29.83'},
+    ] == [json.loads(line) for line in lines]
+
+
+@pytest.mark.parametrize('name, expected', [
+    pytest.param('text', renderers.TextRenderer, id='text'),
+    pytest.param('csv', renderers.CsvRenderer, id='csv'),
+    pytest.param('jsonl', renderers.JsonLinesRenderer, id='jsonl'),
+])
+def test_get_renderer_returns_renderer(name, expected):
+    assert expected is renderers.get_renderer(name)
+
+
+def test_get_renderer_raises_error_if_format_is_unknown():
+    with pytest.raises(renderers.RendererError.UnknownFormat):
+        renderers.get_renderer('xml')
@@ -0,0 +1,57 @@
+import asyncio
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+
+import pytest
+
+from taxes.gateways import server
+
+
+def read_request(data, limit=1 << 16):
+    async def read():
+        reader = asyncio.StreamReader(limit=limit)
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await server.read_request(reader)
+    return asyncio.run(read())
+
+
+def test_read_request_parses_request():
+    request = read_request(
+        b'POST /receipt?format=json HTTP/1.1\r\n'
+        b'Content-Length: 4\r\n'
+        b'Connection: close\r\n'
+        b'\r\n'
+        b'body'
+    )
+    assert 'POST' == request.method
+    assert '/receipt' == request.path
+    assert request.wants_json
+    assert not request.keep_alive
+    assert b'body' == request.body
+
+
+@pytest.mark.parametrize('data', [
+    pytest.param(b'POST /' + b'a' * 64 + b' HTTP/1.1\r\n\r\n', id='request line'),
+    pytest.param(b'POST / HTTP/1.1\r\nX-Long: ' + b'a' * 64 + b'\r\n\r\n', id='header'),
+])
+def test_read_request_raises_bad_request_if_line_exceeds_limit(data):
+    with pytest.raises(server.ServerError.BadRequest, match='line too long'):
+        read_request(data, limit=32)
+
+
+class BrokenExecutor(Executor):
+    def submit(self, fn, *args, **kwargs):
+        raise BrokenProcessPool('a worker died')
+
+
+def test_respond_returns_internal_server_error_if_worker_pool_is_broken():
+    async def respond():
+        receipt_server = server.ReceiptServer(executor=BrokenExecutor(), max_pending=1)
+        request = server.Request(method='POST', path='/receipt', query={}, headers={}, body=b'')
+        return await receipt_server.respond(request)
+
+    response = asyncio.run(respond())
+
+    assert HTTPStatus.INTERNAL_SERVER_ERROR == response.status
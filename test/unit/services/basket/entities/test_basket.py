@@ -141,3 +141,85 @@ def test_list_articles_returns_list_of_added_articles_sorted_by_insertion_order(
         basket_with_articles = basket.add_article(a, basket_with_articles)
 
     assert expected == basket.list_articles(basket_with_articles)
+
+
+def test_builder_builds_empty_basket_if_no_articles_are_added():
+    assert basket.empty() == basket.BasketBuilder().build()
+
+
+def test_builder_aggregates_articles_like_add_article():
+    articles_to_add = [
+        create_article(quantity=1, product_name='B', product_category='dummy', unit_price_before_taxes=Decimal('1'), imported=True),
+        create_article(quantity=1, product_name='A', product_category='dummy', unit_price_before_taxes=Decimal('1'), imported=True),
+        create_article(quantity=3, product_name='B', product_category='dummy', unit_price_before_taxes=Decimal('1'), imported=True),
+        create_article(quantity=2, product_name='B', product_category='dummy', unit_price_before_taxes=Decimal('1'), imported=False),
+    ]
+
+    expected = basket.empty()
+    for a in articles_to_add:
+        expected = basket.add_article(a, expected)
+
+    builder = basket.BasketBuilder()
+    for a in articles_to_add:
+        builder.add_article(a)
+
+    assert expected == builder.build()
+
+
+def test_builder_does_not_modify_basket_it_was_created_from(make_article_fixture):
+    initial_basket = basket.add_article(make_article_fixture(quantity=2), basket.empty())
+    initial_articles = dict(initial_basket.articles)
+
+    builder = basket.BasketBuilder.from_basket(initial_basket)
+    builder.add_article(make_article_fixture(quantity=3))
+    builder.add_article(make_article_fixture(product_name='dummy2'))
+
+    assert initial_articles == initial_basket.articles
+
+
+def test_built_basket_is_not_affected_by_further_additions(make_article_fixture):
+    builder = basket.BasketBuilder()
+    builder.add_article(make_article_fixture(quantity=2))
+    built = builder.build()
+
+    builder.add_article(make_article_fixture(quantity=3))
+
+    key = basket.create_key(make_article_fixture())
+    assert 2 == basket.get_quantity(key, built)
+
+
+def test_builder_shares_one_product_instance_between_equal_products(make_article_fixture):
+    builder = basket.BasketBuilder()
+    builder.add_article(make_article_fixture(unit_price_before_taxes=Decimal('1')))
+    builder.add_article(make_article_fixture(unit_price_before_taxes=Decimal('2')))
+    builder.add_article(make_article_fixture(unit_price_before_taxes=Decimal('1'), quantity=2))
+    builder.add_article(make_article_fixture(imported=False))
+
+    products = [a.product for a in basket.list_articles(builder.build())]
+    assert 3 == len(products)
+    assert all(p is products[0] for p in products)
+
+
+def test_builder_does_not_share_products_of_different_categories(make_article_fixture):
+    builder = basket.BasketBuilder()
+    builder.add_article(make_article_fixture(product_category='a'))
+    builder.add_article(make_article_fixture(product_category='b', imported=False))
+
+    first, second = [a.product for a in basket.list_articles(builder.build())]
+    assert first is not second
+    assert first != second
+
+
+def test_builder_keeps_category_of_last_added_article(make_article_fixture):
+    builder = basket.BasketBuilder()
+    builder.add_article(make_article_fixture(product_category='a'))
+    builder.add_article(make_article_fixture(product_category='b'))
+
+    [article] = basket.list_articles(builder.build())
+    assert make_article_fixture(product_category='b', quantity=2) == article
+
+
+def test_list_articles_returns_articles_in_basket(make_article_fixture):
+    basket_with_articles = basket.add_article(make_article_fixture(), basket.empty())
+    [article] = basket.list_articles(basket_with_articles)
+    assert article is next(iter(basket_with_articles.articles.values()))
@@ -0,0 +1,88 @@
+from decimal import Decimal
+
+import pytest
+
+from taxes.services.basket.entities import basket, columnar_basket
+from taxes.services.basket.entities.article import create as create_article
+
+
+def make_article(**overrides):
+    return create_article(**{
+        'product_name': 'dummy',
+        'product_category': 'dummy-category',
+        'unit_price_before_taxes': Decimal('1'),
+        'imported': True,
+        'quantity': 1,
+        **overrides
+    })
+
+
+@pytest.mark.parametrize('articles', [
+    pytest.param([], id='empty'),
+    pytest.param([make_article()], id='single article'),
+    pytest.param([
+        make_article(product_name='B'),
+        make_article(product_name='A'),
+        make_article(product_name='B', quantity=3),
+        make_article(product_name='B', imported=False, quantity=2),
+    ], id='insertion order'),
+    pytest.param([
+        make_article(unit_price_before_taxes=Decimal('1.0')),
+        make_article(unit_price_before_taxes=Decimal('1.00')),
+        make_article(unit_price_before_taxes=Decimal('1.5')),
+        make_article(unit_price_before_taxes=Decimal('1.000'), quantity=4),
+    ], id='last price representation'),
+    pytest.param([
+        make_article(product_category='a'),
+        make_article(product_category='b'),
+        make_article(product_category=None, imported=False),
+    ], id='last product category'),
+    pytest.param([
+        make_article(unit_price_before_taxes=Decimal('0')),
+        make_article(unit_price_before_taxes=Decimal('1E+2')),
+        make_article(unit_price_before_taxes=Decimal('100'), quantity=10 ** 12),
+    ], id='zero and large prices'),
+])
+def test_columnar_basket_aggregates_articles_like_basket_builder(articles):
+    builder = basket.BasketBuilder()
+    for a in articles:
+        builder.add_article(a)
+    expected = basket.list_articles(builder.build())
+
+    actual = columnar_basket.create(articles).list_articles()
+
+    assert expected == actual
+    assert [str(a.unit_price_before_taxes) for a in expected] == [str(a.unit_price_before_taxes) for a in actual]
+    assert len(expected) == len(columnar_basket.create(articles))
+
+
+@pytest.mark.parametrize('key, expected', [
+    pytest.param(basket.BasketEntryKey('dummy', Decimal('1'), True), 3, id='entry in basket'),
+    pytest.param(basket.BasketEntryKey('dummy', Decimal('1.00'), True), 3, id='equal price'),
+    pytest.param(basket.BasketEntryKey('dummy', Decimal('1'), False), 0, id='different origin'),
+    pytest.param(basket.BasketEntryKey('dummy', Decimal('2'), True), 0, id='different price'),
+    pytest.param(basket.BasketEntryKey('other', Decimal('1'), True), 0, id='different name'),
+    pytest.param(basket.BasketEntryKey('dummy', Decimal('1.001'), True), 0, id='fractional cents'),
+    pytest.param(basket.BasketEntryKey('dummy', Decimal('1E+100'), True), 0, id='price too big'),
+])
+def test_get_quantity_returns_quantity_of_entry(key, expected):
+    articles = [make_article(quantity=1), make_article(quantity=2), make_article(product_name='other', imported=False)]
+    assert expected == columnar_basket.create(articles).get_quantity(key)
+
+
+@pytest.mark.parametrize('price', [
+    pytest.param(Decimal('0.001'), id='fraction of cent'),
+    pytest.param(Decimal('1.234'), id='price with fraction of cent'),
+    pytest.param(Decimal('Infinity'), id='infinity'),
+    pytest.param(Decimal(columnar_basket.MAX_PRICE_IN_CENTS + 1).scaleb(-2), id='too big for 64 bits'),
+])
+def test_add_article_raises_error_if_price_can_not_be_stored_as_integer_cents(price):
+    error_cls = columnar_basket.ColumnarBasketError.UnsupportedPrice
+    with pytest.raises(error_cls, match=f'unit price can\'t be stored as integer cents: {price}'):
+        columnar_basket.ColumnarBasket().add_article(make_article(unit_price_before_taxes=price))
+
+
+def test_list_articles_shares_products():
+    articles = [make_article(unit_price_before_taxes=Decimal(i)) for i in range(3)]
+    products = {id(a.product) for a in columnar_basket.create(articles).list_articles()}
+    assert 1 == len(products)
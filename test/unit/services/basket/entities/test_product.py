@@ -16,3 +16,22 @@ def test_product_name_must_be_a_non_blank_string(name):
     error_msg = f'invalid product name: {name}'
     with pytest.raises(error_cls, match=error_msg):
         product.create(name=name, category='dummy')
+
+
+@pytest.mark.parametrize('other, expected', [
+    pytest.param(product.Product(name='dummy', category='dummy'), True, id='equal product'),
+    pytest.param(product.Product(name='other', category='dummy'), False, id='different name'),
+    pytest.param(product.Product(name='dummy', category=None), False, id='different category'),
+    pytest.param(('dummy', 'dummy'), False, id='tuple'),
+])
+def test_products_are_equal_if_name_and_category_are_equal(other, expected):
+    dummy = product.Product(name='dummy', category='dummy')
+    assert expected == (dummy == other)
+    assert expected != (dummy != other)
+    if expected:
+        assert hash(dummy) == hash(other)
+
+
+def test_product_is_equal_to_itself():
+    dummy = product.Product(name='dummy', category='dummy')
+    assert dummy == dummy
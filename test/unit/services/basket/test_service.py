@@ -15,7 +15,7 @@ def make_dependencies_fixture():
     def build():
         return {
             'logger': Mock(spec=BasketServiceDependency.Logger),
-            'product_repository': Mock(spec=BasketServiceDependency.ProductRepository),
+            'product_repository': Mock(spec=BasketServiceDependency.BulkProductRepository),
         }
     return build
 
@@ -32,7 +32,40 @@ def test_create_basket_returns_basket(case, make_dependencies_fixture):
     def get_product_by_name(name):
         return products[name]
 
+    def get_products_by_name(names):
+        return {name: products[name] for name in names}
+
     service = create_basket_service(**make_dependencies_fixture())
     service.product_repository.get_by_name.side_effect = get_product_by_name
+    service.product_repository.get_many_by_name.side_effect = get_products_by_name
+
+    assert case.expected == service.create_basket(purchased_items=case.input.purchased_items)
+    assert not service.product_repository.get_by_name.called
+
+
+@create_basket_test_cases
+def test_create_basket_looks_up_products_one_by_one_if_repository_does_not_support_bulk_lookup(case, make_dependencies_fixture):
+    products = {product.name: product for product in case.input.products}
+
+    class ProductRepository:
+        def get_by_name(self, name):
+            return products[name]
+
+    dependencies = {**make_dependencies_fixture(), 'product_repository': ProductRepository()}
+    service = create_basket_service(**dependencies)
+
+    assert case.expected == service.create_basket(purchased_items=case.input.purchased_items)
+
+
+@create_basket_test_cases
+def test_create_basket_looks_up_products_one_by_one_if_repository_protocol_does_not_support_bulk_lookup(case, make_dependencies_fixture):
+    products = {product.name: product for product in case.input.products}
+
+    class ProductRepository(BasketServiceDependency.ProductRepository):
+        def get_by_name(self, name):
+            return products[name]
+
+    dependencies = {**make_dependencies_fixture(), 'product_repository': ProductRepository()}
+    service = create_basket_service(**dependencies)
 
     assert case.expected == service.create_basket(purchased_items=case.input.purchased_items)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import List
-from unittest.mock import Mock
+from unittest.mock import call, Mock
 
 import pytest
 
@@ -119,7 +119,7 @@ create_basket_test_cases = pytest.mark.parametrize(
 
 @pytest.fixture
 def log():
-    def noop(msg: str):
+    def noop(msg: str, *args):
         pass
     return Mock(wraps=noop)
 
@@ -151,3 +151,68 @@ def test_use_cases_return_list_of_articles_in_basket(case, make_env_fixture):
     run = CreateBasketUseCase(purchased_items=case.input.purchased_items)
     env = make_env_fixture(case.input)
     assert case.expected == run(env)
+
+
+@pytest.fixture
+def make_get_products_fixture():
+    def build(input: CreateBasketTestCase.TestCaseInput):
+        db = {product.name: product for product in input.products}
+        def get_products(names):
+            return {name: db[name] for name in names}
+        return Mock(side_effect=get_products)
+    return build
+
+
+@create_basket_test_cases
+def test_use_case_with_bulk_lookup_returns_list_of_articles_in_basket(case, make_env_fixture, make_get_products_fixture):
+    run = CreateBasketUseCase(purchased_items=iter(case.input.purchased_items))
+    env = make_env_fixture(case.input, get_products_by_name=make_get_products_fixture(case.input))
+    assert case.expected == run(env)
+    assert not env.get_product_by_name.called
+
+
+def test_use_case_looks_up_distinct_product_names_once_per_batch(make_env_fixture, make_get_products_fixture):
+    input = CreateBasketTestCase.TestCaseInput(
+        purchased_items=[
+            PurchasedItem(product_name='A', unit_price=Decimal('1'), quantity=1, imported=False),
+            PurchasedItem(product_name='B', unit_price=Decimal('1'), quantity=1, imported=False),
+            PurchasedItem(product_name='A', unit_price=Decimal('2'), quantity=1, imported=False),
+            PurchasedItem(product_name='C', unit_price=Decimal('1'), quantity=1, imported=False),
+            PurchasedItem(product_name='B', unit_price=Decimal('1'), quantity=1, imported=True),
+            PurchasedItem(product_name='A', unit_price=Decimal('1'), quantity=1, imported=False),
+        ],
+        products=[
+            Product(name='A', category='cat-a'),
+            Product(name='B', category='cat-b'),
+            Product(name='C', category='cat-c'),
+        ],
+    )
+    run = CreateBasketUseCase(purchased_items=input.purchased_items, lookup_batch_size=3)
+    env = make_env_fixture(input, get_products_by_name=make_get_products_fixture(input))
+    run(env)
+    assert [call(names=['A', 'B']), call(names=['C'])] == env.get_products_by_name.call_args_list
+
+
+def test_use_case_with_bulk_lookup_falls_back_to_single_lookup_for_missing_products(make_env_fixture):
+    input = CreateBasketTestCase.TestCaseInput(
+        purchased_items=[
+            PurchasedItem(product_name='A', unit_price=Decimal('1'), quantity=1, imported=False),
+        ],
+        products=[Product(name='A', category='cat-a')],
+    )
+    run = CreateBasketUseCase(purchased_items=input.purchased_items)
+    env = make_env_fixture(input, get_products_by_name=Mock(return_value={}))
+    expected = [
+        article.create(product_name='A', product_category='cat-a', unit_price_before_taxes=Decimal('1'), quantity=1, imported=False),
+    ]
+    assert expected == run(env)
+    assert [call(name='A')] == env.get_product_by_name.call_args_list
+
+
+@create_basket_test_cases
+def test_use_case_defers_formatting_of_debug_messages(case, make_env_fixture):
+    run = CreateBasketUseCase(purchased_items=case.input.purchased_items)
+    env = make_env_fixture(case.input)
+    run(env)
+    messages = [c.args[0] for c in env.debug.call_args_list]
+    assert not any(repr(item) in m for item in case.input.purchased_items for m in messages)
@@ -9,6 +9,7 @@ from taxes.services.receipt.entities.receipt import (
     describe,
     empty as create_empty_receipt,
     Receipt,
+    ReceiptBuilder,
     ReceiptItem,
 )
 from taxes.services.receipt.entities.taxed_article import TaxedArticle
@@ -377,3 +378,40 @@ ADD_TO_RECEIPT_TEST_CASES = {
 def test_add_to_receipt_returns_receipt_with_added_item(case):
     receipt = add_to_receipt(taxed_article=case.input.to_add, receipt=case.input.receipt)
     assert case.expected == receipt
+
+
+@pytest.mark.parametrize('case', [
+    pytest.param(case, id=id) for id, case in ADD_TO_RECEIPT_TEST_CASES.items()
+])
+def test_builder_add_returns_added_item(case):
+    builder = ReceiptBuilder.from_receipt(case.input.receipt)
+    item = builder.add(case.input.to_add)
+    assert case.expected.items[-1] == item
+
+
+@pytest.mark.parametrize('case', [
+    pytest.param(case, id=id) for id, case in ADD_TO_RECEIPT_TEST_CASES.items()
+])
+def test_builder_builds_receipt_with_added_item(case):
+    builder = ReceiptBuilder.from_receipt(case.input.receipt)
+    builder.add(case.input.to_add)
+    assert case.expected == builder.build()
+
+
+def test_builder_builds_empty_receipt_if_no_articles_are_added():
+    assert create_empty_receipt() == ReceiptBuilder().build()
+
+
+def test_builder_does_not_modify_receipt_it_was_created_from():
+    initial_receipt = create_empty_receipt()
+    builder = ReceiptBuilder.from_receipt(initial_receipt)
+    builder.add(
+        TaxedArticle(
+            product=Product(name='a', category='dummy'),
+            imported=False,
+            quantity=1,
+            unit_price_before_taxes=Decimal('1'),
+            tax_amount_due_per_unit=Decimal('0.1'),
+        )
+    )
+    assert create_empty_receipt() == initial_receipt
@@ -41,3 +41,25 @@ def test_create_receipt_returns_receipt(case, make_dependencies_fixture):
 
     articles = [i.article for i in case.input]
     assert case.expected == service.create_receipt(articles=articles)
+
+
+@create_receipt_test_cases
+def test_stream_receipt_writes_items_and_returns_totals(case, make_dependencies_fixture):
+    service = create_receipt_service(**make_dependencies_fixture())
+    service.tax_service.iter_taxes.return_value = iter([
+        TaxedArticle(
+            product=i.article.product,
+            quantity=i.article.quantity,
+            imported=i.article.imported,
+            unit_price_before_taxes=i.article.unit_price_before_taxes,
+            tax_amount_due_per_unit=i.tax_amount_due_per_unit,
+        ) for i in case.input
+    ])
+
+    written = []
+    articles = [i.article for i in case.input]
+    totals = service.stream_receipt(articles=articles, write_item=written.append)
+
+    assert case.expected.items == written
+    assert case.expected.taxes_due == totals.taxes_due
+    assert case.expected.total_due == totals.total_due
@@ -8,7 +8,10 @@ import pytest
 from taxes.services.basket.entities import article
 from taxes.services.receipt.entities import receipt
 from taxes.services.receipt.entities.taxed_article import TaxedArticle
-from taxes.services.receipt.use_cases import CreateReceiptUseCase
+from taxes.services.receipt.use_cases import (
+    CreateReceiptUseCase,
+    StreamReceiptUseCase,
+)
 
 
 @dataclass
@@ -242,7 +245,7 @@ create_receipt_test_cases = pytest.mark.parametrize(
 
 @pytest.fixture
 def log():
-    def noop(msg: str):
+    def noop(msg: str, *args):
         pass
     return Mock(wraps=noop)
 
@@ -289,3 +292,45 @@ def test_use_case_calls_add_taxes_with_articles(case, make_env_fixture):
     env = make_env_fixture(case.input)
     run(env)
     assert [call(articles)] == env.add_taxes.call_args_list
+
+
+@create_receipt_test_cases
+def test_stream_use_case_writes_receipt_items(case, make_add_taxes_fixture, log):
+    articles = [i.article for i in case.input]
+    written = []
+    run = StreamReceiptUseCase(articles=articles)
+    env = StreamReceiptUseCase.Environment(
+        info=log,
+        debug=log,
+        iter_taxes=make_add_taxes_fixture(case.input),
+        write_item=written.append,
+    )
+    run(env)
+    assert case.expected.items == written
+
+
+@create_receipt_test_cases
+def test_stream_use_case_returns_receipt_totals(case, make_add_taxes_fixture, log):
+    articles = [i.article for i in case.input]
+    run = StreamReceiptUseCase(articles=articles)
+    env = StreamReceiptUseCase.Environment(
+        info=log,
+        debug=log,
+        iter_taxes=make_add_taxes_fixture(case.input),
+        write_item=Mock(),
+    )
+    expected = receipt.ReceiptTotals(
+        taxes_due=case.expected.taxes_due,
+        total_due=case.expected.total_due,
+    )
+    assert expected == run(env)
+
+
+@create_receipt_test_cases
+def test_use_case_defers_formatting_of_debug_messages(case, make_env_fixture):
+    articles = [i.article for i in case.input]
+    run = CreateReceiptUseCase(articles=articles)
+    env = make_env_fixture(case.input)
+    run(env)
+    messages = [c.args[0] for c in env.debug.call_args_list]
+    assert not any('TaxedArticle(' in m for m in messages)
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import List
+from typing import Tuple
 
 import pytest
 
@@ -11,7 +11,7 @@ from taxes.services.tax.entities import applicable_taxes, tax
 @dataclass
 class GetApplicableTaxesTestCase:
     input: article.Article
-    expected: List[tax.Tax]
+    expected: Tuple[tax.Tax, ...]
 
 
 GET_APPLICABLE_TAXES_TEST_CASES = {
@@ -22,7 +22,7 @@ GET_APPLICABLE_TAXES_TEST_CASES = {
             quantity=1,
             unit_price_before_taxes=Decimal('1'),
         ),
-        expected={applicable_taxes.TAX_PRODUCT_CATEGORY},
+        expected=(applicable_taxes.TAX_PRODUCT_CATEGORY,),
     ),
     'uncategorized non imported article': GetApplicableTaxesTestCase(
         input=article.Article(
@@ -31,7 +31,7 @@ GET_APPLICABLE_TAXES_TEST_CASES = {
             quantity=1,
             unit_price_before_taxes=Decimal('1'),
         ),
-        expected={applicable_taxes.TAX_PRODUCT_CATEGORY},
+        expected=(applicable_taxes.TAX_PRODUCT_CATEGORY,),
     ),
     'non imported food article': GetApplicableTaxesTestCase(
         input=article.Article(
@@ -40,7 +40,7 @@ GET_APPLICABLE_TAXES_TEST_CASES = {
             quantity=1,
             unit_price_before_taxes=Decimal('1'),
         ),
-        expected=set(),
+        expected=(),
     ),
     'non imported medical article': GetApplicableTaxesTestCase(
         input=article.Article(
@@ -49,7 +49,7 @@ GET_APPLICABLE_TAXES_TEST_CASES = {
             quantity=1,
             unit_price_before_taxes=Decimal('1'),
         ),
-        expected=set(),
+        expected=(),
     ),
     'non imported book article': GetApplicableTaxesTestCase(
         input=article.Article(
@@ -58,7 +58,7 @@ GET_APPLICABLE_TAXES_TEST_CASES = {
             quantity=1,
             unit_price_before_taxes=Decimal('1'),
         ),
-        expected=set(),
+        expected=(),
     ),
     'imported article of non-exempt category': GetApplicableTaxesTestCase(
         input=article.Article(
@@ -67,7 +67,7 @@ GET_APPLICABLE_TAXES_TEST_CASES = {
             quantity=1,
             unit_price_before_taxes=Decimal('1'),
         ),
-        expected={applicable_taxes.TAX_PRODUCT_CATEGORY, applicable_taxes.TAX_IMPORT},
+        expected=(applicable_taxes.TAX_PRODUCT_CATEGORY, applicable_taxes.TAX_IMPORT),
     ),
     'uncategorized imported article': GetApplicableTaxesTestCase(
         input=article.Article(
@@ -76,7 +76,7 @@ GET_APPLICABLE_TAXES_TEST_CASES = {
             quantity=1,
             unit_price_before_taxes=Decimal('1'),
         ),
-        expected={applicable_taxes.TAX_PRODUCT_CATEGORY, applicable_taxes.TAX_IMPORT},
+        expected=(applicable_taxes.TAX_PRODUCT_CATEGORY, applicable_taxes.TAX_IMPORT),
     ),
     'imported food article': GetApplicableTaxesTestCase(
         input=article.Article(
@@ -85,7 +85,7 @@ GET_APPLICABLE_TAXES_TEST_CASES = {
             quantity=1,
             unit_price_before_taxes=Decimal('1'),
         ),
-        expected={applicable_taxes.TAX_IMPORT},
+        expected=(applicable_taxes.TAX_IMPORT,),
     ),
     'imported medical article': GetApplicableTaxesTestCase(
         input=article.Article(
@@ -94,7 +94,7 @@ GET_APPLICABLE_TAXES_TEST_CASES = {
             quantity=1,
             unit_price_before_taxes=Decimal('1'),
         ),
-        expected={applicable_taxes.TAX_IMPORT},
+        expected=(applicable_taxes.TAX_IMPORT,),
     ),
     'imported book article': GetApplicableTaxesTestCase(
         input=article.Article(
@@ -103,7 +103,7 @@ GET_APPLICABLE_TAXES_TEST_CASES = {
             quantity=1,
             unit_price_before_taxes=Decimal('1'),
         ),
-        expected={applicable_taxes.TAX_IMPORT},
+        expected=(applicable_taxes.TAX_IMPORT,),
     ),
 }
 
@@ -113,3 +113,17 @@ GET_APPLICABLE_TAXES_TEST_CASES = {
 ])
 def test_get_applicable_taxes(case):
     assert case.expected == applicable_taxes.get_applicable_taxes(case.input)
+
+
+def test_compile_tax_table():
+    category_tax = tax.Tax(id='category', rate=Decimal('0.2'))
+    import_tax = tax.Tax(id='import', rate=Decimal('0.1'))
+    table = applicable_taxes.compile_tax_table(
+        exempt_categories=['food'],
+        category_tax=category_tax,
+        import_tax=import_tax,
+    )
+    assert (category_tax,) == table.get_taxes(category='book', imported=False)
+    assert (category_tax, import_tax) == table.get_taxes(category=None, imported=True)
+    assert () == table.get_taxes(category='food', imported=False)
+    assert (import_tax,) == table.get_taxes(category='food', imported=True)
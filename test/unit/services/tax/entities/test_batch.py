@@ -0,0 +1,126 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from taxes.services.basket.entities import article, columnar_basket, product
+from taxes.services.tax.entities import applicable_taxes, batch, tax
+
+
+def make_random_articles(seed, count):
+    rng = random.Random(seed)
+    categories = [None, 'food', 'book', 'medical', 'dummy', 'other']
+    return [
+        article.Article(
+            product=product.Product(name=f'item-{i}', category=rng.choice(categories)),
+            imported=rng.random() < 0.5,
+            quantity=rng.randrange(1, 10),
+            unit_price_before_taxes=Decimal(rng.randrange(0, 10 ** 6)).scaleb(-rng.randrange(0, 3)),
+        )
+        for i in range(count)
+    ]
+
+
+def test_create_returns_columns_of_articles():
+    articles = [
+        article.Article(product=product.Product(name='a', category='food'), imported=True, quantity=1, unit_price_before_taxes=Decimal('1.5')),
+        article.Article(product=product.Product(name='b', category=None), imported=False, quantity=2, unit_price_before_taxes=Decimal('2')),
+        article.Article(product=product.Product(name='c', category='food'), imported=False, quantity=3, unit_price_before_taxes=Decimal('0.01')),
+    ]
+    articles_batch = batch.create(articles)
+
+    assert [150, 200, 1] == list(articles_batch.prices_in_cents)
+    assert [True, False, False] == [bool(i) for i in articles_batch.imported]
+    assert ['food', None, 'food'] == [articles_batch.categories[c] for c in articles_batch.category_codes]
+    assert 3 == len(articles_batch)
+
+
+def test_create_returns_none_if_a_price_has_fractions_of_cents():
+    articles = [
+        article.Article(product=product.Product(name='a', category='food'), imported=True, quantity=1, unit_price_before_taxes=Decimal('1.5')),
+        article.Article(product=product.Product(name='b', category='food'), imported=True, quantity=1, unit_price_before_taxes=Decimal('1.505')),
+    ]
+    assert batch.create(articles) is None
+
+
+
+@pytest.mark.parametrize('price', [
+    pytest.param(Decimal(batch.MAX_PRICE_IN_CENTS + 1).scaleb(-2), id='too big'),
+    pytest.param(Decimal(batch.MIN_PRICE_IN_CENTS - 1).scaleb(-2), id='too small'),
+    pytest.param(Decimal('100000000000000000'), id='kata-style huge price'),
+])
+def test_create_returns_none_if_a_price_does_not_fit_in_64_bits(price):
+    articles = [
+        article.Article(product=product.Product(name='a', category='food'), imported=True, quantity=1, unit_price_before_taxes=Decimal('1.5')),
+        article.Article(product=product.Product(name='b', category='food'), imported=True, quantity=1, unit_price_before_taxes=price),
+    ]
+    assert batch.create(articles) is None
+
+
+def test_create_accepts_prices_at_bounds_of_64_bits():
+    prices = [batch.MIN_PRICE_IN_CENTS, batch.MAX_PRICE_IN_CENTS]
+    articles = [
+        article.Article(product=product.Product(name=str(i), category=None), imported=False, quantity=1, unit_price_before_taxes=Decimal(price).scaleb(-2))
+        for i, price in enumerate(prices)
+    ]
+    assert prices == list(batch.create(articles).prices_in_cents)
+
+def test_calculate_tax_amounts_of_empty_batch_returns_empty_list():
+    assert [] == batch.calculate_tax_amounts_in_cents(batch.create([]))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_calculate_tax_amounts_is_equivalent_to_apply(seed):
+    articles = make_random_articles(seed=seed, count=200)
+    expected = [
+        tax.apply(
+            price=a.unit_price_before_taxes,
+            taxes=applicable_taxes.get_applicable_taxes(a),
+        ) for a in articles
+    ]
+
+    amounts = batch.calculate_tax_amounts_in_cents(batch.create(articles))
+
+    actual = [tax.from_cents(amount) for amount in amounts]
+    assert expected == actual
+    assert [e.as_tuple() for e in expected] == [a.as_tuple() for a in actual]
+
+
+def test_calculate_tax_amounts_uses_rates_and_rounding_increment_of_table():
+    table = applicable_taxes.compile_tax_table(
+        exempt_categories=[],
+        category_tax=tax.Tax(id='category', rate=Decimal('0.2')),
+        import_tax=tax.Tax(id='import', rate=Decimal('0.1')),
+        rounding_increment=Decimal('0.01'),
+    )
+    articles = [
+        article.Article(product=product.Product(name='a', category='food'), imported=True, quantity=1, unit_price_before_taxes=Decimal('1.01')),
+    ]
+    assert [21 + 11] == batch.calculate_tax_amounts_in_cents(batch.create(articles), table)
+
+
+def test_calculate_tax_amounts_returns_none_if_rounding_increment_has_fractions_of_cents():
+    table = applicable_taxes.compile_tax_table(
+        exempt_categories=[],
+        category_tax=applicable_taxes.TAX_PRODUCT_CATEGORY,
+        import_tax=applicable_taxes.TAX_IMPORT,
+        rounding_increment=Decimal('0.005'),
+    )
+    articles = [
+        article.Article(product=product.Product(name='a', category='food'), imported=True, quantity=1, unit_price_before_taxes=Decimal('1.01')),
+    ]
+    assert batch.calculate_tax_amounts_in_cents(batch.create(articles), table) is None
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_from_columnar_basket_is_equivalent_to_create(seed):
+    articles = make_random_articles(seed=seed, count=200)
+    basket = columnar_basket.create(articles)
+
+    expected = batch.create(basket.list_articles())
+    actual = batch.from_columnar_basket(basket)
+
+    assert list(expected.prices_in_cents) == list(actual.prices_in_cents)
+    assert list(expected.imported) == list(actual.imported)
+    assert [expected.categories[c] for c in expected.category_codes] == [actual.categories[c] for c in actual.category_codes]
+    assert batch.calculate_tax_amounts_in_cents(expected) == batch.calculate_tax_amounts_in_cents(actual)
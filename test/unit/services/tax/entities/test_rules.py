@@ -0,0 +1,93 @@
+import io
+from decimal import Decimal
+
+import pytest
+
+from taxes.services.tax.entities.applicable_taxes import TAX_TABLE
+from taxes.services.tax.entities.rules import (
+    compile_rules,
+    load,
+    TaxRulesError,
+)
+from taxes.services.tax.entities.tax import Tax
+
+
+@pytest.fixture
+def make_rules():
+    def build(**overrides):
+        return {
+            'version': 1,
+            'rounding_increment': '0.05',
+            'exempt_categories': ['book', 'food', 'medical'],
+            'rates': {'non-exempt-category': '0.1', 'import': '0.05'},
+            **overrides,
+        }
+    return build
+
+
+def test_compile_rules_returns_tax_table(make_rules):
+    assert TAX_TABLE == compile_rules(make_rules())
+
+
+def test_compile_rules_uses_rates_and_rounding_increment(make_rules):
+    table = compile_rules(make_rules(
+        rounding_increment='0.01',
+        exempt_categories=['food'],
+        rates={'non-exempt-category': '0.2', 'import': 1},
+    ))
+    assert Decimal('0.01') == table.rounding_increment
+    assert () == table.get_taxes(category='food', imported=False)
+    assert (
+        Tax(id='non-exempt-category', rate=Decimal('0.2')),
+        Tax(id='import', rate=Decimal('1')),
+    ) == table.get_taxes(category='book', imported=True)
+
+
+@pytest.mark.parametrize('version', [
+    pytest.param(None, id='missing'),
+    pytest.param(2, id='unknown'),
+    pytest.param('1', id='string'),
+    pytest.param(True, id='boolean'),
+])
+def test_compile_rules_raises_error_if_version_is_not_supported(make_rules, version):
+    with pytest.raises(TaxRulesError.UnsupportedVersion, match=f'unsupported tax rules version: {version}'):
+        compile_rules(make_rules(version=version))
+
+
+@pytest.mark.parametrize('overrides, reason', [
+    pytest.param({'rounding_increment': None}, 'rounding_increment must be a decimal number', id='missing increment'),
+    pytest.param({'rounding_increment': 'five'}, 'rounding_increment must be a decimal number', id='invalid increment'),
+    pytest.param({'rounding_increment': 'NaN'}, 'rounding_increment must be finite', id='not finite increment'),
+    pytest.param({'rounding_increment': '0'}, 'rounding_increment must be positive: 0', id='zero increment'),
+    pytest.param({'exempt_categories': 'food'}, 'exempt_categories must be a list of strings', id='categories not a list'),
+    pytest.param({'exempt_categories': ['food', None]}, 'exempt_categories must be a list of strings', id='category not a string'),
+    pytest.param({'rates': None}, 'rates must be an object', id='missing rates'),
+    pytest.param({'rates': {'import': '0.05'}}, 'rates must be given for', id='missing rate'),
+    pytest.param({'rates': {'non-exempt-category': '0.1', 'import': '0.05', 'vat': '0.2'}}, 'rates must be given for', id='unknown rate'),
+    pytest.param({'rates': {'non-exempt-category': '0.1', 'import': True}}, 'rates.import must be a decimal number', id='boolean rate'),
+    pytest.param({'rates': {'non-exempt-category': '-0.1', 'import': '0.05'}}, 'rate must be positive: -0.1', id='negative rate'),
+])
+def test_compile_rules_raises_error_if_rules_are_invalid(make_rules, overrides, reason):
+    with pytest.raises(TaxRulesError.InvalidRules, match=f'invalid tax rules: {reason}'):
+        compile_rules(make_rules(**overrides))
+
+
+def test_load_reads_decimal_numbers_exactly():
+    f = io.StringIO('''{
+        "version": 1,
+        "rounding_increment": 0.05,
+        "exempt_categories": [],
+        "rates": {"non-exempt-category": 0.1, "import": 0.05}
+    }''')
+    table = load(f)
+    assert Decimal('0.05') == table.rounding_increment
+    assert (Tax(id='import', rate=Decimal('0.05')),) == table.get_taxes(category='food', imported=True)[1:]
+
+
+@pytest.mark.parametrize('content', [
+    pytest.param('{"version": 1,', id='malformed json'),
+    pytest.param('[]', id='not an object'),
+])
+def test_load_raises_error_if_rules_are_not_an_object(content):
+    with pytest.raises(TaxRulesError.InvalidRules):
+        load(io.StringIO(content))
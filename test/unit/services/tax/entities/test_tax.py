@@ -1,13 +1,21 @@
+import random
 from decimal import Decimal
 
 import pytest
 
 from taxes.services.tax.entities.tax import (
     apply as apply_taxes,
+    apply_fixed_point,
+    apply_in_cents,
     calculate_tax_amount,
+    calculate_tax_amount_in_cents,
     create as create_tax,
+    from_cents,
+    get_backend,
     Tax,
     TaxError,
+    to_basis_points,
+    to_cents,
 )
 
 
@@ -145,3 +153,115 @@ def test_apply_returns_amount_due_to_application_of_taxes_to_price(case, make_ta
     price = case['price']
     expected = case['expected']
     assert expected == apply_taxes(price=price, taxes=taxes)
+
+
+@pytest.mark.parametrize('increment, expected', [
+    pytest.param(Decimal('0.01'), Decimal('1.24'), id='0.01'),
+    pytest.param(Decimal('0.1'), Decimal('1.30'), id='0.1'),
+    pytest.param(Decimal('1'), Decimal('2.00'), id='1'),
+    pytest.param(Decimal('0.001'), Decimal('1.235'), id='fraction of cent'),
+])
+def test_apply_rounds_amount_up_to_increment(increment, expected, make_tax_kwargs):
+    taxes = [create_tax(**make_tax_kwargs(rate=Decimal('0.1')))]
+    assert expected == apply_taxes(price=Decimal('12.35'), taxes=taxes, increment=increment)
+
+
+@pytest.mark.parametrize('amount, expected', [
+    pytest.param(Decimal('0'), 0, id='zero'),
+    pytest.param(Decimal('12.49'), 1249, id='two decimal digits'),
+    pytest.param(Decimal('12.4'), 1240, id='single decimal digit'),
+    pytest.param(Decimal('12.490'), 1249, id='trailing zeros'),
+    pytest.param(Decimal('12'), 1200, id='integer'),
+    pytest.param(Decimal('12.491'), None, id='fraction of cent'),
+])
+def test_to_cents_returns_exact_amount_in_cents(amount, expected):
+    assert expected == to_cents(amount)
+
+
+@pytest.mark.parametrize('rate, expected', [
+    pytest.param(Decimal('0.1'), 1000, id='10%'),
+    pytest.param(Decimal('0.025'), 250, id='2.5%'),
+    pytest.param(Decimal('1'), 10000, id='100%'),
+    pytest.param(Decimal('0.00001'), None, id='fraction of basis point'),
+])
+def test_to_basis_points_returns_exact_rate_in_basis_points(rate, expected):
+    assert expected == to_basis_points(rate)
+
+
+def test_from_cents_returns_amount_with_two_decimal_digits():
+    assert ('12.49', '0.00') == (str(from_cents(1249)), str(from_cents(0)))
+
+
+@pytest.mark.parametrize('price_in_cents, rate_in_basis_points, expected', [
+    pytest.param(0, 500, 0, id='price = 0 results in amount = 0'),
+    pytest.param(1000, 1000, 100, id='amount = price * rate (integer amount)'),
+    pytest.param(1000, 250, 25, id='amount = price * rate (decimal amount)'),
+    pytest.param(1499, 1000, 150, id='amount rounded up to nearest 0.05 (1.499 -> 1.5)'),
+    pytest.param(105, 10000, 105, id='amount rounded up to nearest 0.05 (1.05 -> 1.05)'),
+    pytest.param(106, 10000, 110, id='amount rounded up to nearest 0.05 (1.06 -> 1.1)'),
+])
+def test_calculate_tax_amount_in_cents(price_in_cents, rate_in_basis_points, expected):
+    assert expected == calculate_tax_amount_in_cents(price_in_cents, rate_in_basis_points)
+
+
+def test_calculate_tax_amount_in_cents_rounds_amount_up_to_increment():
+    assert 124 == calculate_tax_amount_in_cents(1235, 1000, increment_in_cents=1)
+    assert 200 == calculate_tax_amount_in_cents(1235, 1000, increment_in_cents=100)
+
+
+def test_apply_in_cents_returns_sum_of_rounded_amounts():
+    assert 10 + 20 == apply_in_cents(200, [500, 1000])
+
+
+def test_apply_in_cents_without_taxes_returns_zero():
+    assert 0 == apply_in_cents(200, [])
+
+
+def make_random_apply_cases(seed, count):
+    rng = random.Random(seed)
+    rates = ['0.05', '0.1', '0.025', '0.2', '1', '0.0001', '0.00005']
+    prices = [
+        lambda: Decimal(rng.randrange(0, 10 ** 7)).scaleb(-2),
+        lambda: Decimal(rng.randrange(0, 10 ** 3)).scaleb(-rng.randrange(0, 3)),
+        lambda: Decimal(rng.randrange(0, 10 ** 6)).scaleb(-4),
+    ]
+    return [
+        pytest.param(
+            rng.choice(prices)(),
+            [Decimal(r) for r in rng.sample(rates, rng.randrange(0, 3))],
+            id=f'random case {i}',
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize('price, rates', make_random_apply_cases(seed=42, count=500))
+def test_apply_fixed_point_is_equivalent_to_apply(price, rates, make_tax_kwargs):
+    taxes = [create_tax(**make_tax_kwargs(rate=rate)) for rate in rates]
+    expected = apply_taxes(price=price, taxes=taxes)
+    actual = apply_fixed_point(price=price, taxes=taxes)
+    assert expected == actual
+    assert expected.as_tuple() == actual.as_tuple()
+
+
+@pytest.mark.parametrize('increment', ['0.01', '0.1', '1', '0.005'])
+@pytest.mark.parametrize('price, rates', make_random_apply_cases(seed=7, count=50))
+def test_apply_fixed_point_with_increment_is_equivalent_to_apply(price, rates, increment, make_tax_kwargs):
+    taxes = [create_tax(**make_tax_kwargs(rate=rate)) for rate in rates]
+    expected = apply_taxes(price=price, taxes=taxes, increment=Decimal(increment))
+    actual = apply_fixed_point(price=price, taxes=taxes, increment=Decimal(increment))
+    assert expected == actual
+    assert expected.as_tuple() == actual.as_tuple()
+
+
+@pytest.mark.parametrize('name, expected', [
+    pytest.param('decimal', apply_taxes, id='decimal'),
+    pytest.param('fixed-point', apply_fixed_point, id='fixed-point'),
+])
+def test_get_backend_returns_apply_implementation(name, expected):
+    assert expected is get_backend(name)
+
+
+def test_get_backend_raises_error_if_backend_is_unknown():
+    with pytest.raises(TaxError.UnknownBackend, match='unknown tax backend: dummy'):
+        get_backend('dummy')
@@ -0,0 +1,108 @@
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+
+from taxes.services.basket.entities import article, product
+from taxes.services.tax.cache import (
+    CacheInfo,
+    create as create_cache,
+    no_cache,
+    TaxAmountCacheError,
+)
+
+
+@pytest.fixture
+def make_article_fixture():
+    def build(**overrides):
+        return article.Article(**{
+            'product': product.Product(name='item', category='dummy'),
+            'imported': False,
+            'quantity': 1,
+            'unit_price_before_taxes': Decimal('1'),
+            **overrides,
+        })
+    return build
+
+
+@pytest.mark.parametrize('maxsize', [
+    pytest.param(0, id='size = 0'),
+    pytest.param(-1, id='size < 0'),
+])
+def test_create_raises_error_if_size_is_not_positive(maxsize):
+    expected_error_msg = f'cache size must be positive: {maxsize}'
+    with pytest.raises(TaxAmountCacheError.NonPositiveSize, match=expected_error_msg):
+        create_cache(maxsize)
+
+
+def test_no_cache_always_calculates_amount(make_article_fixture):
+    calculate = Mock(return_value=Decimal('0.1'))
+    test_article = make_article_fixture()
+
+    assert Decimal('0.1') == no_cache(test_article, calculate)
+    assert Decimal('0.1') == no_cache(test_article, calculate)
+    assert 2 == calculate.call_count
+
+
+def test_cache_returns_calculated_amount(make_article_fixture):
+    cache = create_cache(2)
+    calculate = Mock(return_value=Decimal('0.1'))
+    assert Decimal('0.1') == cache(make_article_fixture(), calculate)
+
+
+def test_cache_calculates_amount_once_per_key(make_article_fixture):
+    cache = create_cache(2)
+    calculate = Mock(return_value=Decimal('0.1'))
+
+    cache(make_article_fixture(quantity=1), calculate)
+    cache(make_article_fixture(quantity=2), calculate)
+    cache(make_article_fixture(product=product.Product(name='other', category='dummy')), calculate)
+
+    assert 1 == calculate.call_count
+    assert CacheInfo(hits=2, misses=1, evictions=0, maxsize=2, currsize=1) == cache.info()
+
+
+@pytest.mark.parametrize('overrides', [
+    pytest.param({'unit_price_before_taxes': Decimal('2')}, id='different price'),
+    pytest.param({'product': product.Product(name='item', category='food')}, id='different category'),
+    pytest.param({'imported': True}, id='different origin'),
+])
+def test_cache_calculates_amount_for_each_distinct_key(make_article_fixture, overrides):
+    cache = create_cache(2)
+    calculate = Mock(return_value=Decimal('0.1'))
+
+    cache(make_article_fixture(), calculate)
+    cache(make_article_fixture(**overrides), calculate)
+
+    assert 2 == calculate.call_count
+
+
+def test_cache_evicts_least_recently_used_amount(make_article_fixture):
+    cache = create_cache(2)
+    calculate = Mock(return_value=Decimal('0.1'))
+    a = make_article_fixture(unit_price_before_taxes=Decimal('1'))
+    b = make_article_fixture(unit_price_before_taxes=Decimal('2'))
+    c = make_article_fixture(unit_price_before_taxes=Decimal('3'))
+
+    cache(a, calculate)
+    cache(b, calculate)
+    cache(a, calculate)
+    cache(c, calculate)
+    assert 1 == cache.info().evictions
+
+    calculate.reset_mock()
+    cache(a, calculate)
+    assert 0 == calculate.call_count
+    cache(b, calculate)
+    assert 1 == calculate.call_count
+
+
+def test_clear_removes_all_cached_amounts(make_article_fixture):
+    cache = create_cache(2)
+    calculate = Mock(return_value=Decimal('0.1'))
+
+    cache(make_article_fixture(), calculate)
+    cache.clear()
+    cache(make_article_fixture(), calculate)
+
+    assert 2 == calculate.call_count
@@ -0,0 +1,159 @@
+import random
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+
+from taxes.services.basket.entities import article, product
+from taxes.services.tax.entities import applicable_taxes, tax
+from taxes.services.tax import lookup as lookup_module
+from taxes.services.tax.lookup import (
+    build_amounts,
+    CACHE_FILE_HEADER,
+    create as create_lookup,
+    TaxLookupError,
+)
+
+
+def calculate(a):
+    return tax.apply(
+        price=a.unit_price_before_taxes,
+        taxes=applicable_taxes.get_applicable_taxes(a),
+    )
+
+
+@pytest.fixture
+def make_article_fixture():
+    def build(**overrides):
+        return article.Article(**{
+            'product': product.Product(name='item', category='dummy'),
+            'imported': False,
+            'quantity': 1,
+            'unit_price_before_taxes': Decimal('1'),
+            **overrides,
+        })
+    return build
+
+
+@pytest.mark.parametrize('ceiling', [
+    pytest.param(Decimal('0'), id='ceiling = 0'),
+    pytest.param(Decimal('-1'), id='ceiling < 0'),
+])
+def test_create_raises_error_if_ceiling_is_not_positive(ceiling):
+    with pytest.raises(TaxLookupError.NonPositiveCeiling, match=f'lookup ceiling must be positive: {ceiling}'):
+        create_lookup(applicable_taxes.TAX_TABLE, ceiling)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_lookup_is_equivalent_to_apply(seed, make_article_fixture):
+    rng = random.Random(seed)
+    lookup = create_lookup(applicable_taxes.TAX_TABLE, Decimal('20'))
+    articles = [
+        make_article_fixture(
+            product=product.Product(name='item', category=rng.choice(['food', 'book', 'dummy', None])),
+            imported=rng.random() < 0.5,
+            unit_price_before_taxes=Decimal(rng.randrange(1, 2500)).scaleb(-rng.randrange(0, 3)),
+        )
+        for _ in range(300)
+    ]
+    for a in articles:
+        expected = calculate(a)
+        actual = lookup(a, calculate)
+        assert expected == actual
+        assert expected.as_tuple() == actual.as_tuple()
+
+
+def test_lookup_calculates_amount_of_prices_above_ceiling_or_with_fractions_of_cents(make_article_fixture):
+    fallback = Mock(return_value=Decimal('0.1'))
+    lookup = create_lookup(applicable_taxes.TAX_TABLE, Decimal('10'), fallback=fallback)
+    calculate = Mock()
+    above_ceiling = make_article_fixture(unit_price_before_taxes=Decimal('10.01'))
+    fraction_of_cent = make_article_fixture(unit_price_before_taxes=Decimal('1.005'))
+
+    assert Decimal('1.00') == lookup(make_article_fixture(unit_price_before_taxes=Decimal('10.00')), calculate)
+    assert Decimal('0.1') == lookup(above_ceiling, calculate)
+    assert Decimal('0.1') == lookup(fraction_of_cent, calculate)
+    assert [((above_ceiling, calculate),), ((fraction_of_cent, calculate),)] == fallback.call_args_list
+
+
+def test_create_lowers_ceiling_to_max_ceiling(make_article_fixture, monkeypatch):
+    monkeypatch.setattr(lookup_module, 'MAX_CEILING', Decimal('10'))
+    fallback = Mock(return_value=Decimal('0.1'))
+    lookup = create_lookup(applicable_taxes.TAX_TABLE, Decimal('1E+20'), fallback=fallback)
+    calculate = Mock()
+    above_max_ceiling = make_article_fixture(unit_price_before_taxes=Decimal('10.01'))
+
+    assert Decimal('10') == lookup.ceiling
+    assert Decimal('1.00') == lookup(make_article_fixture(unit_price_before_taxes=Decimal('10.00')), calculate)
+    assert Decimal('0.1') == lookup(above_max_ceiling, calculate)
+    assert [((above_max_ceiling, calculate),)] == fallback.call_args_list
+
+
+def test_build_amounts_returns_none_if_amounts_exceed_32_bits():
+    table = applicable_taxes.compile_tax_table(
+        exempt_categories=[],
+        category_tax=tax.Tax(id='huge', rate=Decimal('100000')),
+        import_tax=applicable_taxes.TAX_IMPORT,
+    )
+    assert build_amounts(table, 10) is not None
+    assert build_amounts(table, 100000) is None
+
+def test_lookup_calculates_all_amounts_if_rounding_increment_has_fractions_of_cents(make_article_fixture):
+    table = applicable_taxes.compile_tax_table(
+        exempt_categories=[],
+        category_tax=applicable_taxes.TAX_PRODUCT_CATEGORY,
+        import_tax=applicable_taxes.TAX_IMPORT,
+        rounding_increment=Decimal('0.005'),
+    )
+    fallback = Mock(return_value=Decimal('0.1'))
+    lookup = create_lookup(table, Decimal('10'), fallback=fallback)
+    assert Decimal('0.1') == lookup(make_article_fixture(), Mock())
+    assert 1 == fallback.call_count
+
+
+def test_lookup_stores_amounts_in_cache_file(tmp_path, make_article_fixture):
+    cache_path = tmp_path / 'lookup.bin'
+    ceiling = Decimal('5')
+    lookup = create_lookup(applicable_taxes.TAX_TABLE, ceiling, cache_path=str(cache_path))
+    lookup(make_article_fixture(), calculate)
+    expected = build_amounts(applicable_taxes.TAX_TABLE, 500)
+
+    cached = create_lookup(applicable_taxes.TAX_TABLE, ceiling, cache_path=str(cache_path))
+    cached.load()
+
+    assert expected == lookup.amounts
+    assert expected == cached.amounts
+    assert CACHE_FILE_HEADER.size + 4 * 501 * expected.itemsize == cache_path.stat().st_size
+
+
+@pytest.mark.parametrize('content', [
+    pytest.param(b'', id='empty'),
+    pytest.param(b'not a lookup table' * 10, id='not a lookup table'),
+])
+def test_lookup_rebuilds_amounts_if_cache_file_is_invalid(tmp_path, content):
+    cache_path = tmp_path / 'lookup.bin'
+    cache_path.write_bytes(content)
+    lookup = create_lookup(applicable_taxes.TAX_TABLE, Decimal('5'), cache_path=str(cache_path))
+    lookup.load()
+    assert build_amounts(applicable_taxes.TAX_TABLE, 500) == lookup.amounts
+
+
+def test_lookup_rebuilds_amounts_if_cache_file_cant_be_read(tmp_path):
+    cache_path = tmp_path / 'lookup.bin'
+    cache_path.mkdir()
+    lookup = create_lookup(applicable_taxes.TAX_TABLE, Decimal('5'), cache_path=str(cache_path))
+    lookup.load()
+    assert build_amounts(applicable_taxes.TAX_TABLE, 500) == lookup.amounts
+
+
+def test_lookup_rebuilds_amounts_if_cache_file_has_other_rules(tmp_path):
+    cache_path = tmp_path / 'lookup.bin'
+    create_lookup(applicable_taxes.TAX_TABLE, Decimal('5'), cache_path=str(cache_path)).load()
+    table = applicable_taxes.compile_tax_table(
+        exempt_categories=[],
+        category_tax=applicable_taxes.TAX_PRODUCT_CATEGORY,
+        import_tax=tax.Tax(id='import', rate=Decimal('0.5')),
+    )
+    lookup = create_lookup(table, Decimal('5'), cache_path=str(cache_path))
+    lookup.load()
+    assert build_amounts(table, 500) == lookup.amounts
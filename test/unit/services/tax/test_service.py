@@ -1,3 +1,4 @@
+from decimal import Decimal
 from unittest.mock import Mock, sentinel
 
 import pytest
@@ -7,6 +8,9 @@ from taxes.services.tax.service import (
     Dependency as TaxServiceDependency,
     TaxService,
 )
+from taxes.services.basket.entities import article, product
+from taxes.services.receipt.entities import taxed_article
+from taxes.services.tax.entities import applicable_taxes, tax
 from tax.use_cases.test_add_taxes import add_taxes_test_cases
 
 
@@ -28,3 +32,125 @@ def test_create_returns_service(make_dependencies_fixture):
 def test_add_taxes_returns_taxed_items(case, make_dependencies_fixture):
     service = create_tax_service(**make_dependencies_fixture())
     assert case.expected == service.add_taxes(articles=case.input)
+
+
+@add_taxes_test_cases
+def test_iter_taxes_lazily_returns_taxed_items(case, make_dependencies_fixture):
+    service = create_tax_service(**make_dependencies_fixture())
+    taxed_articles = service.iter_taxes(articles=iter(case.input))
+    assert not isinstance(taxed_articles, list)
+    assert case.expected == list(taxed_articles)
+
+
+@add_taxes_test_cases
+def test_iter_taxes_logs_taxes_added_once_articles_are_consumed(case, make_dependencies_fixture):  # noqa: E501
+    dependencies = make_dependencies_fixture()
+    service = create_tax_service(**dependencies)
+    taxed_articles = service.iter_taxes(articles=iter(case.input))
+    info = dependencies['logger'].info
+    info.assert_called_once_with('adding taxes to articles in basket')
+    list(taxed_articles)
+    info.assert_called_with('taxes added')
+
+
+@add_taxes_test_cases
+def test_add_taxes_with_cache_returns_taxed_items(case, make_dependencies_fixture):
+    service = create_tax_service(**make_dependencies_fixture(), cache_size=1)
+    assert case.expected == service.add_taxes(articles=case.input)
+    assert case.expected == service.add_taxes(articles=case.input)
+
+
+@pytest.mark.parametrize('backend', ['decimal', 'fixed-point'])
+@add_taxes_test_cases
+def test_add_taxes_with_backend_returns_taxed_items(case, backend, make_dependencies_fixture):
+    service = create_tax_service(**make_dependencies_fixture(), backend=backend)
+    assert case.expected == service.add_taxes(articles=case.input)
+
+
+@pytest.mark.parametrize('cache_size', [None, 1])
+@add_taxes_test_cases
+def test_add_taxes_with_lookup_returns_taxed_items(case, cache_size, make_dependencies_fixture):
+    service = create_tax_service(**make_dependencies_fixture(), cache_size=cache_size, lookup_ceiling=Decimal('20'))
+    assert case.expected == service.add_taxes(articles=case.input)
+    assert case.expected == service.add_taxes(articles=case.input)
+
+
+@add_taxes_test_cases
+def test_add_taxes_with_batch_engine_returns_taxed_items(case, make_dependencies_fixture):
+    service = create_tax_service(**make_dependencies_fixture(), batch_threshold=1)
+    assert case.expected == service.add_taxes(articles=case.input)
+
+
+@add_taxes_test_cases
+def test_iter_taxes_with_batch_engine_returns_taxed_items(case, make_dependencies_fixture):
+    service = create_tax_service(**make_dependencies_fixture(), batch_threshold=1)
+    articles = list(case.input)
+    assert case.expected == list(service.iter_taxes(articles=articles))
+
+
+def test_iter_taxes_uses_batch_engine_for_large_collections(make_dependencies_fixture):
+    dependencies = make_dependencies_fixture()
+    service = create_tax_service(**dependencies, batch_threshold=2)
+    articles = [
+        article.Article(product=product.Product(name='test', category=None), quantity=1, unit_price_before_taxes=Decimal(price), imported=False)
+        for price in ('1.00', '2.00')
+    ]
+    list(service.iter_taxes(articles=iter(articles)))
+    list(service.iter_taxes(articles=articles))
+    logged = [c.args[0] for c in dependencies['logger'].info.call_args_list]
+    assert 1 == logged.count('adding taxes to a batch of %s articles')
+
+
+def test_add_taxes_falls_back_to_single_articles_if_batch_is_not_representable(make_dependencies_fixture):
+    service = create_tax_service(**make_dependencies_fixture(), batch_threshold=1)
+    articles = [
+        article.Article(
+            product=product.Product(name='test', category='dummy'),
+            quantity=1,
+            unit_price_before_taxes=Decimal('1.005'),
+            imported=False,
+        ),
+    ]
+    expected = [
+        taxed_article.TaxedArticle(
+            product=product.Product(name='test', category='dummy'),
+            quantity=1,
+            imported=False,
+            unit_price_before_taxes=Decimal('1.005'),
+            tax_amount_due_per_unit=Decimal('0.15'),
+        ),
+    ]
+    assert expected == service.add_taxes(articles=articles)
+
+
+ZERO_RATED_TABLE = applicable_taxes.compile_tax_table(
+    exempt_categories=['dummy'],
+    category_tax=applicable_taxes.TAX_PRODUCT_CATEGORY,
+    import_tax=tax.Tax(id='import', rate=Decimal('0.5')),
+    rounding_increment=Decimal('0.01'),
+)
+
+
+@pytest.mark.parametrize('options', [
+    pytest.param({}, id='single articles'),
+    pytest.param({'batch_threshold': 1}, id='batch engine'),
+    pytest.param({'backend': 'fixed-point'}, id='fixed-point'),
+    pytest.param({'lookup_ceiling': Decimal('10')}, id='lookup'),
+])
+def test_add_taxes_uses_tax_table(options, make_dependencies_fixture):
+    service = create_tax_service(**make_dependencies_fixture(), tax_table=ZERO_RATED_TABLE, **options)
+    articles = [
+        article.Article(product=product.Product(name='test', category='dummy'), quantity=1, unit_price_before_taxes=Decimal('1.01'), imported=True),
+    ]
+    [taxed] = service.add_taxes(articles=articles)
+    assert Decimal('0.51') == taxed.tax_amount_due_per_unit
+
+
+def test_add_taxes_falls_back_to_single_articles_if_price_does_not_fit_in_batch(make_dependencies_fixture):
+    articles = [
+        article.Article(product=product.Product(name='test', category=None), quantity=1, unit_price_before_taxes=Decimal('100000000000000000'), imported=True),
+    ]
+    expected = create_tax_service(**make_dependencies_fixture(), batch_threshold=None).add_taxes(articles=articles)
+    service = create_tax_service(**make_dependencies_fixture(), batch_threshold=1)
+    assert expected == service.add_taxes(articles=articles)
+    assert expected == list(service.iter_taxes(articles=articles))
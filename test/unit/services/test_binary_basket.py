@@ -0,0 +1,96 @@
+import io
+import re
+from decimal import Decimal
+
+import pytest
+
+from taxes.services import binary_basket
+from taxes.services.basket.entities.purchased_item import PurchasedItem
+from taxes.services.parser import ParserError
+
+
+def write(items):
+    output = io.BytesIO()
+    binary_basket.write_items(items, output)
+    return output.getvalue()
+
+
+def record(quantity=1, mantissa=1249, exponent=-2, imported=0, name=b'book'):
+    return binary_basket.RECORD_HEAD.pack(quantity, mantissa, exponent, imported, len(name)) + name  # noqa: E501
+
+
+@pytest.mark.parametrize('item', [
+    pytest.param(PurchasedItem('book', Decimal('12.49'), False, 1), id='domestic'),
+    pytest.param(PurchasedItem('bottle of perfume', Decimal('47.50'), True, 3), id='imported'),
+    pytest.param(PurchasedItem('👍👍👍', Decimal('1'), False, 1), id='unicode name'),
+    pytest.param(PurchasedItem('', Decimal('0.00'), True, 0), id='empty name, zero price and quantity'),
+    pytest.param(PurchasedItem('book', Decimal('12.490'), False, 10000000), id='trailing zero, big quantity'),
+    pytest.param(PurchasedItem('book', Decimal('1.2E+3'), False, 1), id='positive exponent'),
+])
+def test_items_are_read_back_as_written(item):
+    items = list(binary_basket.iter_items(write([item, item])))
+    assert items == [item, item]
+    # prices keep their representation, like in text baskets
+    assert [str(i.unit_price) for i in items] == [str(item.unit_price)] * 2
+
+
+def test_write_items_returns_number_of_items_written():
+    items = [PurchasedItem('book', Decimal(i), False, 1) for i in range(5)]
+    assert binary_basket.write_items(items, io.BytesIO()) == 5
+
+
+def test_empty_basket_is_magic_only():
+    buffer = write([])
+    assert buffer == binary_basket.MAGIC
+    assert list(binary_basket.iter_items(buffer)) == []
+
+
+@pytest.mark.parametrize('buffer, expected', [
+    pytest.param(binary_basket.MAGIC, True, id='binary basket'),
+    pytest.param(b'1 book at 12.49\n', False, id='text basket'),
+    pytest.param(b'', False, id='empty'),
+    pytest.param(binary_basket.MAGIC[:-1], False, id='truncated magic'),
+])
+def test_is_binary_basket(buffer, expected):
+    assert binary_basket.is_binary_basket(buffer) is expected
+
+
+@pytest.mark.parametrize('item', [
+    pytest.param(PurchasedItem('book', Decimal('NaN'), False, 1), id='price: not finite'),
+    pytest.param(PurchasedItem('book', Decimal('1E+200'), False, 1), id='price: mantissa too big'),
+    pytest.param(PurchasedItem('book', Decimal('1E-200'), False, 1), id='price: exponent too small'),
+    pytest.param(PurchasedItem('book', Decimal('1'), False, 1 << 32), id='quantity: too big'),
+    pytest.param(PurchasedItem('a' * (1 << 16), Decimal('1'), False, 1), id='name: too long'),
+])
+def test_write_items_raises_error_if_item_does_not_fit(item):
+    with pytest.raises(binary_basket.BinaryBasketError.UnsupportedItem):
+        write([item])
+
+
+@pytest.mark.parametrize('records, message', [
+    pytest.param([record(), record()[:10]], 'record 2 (offset 28): truncated record', id='truncated head'),
+    pytest.param([record(), record()[:-1]], 'record 2 (offset 28): truncated record', id='truncated name'),
+    pytest.param([record(imported=2)], 'record 1 (offset 8): invalid imported flag', id='invalid imported flag'),
+    pytest.param([record(name=b'\xff')], 'record 1 (offset 8): invalid encoding', id='invalid encoding'),
+])
+def test_iter_items_raises_error_with_location_of_first_malformed_record(records, message):  # noqa: E501
+    buffer = binary_basket.MAGIC + b''.join(records)
+    with pytest.raises(ParserError.MalformedInput, match=re.escape(message)):
+        list(binary_basket.iter_items(buffer))
+
+
+def test_iter_items_reads_lazily():
+    buffer = binary_basket.MAGIC + record() + record(imported=2)
+    items = binary_basket.iter_items(buffer)
+    assert next(items) == PurchasedItem('book', Decimal('12.49'), False, 1)
+    with pytest.raises(ParserError.MalformedInput):
+        next(items)
+
+
+def test_iter_items_reads_past_memo_size(monkeypatch):
+    monkeypatch.setattr(binary_basket, 'MAX_MEMO_SIZE', 2)
+    items = [
+        PurchasedItem(f'item {i % 3}', Decimal(i % 5), bool(i % 2), i % 7)
+        for i in range(50)
+    ]
+    assert list(binary_basket.iter_items(write(items))) == items
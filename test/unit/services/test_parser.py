@@ -1,3 +1,6 @@
+import io
+import mmap
+import re
 from decimal import Decimal
 
 import pytest
@@ -6,6 +9,12 @@ from taxes.services import parser
 from taxes.services.basket.entities.purchased_item import PurchasedItem
 
 
+parser_test_cases = pytest.mark.parametrize('parse', [
+    pytest.param(parser.parse_item, id='regex'),
+    pytest.param(parser.scan_item, id='scanner'),
+])
+
+
 @pytest.mark.parametrize('text, quantity, product_name, unit_price, imported', [
     # quantity
     pytest.param('1 book at 12.49', 1, 'book', Decimal('12.49'), False, id='quantity: = 1'),
@@ -70,7 +79,9 @@ from taxes.services.basket.entities.purchased_item import PurchasedItem
     pytest.param('1 item at 0311.0113', 1, 'item', Decimal('311.0113'), False, id='unit price: multiple-digits decimal with single leading zero and multiple decimal digits'),
     pytest.param('1 item at 000311.0113', 1, 'item', Decimal('311.0113'), False, id='unit price: multiple-digits decimal with multiple leading zeros and multiple decimal digits'),
 ])
+@parser_test_cases
 def test_returns_parsed_item_from_matching_string(
+    parse,
     text,
     quantity,
     product_name,
@@ -83,7 +94,7 @@ def test_returns_parsed_item_from_matching_string(
         unit_price=unit_price,
         imported=imported,
     )
-    assert expected == parser.parse_item(text)
+    assert expected == parse(text)
 
 
 @pytest.mark.parametrize('text', [
@@ -97,6 +108,216 @@ def test_returns_parsed_item_from_matching_string(
     pytest.param('1 item at', id='missing unit price amount'),
     pytest.param('1 item 12.32', id='missing unit price intro tag'),
 ])
-def test_raises_error_if_string_does_not_match(text):
+@parser_test_cases
+def test_raises_error_if_string_does_not_match(parse, text):
     with pytest.raises(parser.ParserError.MalformedInput):
-        parser.parse_item(text)
+        parse(text)
+
+
+@pytest.mark.parametrize('text', [
+    pytest.param('1 book at 12.49\n', id='trailing newline'),
+    pytest.param('1 book at 12.49\n\n', id='multiple trailing newlines'),
+    pytest.param('1 book at 12.49\r\n', id='trailing carriage return'),
+    pytest.param('1\tbook at 12.49', id='tab after quantity'),
+    pytest.param('1 book\tat 12.49', id='tab before price tag'),
+    pytest.param('1 book at\t12.49', id='tab after price tag'),
+    pytest.param('1 bo\tok at 12.49', id='tab in description'),
+    pytest.param('1  book at 12.49', id='multiple spaces after quantity'),
+    pytest.param('1 book  at 12.49', id='multiple spaces before price tag'),
+    pytest.param('1 book at  12.49', id='multiple spaces after price tag'),
+    pytest.param('1 book at 12.49 at 1', id='price tag in description'),
+    pytest.param('1 book at 1 at x', id='price tag after price'),
+    pytest.param('1 at at 1', id='price tag as description'),
+    pytest.param('1 book at .5', id='price without integer part'),
+    pytest.param('1 book at 1.2.3', id='price with multiple dots'),
+    pytest.param('١ book at ١٢', id='non-ascii digits'),
+    pytest.param('1 book at ²', id='superscript digit'),
+    pytest.param('1 imported\nbook at 1', id='newline in description'),
+    pytest.param('1 unimported IMPORTED imported book at 1', id='multiple imported labels'),
+    pytest.param('1 \u00a0book at 1', id='non-breaking space in description'),
+])
+def test_scanner_returns_same_result_as_regex_parser(text):
+    try:
+        expected = parser.parse_item(text)
+    except parser.ParserError.MalformedInput:
+        with pytest.raises(parser.ParserError.MalformedInput):
+            parser.scan_item(text)
+    else:
+        assert expected == parser.scan_item(text)
+
+
+@pytest.mark.parametrize('name, expected', [
+    pytest.param('regex', parser.parse_item, id='regex'),
+    pytest.param('scanner', parser.scan_item, id='scanner'),
+])
+def test_get_parser_returns_parser(name, expected):
+    assert expected is parser.get_parser(name)
+
+
+def test_get_parser_raises_error_if_parser_is_unknown():
+    with pytest.raises(parser.ParserError.UnknownParser, match='unknown parser: dummy'):
+        parser.get_parser('dummy')
+
+
+@pytest.mark.parametrize('buffer, expected', [
+    pytest.param(b'', [], id='empty'),
+    pytest.param(b'1 book at 1', [(1, 0, b'1 book at 1')], id='no trailing newline'),
+    pytest.param(b'1 book at 1\n', [(1, 0, b'1 book at 1')], id='trailing newline'),
+    pytest.param(b'1 book at 1\r\n', [(1, 0, b'1 book at 1')], id='trailing carriage return'),
+    pytest.param(b'a\n\nb', [(1, 0, b'a'), (2, 2, b''), (3, 3, b'b')], id='empty line'),
+    pytest.param(b'a\r\nbc\nd\n', [(1, 0, b'a'), (2, 3, b'bc'), (3, 6, b'd')], id='mixed line endings'),
+])
+def test_iter_lines_yields_line_number_offset_and_content(buffer, expected):
+    assert expected == list(parser.iter_lines(buffer))
+
+
+@parser_test_cases
+def test_parse_items_returns_items_in_order(parse):
+    buffer = b'1 book at 12.49\r\n2 imported chocolate at 1.5\n'
+    expected = parser.ParseResult(items=[
+        PurchasedItem(product_name='book', unit_price=Decimal('12.49'), imported=False, quantity=1),
+        PurchasedItem(product_name='chocolate', unit_price=Decimal('1.5'), imported=True, quantity=2),
+    ])
+    assert expected == parser.parse_items(buffer, parse=parse)
+
+
+@pytest.mark.parametrize('buffer, message', [
+    pytest.param(b'1 book at 1\nbook at 1\n', 'line 2 (offset 12): malformed row', id='malformed row'),
+    pytest.param(b'1 book at 1\n\n', 'line 2 (offset 12): malformed row', id='empty line'),
+    pytest.param(b'1 \xff at 1', 'line 1 (offset 0): invalid encoding', id='invalid encoding'),
+])
+def test_parse_items_raises_error_with_location_of_first_malformed_row(buffer, message):
+    with pytest.raises(parser.ParserError.MalformedInput, match=re.escape(message)):
+        parser.parse_items(buffer)
+
+
+def test_parse_items_collects_valid_items_and_errors():
+    buffer = b'1 book at 1\nbook at 1\n2 pen at 2\n1 \xff at 1\n'
+    expected = parser.ParseResult(
+        items=[
+            PurchasedItem(product_name='book', unit_price=Decimal('1'), imported=False, quantity=1),
+            PurchasedItem(product_name='pen', unit_price=Decimal('2'), imported=False, quantity=2),
+        ],
+        errors=[
+            parser.ParseError(line_no=2, offset=12, reason='malformed row'),
+            parser.ParseError(line_no=4, offset=33, reason='invalid encoding'),
+        ],
+    )
+    assert expected == parser.parse_items(buffer, collect=True)
+
+
+@pytest.mark.parametrize('content', [
+    pytest.param(b'', id='empty file'),
+    pytest.param(b'1 book at 1\n2 pen at 2', id='non-empty file'),
+])
+@pytest.mark.parametrize('use_mmap', [
+    pytest.param(True, id='mmap'),
+    pytest.param(False, id='read'),
+])
+def test_parse_items_reads_files(tmp_path, content, use_mmap):
+    path = tmp_path / 'basket.txt'
+    path.write_bytes(content)
+    with open(path, mode='rb') as f:
+        result = parser.parse_items(f, use_mmap=use_mmap)
+    assert parser.parse_items(content) == result
+
+
+def test_parse_items_reads_non_seekable_streams():
+    stream = io.BufferedReader(io.BytesIO(b'1 book at 1'))
+    stream.seekable = lambda: False
+    expected = [PurchasedItem(product_name='book', unit_price=Decimal('1'), imported=False, quantity=1)]
+    assert expected == parser.parse_items(stream).items
+
+
+@pytest.mark.parametrize('buffer, size, expected', [
+    pytest.param(b'', 4, [], id='empty'),
+    pytest.param(b'ab\ncd\n', 100, [(0, b'ab\ncd\n')], id='smaller than window'),
+    pytest.param(b'ab\ncd\nef', 4, [(0, b'ab\n'), (3, b'cd\n'), (6, b'ef')], id='split on last newline in window'),
+    pytest.param(b'abcdef\ng\n', 4, [(0, b'abcdef\n'), (7, b'g\n')], id='line longer than window'),
+    pytest.param(b'abcdef', 4, [(0, b'abcdef')], id='no newline'),
+])
+def test_iter_windows_yields_chunks_ending_on_line_boundaries(buffer, size, expected):
+    assert expected == list(parser.iter_windows(buffer, size))
+
+
+def test_iter_windows_releases_pages_of_memory_mapped_files(tmp_path):
+    path = tmp_path / 'basket.txt'
+    content = b'1 book at 1\n' * (3 * mmap.PAGESIZE)
+    path.write_bytes(content)
+    with open(path, mode='rb') as f, parser.map_file(f) as buffer:
+        windows = parser.iter_windows(buffer, size=mmap.PAGESIZE, release_pages=True)
+        assert content == b''.join(window for _, window in windows)
+
+
+@pytest.mark.parametrize('window, expected', [
+    pytest.param(b'a\nb', [b'a', b'b'], id='bytes'),
+    pytest.param('a\nb', ['a', 'b'], id='str'),
+    pytest.param('a\r\nb\r\n', ['a', 'b'], id='carriage returns'),
+    pytest.param('a\rb\n\n', ['a\rb', ''], id='carriage return within line'),
+])
+def test_split_lines(window, expected):
+    assert expected == parser.split_lines(window)
+
+
+def test_iter_items_reports_location_of_errors_across_windows():
+    row = b'1 book at 1\n'
+    rows = parser.WINDOW_SIZE // len(row) + 10
+    buffer = row * rows + b'1 \xff at 1\n' + row + b'book\n'
+    errors = []
+    items = list(parser.iter_items(buffer, errors=errors))
+    assert rows + 1 == len(items)
+    assert [
+        parser.ParseError(rows + 1, rows * len(row), 'invalid encoding'),
+        parser.ParseError(rows + 3, rows * len(row) + 9 + len(row), 'malformed row'),
+    ] == errors
+
+
+@pytest.mark.parametrize('encoding, expected', [
+    pytest.param('utf-8', True, id='utf-8'),
+    pytest.param('UTF8', True, id='utf-8 alias'),
+    pytest.param('latin-1', True, id='latin-1'),
+    pytest.param('ascii', True, id='ascii'),
+    pytest.param('utf-16', False, id='utf-16'),
+    pytest.param('utf-32-le', False, id='utf-32'),
+])
+def test_is_ascii_compatible(encoding, expected):
+    assert expected is parser.is_ascii_compatible(encoding)
+
+
+@pytest.mark.parametrize('parse, encoding', [
+    pytest.param(parser.scan_item, 'utf-8', id='scanner'),
+    pytest.param(parser.parse_item, 'utf-8', id='regex'),
+    pytest.param(parser.scan_item, 'latin-1', id='latin-1'),
+])
+def test_iter_items_parses_lazily(parse, encoding):
+    items = parser.iter_items(b'1 book at 1\nbook at 1\n', encoding, parse)
+    assert PurchasedItem(product_name='book', unit_price=Decimal('1'), imported=False, quantity=1) == next(items)
+    with pytest.raises(parser.ParserError.MalformedInput, match=re.escape('line 2 (offset 12): malformed row')):
+        next(items)
+
+
+@pytest.mark.parametrize('start, stop, first_line_no, expected', [
+    pytest.param(0, None, 1, [(1, 0, b'a'), (2, 2, b'bc'), (3, 5, b'd')], id='whole buffer'),
+    pytest.param(2, None, 2, [(2, 2, b'bc'), (3, 5, b'd')], id='from line boundary'),
+    pytest.param(2, 5, 2, [(2, 2, b'bc')], id='range'),
+    pytest.param(5, 5, 3, [], id='empty range'),
+])
+def test_iter_lines_yields_lines_in_range(start, stop, first_line_no, expected):
+    assert expected == list(parser.iter_lines(b'a\nbc\nd\n', start, stop, first_line_no))
+
+
+def test_iter_items_reports_location_of_errors_in_range():
+    items = parser.iter_items(b'1 book at 1\nbook\n', start=12, first_line_no=2)
+    with pytest.raises(parser.ParserError.MalformedInput, match=re.escape('line 2 (offset 12): malformed row')):
+        list(items)
+
+
+@pytest.mark.parametrize('buffer, start, stop, expected', [
+    pytest.param(b'', 0, None, 0, id='empty'),
+    pytest.param(b'a\nb\n', 0, None, 2, id='trailing newline'),
+    pytest.param(b'a\nb', 0, None, 2, id='no trailing newline'),
+    pytest.param(b'a\n\nb\n', 0, None, 3, id='empty line'),
+    pytest.param(b'a\nb\nc\n', 2, 4, 1, id='range'),
+])
+def test_count_lines(buffer, start, stop, expected):
+    assert expected == parser.count_lines(buffer, start, stop)
@@ -0,0 +1,72 @@
+import copy
+import dataclasses
+import pickle
+from decimal import Decimal
+
+import pytest
+
+from taxes.services.basket.entities.article import Article
+from taxes.services.basket.entities.basket import BasketEntryKey
+from taxes.services.basket.entities.product import Product
+from taxes.services.basket.entities.purchased_item import PurchasedItem
+from taxes.services.receipt.entities.receipt import ReceiptItem
+from taxes.services.receipt.entities.taxed_article import TaxedArticle
+from taxes.services.slotted import slotted
+
+
+PRODUCT = Product(name='book', category='books')
+
+entity_test_cases = pytest.mark.parametrize('entity', [
+    pytest.param(PRODUCT, id='product'),
+    pytest.param(PurchasedItem(product_name='book', unit_price=Decimal('12.49'), imported=False, quantity=1), id='purchased item'),
+    pytest.param(Article(product=PRODUCT, imported=True, quantity=2, unit_price_before_taxes=Decimal('12.49')), id='article'),
+    pytest.param(BasketEntryKey(product_name='book', unit_price=Decimal('12.49'), imported=True), id='basket entry key'),
+    pytest.param(TaxedArticle(product=PRODUCT, quantity=2, imported=True, unit_price_before_taxes=Decimal('12.49'), tax_amount_due_per_unit=Decimal('0.65')), id='taxed article'),
+    pytest.param(ReceiptItem(description='book', quantity=1, subtotal_price_with_taxes=Decimal('12.49')), id='receipt item'),
+])
+
+
+@entity_test_cases
+def test_entity_has_no_instance_dict(entity):
+    assert not hasattr(entity, '__dict__')
+    assert tuple(f.name for f in dataclasses.fields(entity)) == type(entity).__slots__
+
+
+@entity_test_cases
+def test_entity_is_immutable(entity):
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        setattr(entity, dataclasses.fields(entity)[0].name, None)
+
+
+@entity_test_cases
+def test_entity_can_be_created_with_keywords(entity):
+    values = {f.name: getattr(entity, f.name) for f in dataclasses.fields(entity)}
+    assert entity == type(entity)(**values)
+    assert hash(entity) == hash(type(entity)(**values))
+
+
+@pytest.mark.parametrize('clone', [
+    pytest.param(lambda e: pickle.loads(pickle.dumps(e)), id='pickle'),
+    pytest.param(copy.copy, id='copy'),
+    pytest.param(copy.deepcopy, id='deepcopy'),
+])
+@entity_test_cases
+def test_entity_can_be_cloned(entity, clone):
+    cloned = clone(entity)
+    assert entity == cloned
+    assert type(entity) is type(cloned)
+
+
+def test_slotted_keeps_repr_and_equality_of_dataclass():
+    product = Product(name='book', category='books')
+    assert "Product(name='book', category='books')" == repr(product)
+    assert product != Product(name='book', category='other')
+    assert product != ('book', 'books')
+
+
+def test_slotted_raises_error_if_fields_have_defaults():
+    with pytest.raises(TypeError, match='slotted fields can\'t have defaults'):
+        @slotted
+        @dataclasses.dataclass(frozen=True)
+        class WithDefault:
+            value: int = 0